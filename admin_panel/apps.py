@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AdminPanelConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'admin_panel'
+
+    def ready(self):
+        from admin_panel import signals  # noqa: F401
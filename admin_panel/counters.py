@@ -0,0 +1,118 @@
+"""
+UserManagement counter caches, maintained incrementally.
+
+Increments are buffered per process and written by a timer thread, with
+atomic F() updates through its own connection. They never flush inside the
+transaction of the request that counted them, so a rollback there can't
+drop the increments of others.
+
+total_chat_messages counts the messages attendees send (message_type
+'user'), not the bot's replies.
+"""
+from collections import Counter, defaultdict
+from django.db import IntegrityError, connections, transaction
+from django.db.models import F
+import atexit
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# UserManagement fields maintained as counter caches
+COUNTER_FIELDS = ('total_logins', 'total_chat_messages', 'total_events_attended')
+
+# Pending increments are written this long after the first one, or right
+# away on the timer thread once there are FLUSH_THRESHOLD of them
+FLUSH_THRESHOLD = 100  # increments
+FLUSH_INTERVAL = 5  # seconds
+
+_pending = defaultdict(Counter)
+_pending_count = 0
+_last_flush = time.monotonic()
+_timer = None
+_lock = threading.Lock()
+
+
+def increment(user_id, field, amount=1):
+    """Queue an increment of a UserManagement counter for a user"""
+    global _pending_count
+
+    if field not in COUNTER_FIELDS:
+        raise ValueError(f"Unknown counter field: {field}")
+
+    with _lock:
+        _pending[user_id][field] += amount
+        _pending_count += 1
+        due = (_pending_count >= FLUSH_THRESHOLD or
+               time.monotonic() - _last_flush >= FLUSH_INTERVAL)
+        _schedule_flush(0 if due else FLUSH_INTERVAL)
+
+
+def _schedule_flush(delay=FLUSH_INTERVAL):
+    """Flush on the timer thread ``delay`` seconds from now, unless a flush is already scheduled"""
+    global _timer
+    if _timer is None:
+        _timer = threading.Timer(delay, _flush_in_background)
+        _timer.daemon = True
+        _timer.start()
+
+
+def _flush_in_background():
+    global _timer
+    with _lock:
+        _timer = None
+    try:
+        flush()
+    finally:
+        connections.close_all()
+
+
+def flush():
+    """
+    Write all pending increments with atomic F() updates. They go back in
+    the buffer for a later flush when the database is unavailable.
+    """
+    global _pending, _pending_count, _last_flush
+    from .models import UserManagement
+
+    with _lock:
+        pending, _pending = _pending, defaultdict(Counter)
+        _pending_count = 0
+        _last_flush = time.monotonic()
+
+    if not pending:
+        return
+
+    # Users with identical deltas share a single UPDATE
+    batches = defaultdict(list)
+    for user_id, deltas in pending.items():
+        batches[frozenset(deltas.items())].append(user_id)
+
+    try:
+        with transaction.atomic():
+            existing = set(UserManagement.objects.filter(
+                user_id__in=pending.keys()
+            ).values_list('user_id', flat=True))
+            UserManagement.objects.bulk_create(
+                [UserManagement(user_id=user_id) for user_id in pending.keys() - existing],
+                ignore_conflicts=True
+            )
+
+            for deltas, user_ids in batches.items():
+                UserManagement.objects.filter(user_id__in=user_ids).update(
+                    **{field: F(field) + amount for field, amount in deltas}
+                )
+    except IntegrityError as e:
+        # A user was deleted meanwhile; retrying would fail the same way
+        logger.error(f"Dropped {len(pending)} user counter updates: {e}")
+    except Exception as e:
+        logger.error(f"Failed to flush {len(pending)} user counter updates, retrying: {e}")
+        with _lock:
+            for user_id, deltas in pending.items():
+                _pending[user_id].update(deltas)
+            _pending_count += sum(len(deltas) for deltas in pending.values())
+            _schedule_flush()
+
+
+atexit.register(flush)
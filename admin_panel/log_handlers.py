@@ -0,0 +1,188 @@
+"""
+Non-blocking logging into SystemLogs.
+
+SystemLogsQueueHandler is attached to application loggers. Request threads
+only put records on a bounded queue; a QueueListener thread drains it into
+SystemLogsHandler, which writes rows with bulk_create in batches. When the
+queue is full new records are dropped rather than blocking the caller.
+
+Records repeating the same message template in a batch (a burst of
+connection-ceiling warnings, say) are written as one row counting the
+repeats, so a busy moment doesn't add as many database writes. Writes that
+fail, such as on a locked SQLite database, are retried with backoff and
+then appended to ``spill_file`` instead of being dropped.
+"""
+from logging.handlers import QueueHandler, QueueListener
+import atexit
+import logging
+import queue
+import sys
+import time
+
+LEVELS = {'DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'}
+
+
+class SystemLogsHandler(logging.Handler):
+    """Buffers records and writes them to SystemLogs with bulk_create"""
+
+    def __init__(self, batch_size=100, max_buffer=5000, retries=3, retry_delay=0.1, spill_file=None,
+                 level=logging.NOTSET):
+        super().__init__(level)
+        self.batch_size = batch_size
+        self.max_buffer = max_buffer
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.spill = None
+        if spill_file:
+            self.spill = logging.FileHandler(spill_file, delay=True)
+            self.spill.setFormatter(logging.Formatter(
+                '{levelname} {asctime} {name} {process:d} {thread:d} {message}', style='{'
+            ))
+        self.buffer = []
+        self.dropped = 0
+
+    def emit(self, record):
+        self.buffer.append(record)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        from django.apps import apps
+
+        if not self.buffer:
+            return
+        if not apps.ready:
+            # Keep buffering until Django has finished loading, within limits
+            overflow = len(self.buffer) - self.max_buffer
+            if overflow > 0:
+                del self.buffer[:overflow]
+                self.dropped += overflow
+            return
+
+        from django.db import close_old_connections
+        from admin_panel.models import SystemLogs
+
+        records, self.buffer = self.buffer, []
+        rows = [self._to_row(SystemLogs, record, repeats) for record, repeats in self._collapse(records)]
+        try:
+            for attempt in range(self.retries + 1):
+                try:
+                    SystemLogs.objects.bulk_create(rows, batch_size=self.batch_size)
+                    return
+                except Exception as e:
+                    error = e
+                    # Locks are usually held briefly; don't add to the contention meanwhile
+                    if attempt < self.retries:
+                        close_old_connections()
+                        time.sleep(self.retry_delay * 2 ** attempt)
+            self._spill(records, error)
+        finally:
+            close_old_connections()
+
+    def _collapse(self, records):
+        """(first record, count) for each run of records logging the same template at the same place"""
+        groups = {}
+        for record in records:
+            key = (record.levelname, record.name, record.pathname, record.lineno, str(record.msg))
+            if key in groups:
+                groups[key][1] += 1
+            else:
+                groups[key] = [record, 1]
+        return groups.values()
+
+    def _spill(self, records, error):
+        if self.spill is None:
+            self.dropped += len(records)
+            sys.stderr.write(f"SystemLogsHandler: dropped {len(records)} log records: {error}\n")
+            return
+        sys.stderr.write(f"SystemLogsHandler: wrote {len(records)} log records to {self.spill.baseFilename}: {error}\n")
+        for record in records:
+            self.spill.handle(record)
+        self.spill.flush()
+
+    def close(self):
+        if self.spill is not None:
+            self.spill.close()
+        super().close()
+
+    def _to_row(self, model, record, repeats=1):
+        metadata = {
+            'function': record.funcName,
+            'line': record.lineno,
+            'process': record.process,
+            'thread': record.threadName,
+            **getattr(record, 'log_metadata', {}),
+        }
+        if repeats > 1:
+            metadata['repeats'] = repeats
+        return model(
+            level=record.levelname if record.levelname in LEVELS else 'INFO',
+            message=record.getMessage(),
+            module=record.name[:100],
+            user_id=getattr(record, 'user_id', None),
+            ip_address=getattr(record, 'ip_address', None),
+            metadata=metadata,
+        )
+
+
+class SystemLogsListener(QueueListener):
+    """Queue listener that also flushes its handlers whenever the queue goes idle"""
+
+    def __init__(self, log_queue, *handlers, flush_interval=2.0):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.flush_interval = flush_interval
+
+    def dequeue(self, block):
+        while True:
+            try:
+                return self.queue.get(block, timeout=self.flush_interval)
+            except queue.Empty:
+                self.flush_handlers()
+
+    def enqueue_sentinel(self):
+        # A full queue must not prevent shutdown
+        self.queue.put(self._sentinel, timeout=self.flush_interval)
+
+    def flush_handlers(self):
+        for handler in self.handlers:
+            handler.flush()
+
+    def stop(self):
+        super().stop()
+        self.flush_handlers()
+
+
+class SystemLogsQueueHandler(QueueHandler):
+    """
+    Logging handler that persists records to SystemLogs without blocking.
+    Records beyond ``queue_size`` waiting to be written are dropped.
+    """
+
+    def __init__(self, queue_size=10000, batch_size=100, flush_interval=2.0, retries=3, retry_delay=0.1,
+                 spill_file=None, level=logging.NOTSET):
+        super().__init__(queue.Queue(maxsize=queue_size))
+        self.setLevel(level)
+        self.dropped = 0
+        self.target = SystemLogsHandler(
+            batch_size=batch_size, retries=retries, retry_delay=retry_delay, spill_file=spill_file
+        )
+        self.listener = SystemLogsListener(self.queue, self.target, flush_interval=flush_interval)
+        self.listener.start()
+        self._listening = True
+        atexit.register(self.close)
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        if self._listening:
+            self._listening = False
+            try:
+                self.listener.stop()
+            except queue.Full:
+                pass
+            self.target.close()
+        super().close()
@@ -0,0 +1,95 @@
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from datetime import datetime, timezone as dt_timezone
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = 'admin_panel_systemlogs_fts'
+
+_fts_available = {}
+
+
+def _has_sqlite_fts(alias):
+    if alias not in _fts_available:
+        with connections[alias].cursor() as cursor:
+            _fts_available[alias] = FTS_TABLE in connections[alias].introspection.table_names(cursor)
+    return _fts_available[alias]
+
+
+def search_logs(logs, query):
+    """
+    Filter a SystemLogs queryset by a free-text query.
+    Uses the FTS5 table on SQLite or the GIN index on PostgreSQL, falling back
+    to icontains on other databases.
+    """
+    terms = re.findall(r'\w+', query)
+    if not terms:
+        return logs
+
+    alias = logs.db
+    vendor = connections[alias].vendor
+
+    if vendor == 'sqlite' and _has_sqlite_fts(alias):
+        # Every term must match; the last one as a prefix while the user types
+        fts_query = ' '.join(f'"{term}"' for term in terms[:-1])
+        fts_query = f'{fts_query} "{terms[-1]}"*'.strip()
+        return logs.filter(id__in=RawSQL(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", (fts_query,)
+        ))
+
+    if vendor == 'postgresql':
+        return logs.filter(id__in=RawSQL(
+            "SELECT id FROM admin_panel_systemlogs "
+            "WHERE to_tsvector('simple', message || ' ' || module) @@ plainto_tsquery('simple', %s)",
+            (' '.join(terms),)
+        ))
+
+    return logs.filter(Q(message__icontains=query) | Q(module__icontains=query))
+
+
+def encode_cursor(log):
+    """Opaque keyset cursor for a log row: <timestamp in microseconds>-<id>"""
+    return f"{int(log.timestamp.timestamp() * 1_000_000)}-{log.id}"
+
+
+def decode_cursor(cursor):
+    try:
+        micros, log_id = cursor.split('-')
+        timestamp = datetime.fromtimestamp(int(micros) / 1_000_000, tz=dt_timezone.utc)
+        return timestamp, int(log_id)
+    except (AttributeError, ValueError, OverflowError):
+        return None
+
+
+def keyset_page(logs, after=None, before=None, per_page=50):
+    """
+    One page of logs, newest first, using keyset pagination on (timestamp, id).
+    ``after`` continues to older entries and ``before`` goes back to newer ones.
+    Every page costs the same indexed range scan regardless of depth.
+    """
+    if before and decode_cursor(before):
+        timestamp, log_id = decode_cursor(before)
+        rows = list(logs.filter(
+            Q(timestamp__gt=timestamp) | Q(timestamp=timestamp, id__gt=log_id)
+        ).order_by('timestamp', 'id')[:per_page + 1])
+        has_newer = len(rows) > per_page
+        rows = rows[:per_page][::-1]
+        has_older = True
+    else:
+        decoded = decode_cursor(after) if after else None
+        if decoded:
+            timestamp, log_id = decoded
+            logs = logs.filter(Q(timestamp__lt=timestamp) | Q(timestamp=timestamp, id__lt=log_id))
+        rows = list(logs.order_by('-timestamp', '-id')[:per_page + 1])
+        has_older = len(rows) > per_page
+        rows = rows[:per_page]
+        has_newer = decoded is not None
+
+    return {
+        'object_list': rows,
+        'next_cursor': encode_cursor(rows[-1]) if rows and has_older else None,
+        'previous_cursor': encode_cursor(rows[0]) if rows and has_newer else None,
+    }
@@ -0,0 +1,108 @@
+"""
+Cached maintenance-mode state.
+
+The active MaintenanceMode row is flattened into a MaintenanceSnapshot and
+stored in the shared cache whenever it changes. Each worker keeps its own
+copy and re-reads the cache at most every SNAPSHOT_CHECK_INTERVAL seconds,
+so checking the gate costs a clock comparison and a set lookup.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from django.core.cache import cache
+from django.utils import timezone
+import logging
+import math
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_KEY = 'aura:maintenance:snapshot'
+
+# Seconds between checks of the shared snapshot
+SNAPSHOT_CHECK_INTERVAL = 2
+
+# Paths that stay reachable during maintenance
+EXEMPT_PATH_PREFIXES = ('/admin-panel/', '/admin/', '/health/', '/metrics/', '/static/', '/media/')
+
+
+@dataclass(frozen=True, slots=True)
+class MaintenanceSnapshot:
+    is_active: bool = False
+    message: str = ''
+    start_time: datetime = None
+    end_time: datetime = None
+    allowed_user_ids: frozenset = frozenset()
+
+    def in_window(self, now=None):
+        if not self.is_active:
+            return False
+        now = now or timezone.now()
+        return self.start_time <= now < self.end_time
+
+    def blocks(self, user_id, now=None):
+        """True if ``user_id`` (None for anonymous users) is locked out right now"""
+        return self.in_window(now) and user_id not in self.allowed_user_ids
+
+    def retry_after(self, now=None):
+        """Seconds until the maintenance window ends"""
+        remaining = (self.end_time - (now or timezone.now())).total_seconds()
+        return max(1, math.ceil(remaining))
+
+
+INACTIVE = MaintenanceSnapshot()
+
+
+def build_snapshot():
+    """Read the active maintenance window from the database"""
+    from admin_panel.models import MaintenanceMode
+
+    maintenance = MaintenanceMode.objects.filter(is_active=True).order_by('-id').first()
+    if maintenance is None:
+        return INACTIVE
+    return MaintenanceSnapshot(
+        is_active=True,
+        message=maintenance.message,
+        start_time=maintenance.start_time,
+        end_time=maintenance.end_time,
+        allowed_user_ids=frozenset(maintenance.allowed_users.values_list('id', flat=True)),
+    )
+
+
+def publish_snapshot():
+    """Rebuild the snapshot and share it with every worker"""
+    snapshot = build_snapshot()
+    cache.set(SNAPSHOT_KEY, snapshot, timeout=None)
+    _local['snapshot'] = snapshot
+    _local['checked_at'] = time.monotonic()
+    return snapshot
+
+
+_lock = threading.Lock()
+_local = {'snapshot': INACTIVE, 'checked_at': None}
+
+
+def get_snapshot():
+    """The current maintenance snapshot, at most SNAPSHOT_CHECK_INTERVAL seconds old"""
+    checked_at = _local['checked_at']
+    if checked_at is not None and time.monotonic() - checked_at < SNAPSHOT_CHECK_INTERVAL:
+        return _local['snapshot']
+
+    with _lock:
+        checked_at = _local['checked_at']
+        if checked_at is None or time.monotonic() - checked_at >= SNAPSHOT_CHECK_INTERVAL:
+            snapshot = cache.get(SNAPSHOT_KEY)
+            if snapshot is None:
+                try:
+                    snapshot = publish_snapshot()
+                except Exception as e:
+                    # Never lock everyone out because the state can't be read
+                    logger.error(f"Could not load maintenance mode: {e}")
+                    snapshot = _local['snapshot']
+            _local['snapshot'] = snapshot
+            _local['checked_at'] = time.monotonic()
+    return _local['snapshot']
+
+
+def is_exempt_path(path):
+    return path.startswith(EXEMPT_PATH_PREFIXES)
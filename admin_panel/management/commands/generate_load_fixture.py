@@ -0,0 +1,324 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.utils import timezone
+from contextlib import contextmanager
+from datetime import timedelta
+import itertools
+import random
+import time
+
+from admin_panel.models import EventManagement
+from aura_project.db.bulk import insert_rows
+from attendees.models import AttendeeProfile, EventInteraction
+from chat.models import ChatSession, ChatMessage, UserActivity
+from events.models import Speaker, Session
+
+# Row counts per preset; every count can be overridden on the command line
+SCALES = {
+    'small': {
+        'users': 1_000, 'speakers': 50, 'sessions': 500, 'events': 20,
+        'chat_sessions': 2_000, 'messages': 50_000, 'activities': 25_000, 'interactions': 25_000,
+    },
+    'medium': {
+        'users': 10_000, 'speakers': 200, 'sessions': 5_000, 'events': 100,
+        'chat_sessions': 20_000, 'messages': 1_000_000, 'activities': 500_000, 'interactions': 500_000,
+    },
+    'large': {
+        'users': 100_000, 'speakers': 1_000, 'sessions': 50_000, 'events': 500,
+        'chat_sessions': 200_000, 'messages': 10_000_000, 'activities': 5_000_000, 'interactions': 5_000_000,
+    },
+}
+
+INTERESTS = [
+    'AI', 'Machine Learning', 'Technology', 'Web Development', 'Programming', 'Open Source',
+    'Data Science', 'Analytics', 'Visualization', 'Product Management', 'Strategy',
+    'Innovation', 'Design', 'UX', 'Cloud', 'Security', 'DevOps', 'Blockchain', 'IoT', 'Mobile',
+]
+JOB_TITLES = ['Developer', 'Manager', 'Designer', 'Analyst', 'Engineer', 'Researcher', 'Founder', 'Student']
+COMPANIES = ['Tech Corp', 'Innovation Labs', 'Data Systems', 'Creative Agency', 'Startup Inc', 'Cloud Co']
+USER_MESSAGES = [
+    'What sessions do you recommend?', "What's on the schedule today?", 'Who are the speakers?',
+    'Where is the main hall?', 'Any networking events?', 'Tell me more about the first one',
+    'What about AI talks?', 'Thanks!', 'Help',
+]
+BOT_MESSAGES = [
+    'Here are some sessions you might like.', "Here's what's coming up next.",
+    'These speakers are presenting today.', 'The main hall is on the ground floor.',
+    'There is a networking mixer at 6 PM.', "You're welcome!",
+]
+ACTIVITY_TYPES = ['chat_connected', 'user_message', 'chat_disconnected', 'feed_action', 'viewed_session', 'registered_event']
+ACTIVITY_WEIGHTS = [20, 35, 18, 12, 10, 5]
+INTERACTION_TYPES = ['viewed', 'bookmarked', 'registered', 'attended', 'rated']
+INTERACTION_WEIGHTS = [50, 15, 20, 10, 5]
+
+# Heavy-tailed activity: roughly 20% of users produce 80% of the traffic
+PARETO_ALPHA = 1.16
+
+
+@contextmanager
+def explicit_timestamps(*fields):
+    """Let bulk_create write our own values into auto_now/auto_now_add fields"""
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def _field(model, name):
+    return model._meta.get_field(name)
+
+
+class Command(BaseCommand):
+    help = 'Generate a large, seeded synthetic dataset for load and scale testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--size',
+            choices=sorted(SCALES),
+            default='small',
+            help='Preset volume (default: small)',
+        )
+        for name in SCALES['small']:
+            parser.add_argument(
+                f"--{name.replace('_', '-')}",
+                type=int,
+                dest=name,
+                help=f'Override the number of {name.replace("_", " ")}',
+            )
+        parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+        parser.add_argument('--days', type=int, default=30, help='Spread timestamps over this many days (default: 30)')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk insert (default: 5000)')
+        parser.add_argument('--prefix', default='load', help='Username prefix of generated users (default: load)')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+        self.window = timedelta(days=options['days'])
+        self.prefix = options['prefix']
+        counts = {
+            name: options[name] if options.get(name) is not None else default
+            for name, default in SCALES[options['size']].items()
+        }
+
+        if User.objects.filter(username__startswith=f'{self.prefix}_').exists():
+            raise CommandError(f"Users prefixed '{self.prefix}_' already exist; pass another --prefix")
+
+        self.stdout.write(f"🔄 Generating {options['size']} load fixture (seed {options['seed']})...")
+        started = time.monotonic()
+
+        user_ids = self._timed('users', lambda: self._create_users(counts['users']))
+        profile_ids = self._timed('attendee profiles', lambda: self._create_profiles(user_ids))
+        speaker_ids = self._timed('speakers', lambda: self._create_speakers(counts['speakers']))
+        session_ids = self._timed('sessions', lambda: self._create_sessions(counts['sessions'], speaker_ids))
+        self._timed('events', lambda: self._create_events(counts['events'], user_ids))
+
+        # Pareto weights decide how active each user is across all tables
+        weights = list(itertools.accumulate(self.rng.paretovariate(PARETO_ALPHA) for _ in user_ids))
+
+        chat_sessions = self._timed(
+            'chat sessions', lambda: self._create_chat_sessions(counts['chat_sessions'], user_ids, weights)
+        )
+        self._timed('chat messages', lambda: self._create_messages(counts['messages'], chat_sessions))
+        self._timed('user activities', lambda: self._create_activities(counts['activities'], user_ids, weights))
+        self._timed(
+            'event interactions',
+            lambda: self._create_interactions(counts['interactions'], profile_ids, weights, session_ids)
+        )
+
+        # bulk_create skips signals, so rebuild the derived data in one pass
+        call_command('rebuild_user_counters', batch_size=self.batch_size, stdout=self.stdout)
+        call_command('rebuild_feed', stdout=self.stdout)
+        call_command('rebuild_topics', batch_size=self.batch_size, stdout=self.stdout)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Load fixture generated in {time.monotonic() - started:.1f}s'
+        ))
+
+    def _timed(self, label, create):
+        started = time.monotonic()
+        result = create()
+        created = len(result) if isinstance(result, (list, dict)) else result
+        self.stdout.write(f'  {label}: {created:,} rows in {time.monotonic() - started:.1f}s')
+        return result
+
+    def _timestamp(self):
+        return self.now - self.window * self.rng.random()
+
+    def _create_users(self, count):
+        # Hashing is deliberately slow; every generated user shares one hash
+        password = make_password('loadtest')
+        users = [
+            User(
+                username=f'{self.prefix}_{i:07d}',
+                email=f'{self.prefix}_{i:07d}@example.com',
+                password=password,
+                first_name=f'User{i}',
+                date_joined=self._timestamp(),
+            )
+            for i in range(count)
+        ]
+        for start in range(0, count, self.batch_size):
+            User.objects.bulk_create(users[start:start + self.batch_size])
+        return [user.id for user in users]
+
+    def _create_profiles(self, user_ids):
+        profiles = []
+        with explicit_timestamps(_field(AttendeeProfile, 'registration_date')):
+            for user_id in user_ids:
+                profiles.append(AttendeeProfile(
+                    user_id=user_id,
+                    job_title=self.rng.choice(JOB_TITLES),
+                    company=self.rng.choice(COMPANIES),
+                    interests=', '.join(self.rng.sample(INTERESTS, self.rng.randint(1, 4))),
+                    networking_preferences=self.rng.choices(['open', 'selective', 'minimal'], [6, 3, 1])[0],
+                    first_time_attendee=self.rng.random() < 0.4,
+                    registration_date=self._timestamp(),
+                ))
+            for start in range(0, len(profiles), self.batch_size):
+                AttendeeProfile.objects.bulk_create(profiles[start:start + self.batch_size])
+        return [profile.id for profile in profiles]
+
+    def _create_speakers(self, count):
+        speakers = [
+            Speaker(
+                name=f'Speaker {i}',
+                bio=f'Expert in {self.rng.choice(INTERESTS)}',
+                company=self.rng.choice(COMPANIES),
+            )
+            for i in range(count)
+        ]
+        Speaker.objects.bulk_create(speakers, batch_size=self.batch_size)
+        return [speaker.id for speaker in speakers]
+
+    def _create_sessions(self, count, speaker_ids):
+        # Spread around "now" so there are past, live and upcoming sessions
+        sessions = []
+        for i in range(count):
+            topics = self.rng.sample(INTERESTS, 2)
+            start = self.now + timedelta(minutes=self.rng.randint(-7 * 24 * 60, 7 * 24 * 60))
+            sessions.append(Session(
+                title=f'{topics[0]} and {topics[1]} #{i}',
+                description=f'A session about {topics[0]} and {topics[1]}.',
+                start_time=start,
+                end_time=start + timedelta(minutes=self.rng.choice([30, 45, 60, 90])),
+                speaker_id=self.rng.choice(speaker_ids) if speaker_ids else None,
+            ))
+        Session.objects.bulk_create(sessions, batch_size=self.batch_size)
+        return [session.id for session in sessions]
+
+    def _create_events(self, count, user_ids):
+        events = []
+        for i in range(count):
+            start = self.now + timedelta(hours=self.rng.randint(-72, 72))
+            max_attendees = self.rng.choice([50, 100, 200, 500])
+            events.append(EventManagement(
+                title=f'Event {i}: {self.rng.choice(INTERESTS)}',
+                description='Generated load-test event',
+                start_datetime=start,
+                end_datetime=start + timedelta(hours=self.rng.randint(1, 4)),
+                location=f'Hall {self.rng.randint(1, 10)}',
+                max_attendees=max_attendees,
+                current_attendees=self.rng.randint(0, max_attendees),
+                status=self.rng.choices(['published', 'draft', 'cancelled', 'completed'], [7, 1, 1, 1])[0],
+                priority=self.rng.choices(['low', 'medium', 'high', 'critical'], [3, 4, 2, 1])[0],
+                tags=', '.join(self.rng.sample(INTERESTS, 3)),
+                created_by_id=self.rng.choice(user_ids),
+            ))
+        EventManagement.objects.bulk_create(events, batch_size=self.batch_size)
+        return len(events)
+
+    def _create_chat_sessions(self, count, user_ids, weights):
+        """Returns {chat session id: created_at}"""
+        owners = self.rng.choices(user_ids, cum_weights=weights, k=count)
+        sessions = []
+        with explicit_timestamps(_field(ChatSession, 'created_at'), _field(ChatSession, 'last_activity')):
+            for i, user_id in enumerate(owners):
+                created_at = self._timestamp()
+                sessions.append(ChatSession(
+                    user_id=user_id,
+                    session_id=f'{self.prefix}-{i:08d}',
+                    created_at=created_at,
+                    last_activity=min(self.now, created_at + timedelta(minutes=self.rng.randint(1, 120))),
+                    is_active=self.rng.random() < 0.1,
+                ))
+            for start in range(0, count, self.batch_size):
+                ChatSession.objects.bulk_create(sessions[start:start + self.batch_size])
+        return {session.id: session.created_at for session in sessions}
+
+    def _create_messages(self, count, chat_sessions):
+        session_ids = list(chat_sessions)
+        # Conversation length is heavy-tailed too
+        weights = list(itertools.accumulate(self.rng.paretovariate(PARETO_ALPHA) for _ in session_ids))
+        rng = self.rng
+
+        def rows():
+            for offset in range(0, count, self.batch_size):
+                size = min(self.batch_size, count - offset)
+                sessions = rng.choices(session_ids, cum_weights=weights, k=size)
+                bot_types = rng.choices(['bot', 'recommendation', 'welcome'], [8, 1, 1], k=size)
+                for session_id, bot_type in zip(sessions, bot_types):
+                    is_user = rng.random() < 0.5
+                    yield (
+                        session_id,
+                        'user' if is_user else bot_type,
+                        rng.choice(USER_MESSAGES if is_user else BOT_MESSAGES),
+                        min(self.now, chat_sessions[session_id] + timedelta(seconds=rng.randint(0, 7200))),
+                    )
+
+        return insert_rows(
+            ChatMessage, ['session', 'message_type', 'content', 'timestamp'], rows(), batch_size=self.batch_size
+        )
+
+    def _create_activities(self, count, user_ids, weights):
+        rng = self.rng
+
+        def rows():
+            for offset in range(0, count, self.batch_size):
+                size = min(self.batch_size, count - offset)
+                users = rng.choices(user_ids, cum_weights=weights, k=size)
+                activity_types = rng.choices(ACTIVITY_TYPES, ACTIVITY_WEIGHTS, k=size)
+                for user_id, activity_type in zip(users, activity_types):
+                    yield (user_id, activity_type, {}, self._timestamp())
+
+        return insert_rows(
+            UserActivity, ['user', 'activity_type', 'activity_data', 'timestamp'], rows(), batch_size=self.batch_size
+        )
+
+    def _create_interactions(self, count, profile_ids, weights, session_ids):
+        if not session_ids:
+            return 0
+        rng = self.rng
+        # A few sessions draw most of the attention
+        session_weights = list(itertools.accumulate(rng.paretovariate(PARETO_ALPHA) for _ in session_ids))
+
+        def rows():
+            for offset in range(0, count, self.batch_size):
+                size = min(self.batch_size, count - offset)
+                attendees = rng.choices(profile_ids, cum_weights=weights, k=size)
+                sessions = rng.choices(session_ids, cum_weights=session_weights, k=size)
+                interaction_types = rng.choices(INTERACTION_TYPES, INTERACTION_WEIGHTS, k=size)
+                for attendee_id, session_id, interaction_type in zip(attendees, sessions, interaction_types):
+                    yield (
+                        attendee_id,
+                        session_id,
+                        interaction_type,
+                        rng.randint(1, 5) if interaction_type == 'rated' else None,
+                        '',
+                        self._timestamp(),
+                    )
+
+        # Duplicate (attendee, session, type) draws are skipped by the unique constraint
+        return insert_rows(
+            EventInteraction,
+            ['attendee', 'event_id', 'interaction_type', 'rating', 'notes', 'timestamp'],
+            rows(),
+            batch_size=self.batch_size,
+            ignore_conflicts=True
+        )
@@ -0,0 +1,81 @@
+from django.core.management.base import BaseCommand
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Count
+
+from admin_panel import counters
+from admin_panel.models import UserManagement
+from attendees.models import EventInteraction
+from chat.models import ChatMessage
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the UserManagement counter caches from chat messages and event interactions. '
+        'Stop the web and worker processes first: increments still buffered in them are '
+        'flushed on top of the rebuilt totals and counted twice.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of rows written per bulk update (default: 1000)',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        # Write any increments still buffered in this process first; other
+        # processes can't be reached, hence stopping them beforehand
+        counters.flush()
+
+        self.stdout.write(self.style.WARNING(
+            '⚠️  Run this with the web and worker processes stopped, or their buffered counts are added twice'
+        ))
+        self.stdout.write('🔄 Counting chat messages and attended events...')
+
+        message_counts = dict(
+            ChatMessage.objects.filter(message_type='user')
+            .values_list('session__user')
+            .annotate(count=Count('id'))
+        )
+        attended_counts = dict(
+            EventInteraction.objects.filter(interaction_type='attended')
+            .values_list('attendee__user')
+            .annotate(count=Count('id'))
+        )
+
+        with transaction.atomic():
+            # Make sure every user has a management row
+            existing = set(UserManagement.objects.values_list('user_id', flat=True))
+            missing = [
+                UserManagement(user_id=user_id)
+                for user_id in User.objects.values_list('id', flat=True).iterator()
+                if user_id not in existing
+            ]
+            UserManagement.objects.bulk_create(missing, batch_size=batch_size, ignore_conflicts=True)
+
+            changed = []
+            for management in UserManagement.objects.only(
+                'id', 'user_id', 'total_chat_messages', 'total_events_attended'
+            ).iterator(chunk_size=batch_size):
+                messages = message_counts.get(management.user_id, 0)
+                attended = attended_counts.get(management.user_id, 0)
+                if (management.total_chat_messages, management.total_events_attended) != (messages, attended):
+                    management.total_chat_messages = messages
+                    management.total_events_attended = attended
+                    changed.append(management)
+
+            UserManagement.objects.bulk_update(
+                changed,
+                ['total_chat_messages', 'total_events_attended'],
+                batch_size=batch_size
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Created {len(missing)} management rows, corrected counters for {len(changed)} users'
+        ))
+        self.stdout.write(
+            'ℹ️  total_logins has no historical source and is only maintained incrementally'
+        )
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+import sqlite3
+import time
+
+class Command(BaseCommand):
+    help = 'Copy the primary SQLite database into the replica file (for running with a local replica)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            default='replica',
+            help='Alias of the replica to refresh (default: replica)',
+        )
+        parser.add_argument(
+            '--pages',
+            type=int,
+            default=1024,
+            help='Pages copied per step, so writers are never blocked for long (default: 1024)',
+        )
+
+    def handle(self, *args, **options):
+        alias = options['database']
+        if alias not in connections.settings:
+            raise CommandError(f"No '{alias}' database is configured; set AURA_REPLICA_DB_PATH")
+
+        primary = connections[DEFAULT_DB_ALIAS]
+        replica_settings = connections.settings[alias]
+        if primary.vendor != 'sqlite' or 'sqlite3' not in replica_settings['ENGINE']:
+            raise CommandError('Both databases must be SQLite; use your database\'s own replication otherwise')
+
+        started = time.monotonic()
+        primary.ensure_connection()
+        # The alias itself is query-only, so write through a plain connection
+        target = sqlite3.connect(replica_settings['NAME'])
+        try:
+            primary.connection.backup(target, pages=options['pages'])
+        finally:
+            target.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Copied {primary.settings_dict['NAME']} to {replica_settings['NAME']} "
+            f"in {time.monotonic() - started:.2f}s"
+        ))
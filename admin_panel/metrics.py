@@ -0,0 +1,60 @@
+from django.contrib.auth.models import User
+from django.db.models import Count, Q
+from django.utils import timezone
+from datetime import timedelta
+
+from aura_project.caching import get_or_refresh
+from chat.models import ChatSession
+from .models import EventManagement, SystemLogs
+
+# Versioned so entries cached before recent_logs was added are never read
+DASHBOARD_METRICS_KEY = 'aura:admin:dashboard_metrics:v2'
+
+# Metrics older than this are recomputed in the background
+METRICS_TTL = 30  # seconds
+
+# Metrics are dropped entirely after this long without a dashboard view
+METRICS_STALE_TTL = 600  # seconds
+
+
+def compute_dashboard_metrics():
+    """Compute dashboard counters with one conditional aggregate per table, plus the latest logs"""
+    now = timezone.now()
+
+    user_stats = User.objects.aggregate(
+        total_users=Count('id'),
+        active_users_today=Count('id', filter=Q(last_login__date=now.date())),
+        recent_registrations=Count('id', filter=Q(date_joined__gte=now - timedelta(days=7))),
+    )
+    event_stats = EventManagement.objects.aggregate(
+        total_events=Count('id'),
+        active_events=Count('id', filter=Q(status='published')),
+    )
+    session_stats = ChatSession.objects.aggregate(
+        total_chat_sessions=Count('id'),
+        active_sessions=Count('id', filter=Q(is_active=True)),
+    )
+
+    # Most attended events
+    top_events = list(
+        EventManagement.objects.only('title', 'current_attendees', 'status')
+        .order_by('-current_attendees')[:5]
+    )
+
+    recent_logs = list(SystemLogs.objects.select_related('user')[:10])
+
+    return {
+        'metrics': {**user_stats, **event_stats, **session_stats},
+        'top_events': top_events,
+        'recent_logs': recent_logs,
+    }
+
+
+def get_dashboard_metrics():
+    """Cached dashboard metrics, refreshed in the background once stale"""
+    return get_or_refresh(
+        DASHBOARD_METRICS_KEY,
+        compute_dashboard_metrics,
+        ttl=METRICS_TTL,
+        stale_ttl=METRICS_STALE_TTL,
+    )
@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.http import HttpResponse, JsonResponse
+from django.template.loader import render_to_string
+from importlib import import_module
+from admin_panel import maintenance
+
+
+class MaintenanceModeMiddleware:
+    """
+    Answers 503 while a maintenance window is active, except for allowed
+    users and the admin, health and static paths. Sits in front of the
+    session middleware so rejected requests never load or save a session;
+    the session is only read (from the cache) when some users are allowed in.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.session_engine = import_module(settings.SESSION_ENGINE)
+
+    def __call__(self, request):
+        snapshot = maintenance.get_snapshot()
+        if snapshot.in_window() and not maintenance.is_exempt_path(request.path_info):
+            user_id = self._user_id(request) if snapshot.allowed_user_ids else None
+            if snapshot.blocks(user_id):
+                return self._reject(request, snapshot)
+        return self.get_response(request)
+
+    def _user_id(self, request):
+        session_key = request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+        if not session_key:
+            return None
+        try:
+            return int(self.session_engine.SessionStore(session_key).get(SESSION_KEY))
+        except (TypeError, ValueError):
+            return None
+
+    def _reject(self, request, snapshot):
+        retry_after = snapshot.retry_after()
+        if request.path_info.startswith('/api/') or 'application/json' in request.headers.get('Accept', ''):
+            response = JsonResponse({
+                'error': 'maintenance',
+                'message': snapshot.message,
+                'retry_after': retry_after,
+            }, status=503)
+        else:
+            response = HttpResponse(render_to_string('maintenance.html', {
+                'message': snapshot.message,
+                'end_time': snapshot.end_time,
+            }), status=503)
+        response['Retry-After'] = str(retry_after)
+        return response
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='usermanagement',
+            index=models.Index(fields=['-total_chat_messages'], name='usermgmt_chat_messages_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usermanagement',
+            index=models.Index(fields=['-total_logins'], name='usermgmt_logins_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0002_usermanagement_counter_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='systemlogs',
+            options={'ordering': ['-timestamp', '-id'], 'verbose_name': 'System Log', 'verbose_name_plural': 'System Logs'},
+        ),
+        migrations.AddIndex(
+            model_name='systemlogs',
+            index=models.Index(fields=['-timestamp', '-id'], name='systemlogs_time_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='systemlogs',
+            index=models.Index(fields=['level', '-timestamp', '-id'], name='systemlogs_level_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='systemlogs',
+            index=models.Index(fields=['module', '-timestamp', '-id'], name='systemlogs_module_time_idx'),
+        ),
+    ]
@@ -0,0 +1,77 @@
+from django.db import OperationalError, migrations
+import logging
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = 'admin_panel_systemlogs_fts'
+
+SQLITE_FORWARD = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        message, module, content='admin_panel_systemlogs', content_rowid='id'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON admin_panel_systemlogs BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, message, module) VALUES (new.id, new.message, new.module);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON admin_panel_systemlogs BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, message, module) VALUES ('delete', old.id, old.message, old.module);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE ON admin_panel_systemlogs BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, message, module) VALUES ('delete', old.id, old.message, old.module);
+        INSERT INTO {FTS_TABLE}(rowid, message, module) VALUES (new.id, new.message, new.module);
+    END""",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+SQLITE_BACKWARD = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+POSTGRES_FORWARD = [
+    """CREATE INDEX IF NOT EXISTS systemlogs_search_idx ON admin_panel_systemlogs
+       USING gin (to_tsvector('simple', message || ' ' || module))""",
+]
+
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS systemlogs_search_idx",
+]
+
+
+def _run(schema_editor, statements):
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        try:
+            _run(schema_editor, SQLITE_FORWARD)
+        except OperationalError as e:
+            if 'no such module: fts5' not in str(e):
+                raise
+            # SQLite built without FTS5; searches fall back to icontains
+            logger.warning(f"SQLite has no FTS5 module, log search will use icontains: {e}")
+    elif vendor == 'postgresql':
+        _run(schema_editor, POSTGRES_FORWARD)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        _run(schema_editor, SQLITE_BACKWARD)
+    elif vendor == 'postgresql':
+        _run(schema_editor, POSTGRES_BACKWARD)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0003_systemlogs_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
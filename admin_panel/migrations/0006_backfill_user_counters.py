@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    """Count the messages and attended events that predate the counter caches"""
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    UserManagement = apps.get_model('admin_panel', 'UserManagement')
+    ChatMessage = apps.get_model('chat', 'ChatMessage')
+    EventInteraction = apps.get_model('attendees', 'EventInteraction')
+
+    missing = User.objects.filter(usermanagement__isnull=True).values_list('id', flat=True)
+    UserManagement.objects.bulk_create(
+        (UserManagement(user_id=user_id) for user_id in missing.iterator()),
+        batch_size=1000, ignore_conflicts=True,
+    )
+
+    messages = ChatMessage.objects.filter(
+        message_type='user', session__user_id=OuterRef('user_id')
+    ).values('session__user_id').annotate(count=Count('id')).values('count')
+    attended = EventInteraction.objects.filter(
+        interaction_type='attended', attendee__user_id=OuterRef('user_id')
+    ).values('attendee__user_id').annotate(count=Count('id')).values('count')
+    UserManagement.objects.update(
+        total_chat_messages=Coalesce(Subquery(messages), Value(0)),
+        total_events_attended=Coalesce(Subquery(attended), Value(0)),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0005_eventmanagement_topics'),
+        ('attendees', '0003_attendeeprofile_topics'),
+        ('chat', '0003_userpreferences_topics'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -70,6 +70,8 @@ class EventManagement(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='draft')
     priority = models.CharField(max_length=20, choices=PRIORITY_CHOICES, default='medium')
     tags = models.TextField(help_text="Comma-separated tags", blank=True)
+    # Derived from tags by ai_engine.topics
+    topics = models.ManyToManyField('ai_engine.Topic', blank=True, editable=False, related_name='events')
     external_url = models.URLField(blank=True)
     created_by = models.ForeignKey(User, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -107,6 +109,10 @@ class UserManagement(models.Model):
     class Meta:
         verbose_name = "User Management"
         verbose_name_plural = "User Management"
+        indexes = [
+            models.Index(fields=['-total_chat_messages'], name='usermgmt_chat_messages_idx'),
+            models.Index(fields=['-total_logins'], name='usermgmt_logins_idx'),
+        ]
     
     def __str__(self):
         return f"Management for {self.user.username}"
@@ -130,9 +136,14 @@ class SystemLogs(models.Model):
     timestamp = models.DateTimeField(auto_now_add=True)
     
     class Meta:
-        ordering = ['-timestamp']
+        ordering = ['-timestamp', '-id']
         verbose_name = "System Log"
         verbose_name_plural = "System Logs"
+        indexes = [
+            models.Index(fields=['-timestamp', '-id'], name='systemlogs_time_id_idx'),
+            models.Index(fields=['level', '-timestamp', '-id'], name='systemlogs_level_time_idx'),
+            models.Index(fields=['module', '-timestamp', '-id'], name='systemlogs_module_time_idx'),
+        ]
     
     def __str__(self):
         return f"{self.level}: {self.message[:50]}..."
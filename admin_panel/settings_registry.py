@@ -0,0 +1,148 @@
+"""
+Typed, cached access to SystemSettings.
+
+All active settings are held in an immutable in-process snapshot. Saving
+or deleting a SystemSettings row bumps a version counter in the cache; each
+worker compares it at most every VERSION_CHECK_INTERVAL seconds and reloads
+the snapshot with one query when it changed. Reads never touch the database
+otherwise.
+"""
+from datetime import datetime
+from django.core.cache import cache
+from django.utils import timezone
+from types import MappingProxyType
+from aura_project.caching import bump_version
+import json
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = 'aura:settings:version'
+
+# Seconds between checks of the shared version counter
+VERSION_CHECK_INTERVAL = 2
+
+TRUE_VALUES = {'1', 'true', 'yes', 'on'}
+FALSE_VALUES = {'0', 'false', 'no', 'off', ''}
+
+
+def _to_bool(value):
+    value = value.strip().lower()
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    raise ValueError(f"not a boolean: {value!r}")
+
+
+def _to_datetime(value):
+    parsed = datetime.fromisoformat(value.strip())
+    return parsed if timezone.is_aware(parsed) else timezone.make_aware(parsed)
+
+
+class SettingsRegistry:
+    """
+    Immutable snapshot of the active SystemSettings with typed getters.
+    Parsed values are memoised per snapshot, so repeated reads are dict lookups.
+    """
+
+    def __init__(self):
+        # (values, memoised parsed values) are swapped together
+        self._state = (MappingProxyType({}), {})
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._subscribers = []
+
+    def _ensure_fresh(self):
+        now = time.monotonic()
+        if now - self._checked_at < VERSION_CHECK_INTERVAL:
+            return
+        self._checked_at = now
+
+        version = cache.get(VERSION_KEY, 0)
+        if version == self._version:
+            return
+        with self._lock:
+            if version == self._version:
+                return
+            previous = self._state[0]
+            self._state = (self._load(), {})
+            self._version = version
+        if self._state[0] != previous:
+            self._notify(previous, self._state[0])
+
+    def _load(self):
+        from admin_panel.models import SystemSettings
+
+        return MappingProxyType(dict(
+            SystemSettings.objects.filter(is_active=True).values_list('key', 'value')
+        ))
+
+    def _notify(self, previous, current):
+        changed = {
+            key for key in current.keys() | previous.keys()
+            if current.get(key) != previous.get(key)
+        }
+        for callback in list(self._subscribers):
+            try:
+                callback(changed, current)
+            except Exception as e:
+                logger.error(f"Settings subscriber {callback!r} failed: {e}")
+
+    def snapshot(self):
+        """The current read-only mapping of setting keys to raw string values"""
+        self._ensure_fresh()
+        return self._state[0]
+
+    def get(self, key, default=None):
+        return self.snapshot().get(key, default)
+
+    def _get_typed(self, key, default, cast):
+        self._ensure_fresh()
+        values, parsed = self._state
+        cache_key = (key, cast)
+        if cache_key not in parsed:
+            raw = values.get(key)
+            if raw is None:
+                return default
+            try:
+                parsed[cache_key] = cast(raw)
+            except (TypeError, ValueError):
+                logger.warning(f"System setting {key}={raw!r} is not a valid {cast.__name__.lstrip('_')}")
+                parsed[cache_key] = None
+        value = parsed[cache_key]
+        return default if value is None else value
+
+    def get_int(self, key, default=None):
+        return self._get_typed(key, default, int)
+
+    def get_float(self, key, default=None):
+        return self._get_typed(key, default, float)
+
+    def get_bool(self, key, default=None):
+        return self._get_typed(key, default, _to_bool)
+
+    def get_datetime(self, key, default=None):
+        return self._get_typed(key, default, _to_datetime)
+
+    def get_json(self, key, default=None):
+        return self._get_typed(key, default, json.loads)
+
+    def subscribe(self, callback):
+        """
+        Call ``callback(changed_keys, snapshot)`` in whichever thread notices
+        a new snapshot with different values.
+        """
+        self._subscribers.append(callback)
+        return callback
+
+    def invalidate(self):
+        """Make every worker reload its snapshot on the next read"""
+        bump_version(VERSION_KEY)
+        self._checked_at = 0.0
+
+
+registry = SettingsRegistry()
@@ -0,0 +1,43 @@
+from django.contrib.auth.signals import user_logged_in
+from django.db.models.signals import m2m_changed, post_save, post_delete
+from django.dispatch import receiver
+from attendees.models import EventInteraction
+from chat.models import ChatMessage
+from admin_panel import counters, maintenance, settings_registry
+from admin_panel.models import MaintenanceMode, SystemSettings
+
+
+@receiver(user_logged_in)
+def count_login(sender, user, **kwargs):
+    counters.increment(user.id, 'total_logins')
+
+
+@receiver(post_save, sender=ChatMessage)
+def count_chat_message(sender, instance, created, raw=False, **kwargs):
+    """Only messages the attendee sent count, not the bot's replies"""
+    if created and not raw and instance.message_type == 'user':
+        counters.increment(instance.session.user_id, 'total_chat_messages')
+
+
+@receiver(post_save, sender=EventInteraction)
+def count_event_attended(sender, instance, created, raw=False, **kwargs):
+    if created and not raw and instance.interaction_type == 'attended':
+        counters.increment(instance.attendee.user_id, 'total_events_attended')
+
+
+@receiver(post_save, sender=SystemSettings)
+@receiver(post_delete, sender=SystemSettings)
+def refresh_settings_registry(sender, **kwargs):
+    settings_registry.registry.invalidate()
+
+
+@receiver(post_save, sender=MaintenanceMode)
+@receiver(post_delete, sender=MaintenanceMode)
+def refresh_maintenance_snapshot(sender, **kwargs):
+    maintenance.publish_snapshot()
+
+
+@receiver(m2m_changed, sender=MaintenanceMode.allowed_users.through)
+def refresh_maintenance_allowed_users(sender, action, **kwargs):
+    if action.startswith('post_'):
+        maintenance.publish_snapshot()
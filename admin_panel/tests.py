@@ -1,3 +1,481 @@
-from django.test import TestCase
+from datetime import timedelta
+from importlib import import_module
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+import logging
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from channels.testing import WebsocketCommunicator
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import OperationalError
+from django.test import Client, TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from admin_panel import counters, log_search, maintenance, metrics, settings_registry
+from admin_panel.log_handlers import SystemLogsHandler, SystemLogsQueueHandler
+from admin_panel.log_search import decode_cursor, encode_cursor, keyset_page, search_logs
+from admin_panel.models import EventManagement, MaintenanceMode, SystemLogs, SystemSettings, UserManagement
+from aura_project.testing import QueryBudgetTestCase, inline_counter_flushes
+from chat.consumers import ChatConsumer
+from chat.models import ChatSession
+
+
+class AdminPanelQueryBudgetTests(QueryBudgetTestCase):
+    """Admin panel pages, exports and Django admin changelists stay within QUERY_BUDGETS"""
+
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser('budget_admin', 'admin@example.com', 'secret')
+        self.target = User.objects.create_user('budget_target', 'target@example.com', 'secret')
+        self.client = Client()
+        self.client.force_login(self.admin_user)
+
+    def get(self, name, *args, **params):
+        return lambda: self.client.get(reverse(name, args=args), params)
+
+    def post(self, name, *args, **data):
+        return lambda: self.client.post(reverse(name, args=args), data)
+
+    def test_views_within_budget(self):
+        self.assertWithinQueryBudgets({
+            'admin_panel:login': lambda: Client().get(reverse('admin_panel:login')),
+            'admin_panel:dashboard': self.get('admin_panel:dashboard'),
+            'admin_panel:user_management': self.get('admin_panel:user_management'),
+            'admin_panel:user_management[suspended]': self.get('admin_panel:user_management', status='suspended'),
+            'admin_panel:suspend_user': self.post('admin_panel:suspend_user', self.target.id, reason='budget'),
+            'admin_panel:event_management': self.get('admin_panel:event_management'),
+            'admin_panel:reload_feed': self.post('admin_panel:reload_feed'),
+            'admin_panel:system_settings': self.get('admin_panel:system_settings'),
+            'admin_panel:toggle_profiler': self.post('admin_panel:toggle_profiler', duration=0),
+            'admin_panel:analytics[7]': self.get('admin_panel:analytics', days=7),
+            'admin_panel:analytics[30]': self.get('admin_panel:analytics', days=30),
+            'admin_panel:system_logs': self.get('admin_panel:system_logs'),
+            'admin_panel:system_logs[search]': self.get('admin_panel:system_logs', search='reloaded', level='INFO'),
+            'admin_panel:maintenance_mode': self.get('admin_panel:maintenance_mode'),
+            'admin_panel:export_data[users]': self.get('admin_panel:export_data', type='users'),
+            'admin_panel:export_data[events]': self.get('admin_panel:export_data', type='events'),
+            'admin_panel:export_data[logs]': self.get('admin_panel:export_data', type='logs'),
+        })
+
+    def test_admin_changelists_within_budget(self):
+        cases = {}
+        for model in admin.site._registry:
+            name = f'admin:{model._meta.app_label}_{model._meta.model_name}_changelist'
+            cases[name] = self.get(name)
+        self.assertWithinQueryBudgets(cases)
+
+
+def reset_maintenance(test):
+    """Forget the maintenance snapshot a test published once its rows are rolled back"""
+    def reset():
+        cache.delete(maintenance.SNAPSHOT_KEY)
+        maintenance._local.update(snapshot=maintenance.INACTIVE, checked_at=None)
+    reset()
+    test.addCleanup(reset)
+
+
+class DashboardMetricsTests(TestCase):
+    """The cached aggregates report what one query per counter used to"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.enterClassContext(inline_counter_flushes())
+
+    def setUp(self):
+        cache.clear()
+        reset_maintenance(self)
+        now = timezone.now()
+        self.admin_user = User.objects.create_superuser('metrics_admin', 'metrics_admin@example.com', 'secret')
+        for number in range(4):
+            user = User.objects.create_user(f'attendee{number}', f'attendee{number}@example.com', 'secret')
+            User.objects.filter(id=user.id).update(
+                date_joined=now - timedelta(days=3 * number),
+                last_login=now if number % 2 else now - timedelta(days=2),
+            )
+            ChatSession.objects.create(user=user, session_id=f'metrics-{number}', is_active=number < 3)
+        for number, status in enumerate(['published', 'published', 'draft']):
+            EventManagement.objects.create(
+                title=f'Event {number}', description='', start_datetime=now, end_datetime=now + timedelta(hours=1),
+                status=status, current_attendees=number * 10, created_by=self.admin_user,
+            )
+        for number in range(12):
+            SystemLogs.objects.create(level='INFO', message=f'log {number}', module='tests')
+
+    def test_matches_the_per_query_counts(self):
+        now = timezone.now()
+        expected = {
+            'total_users': User.objects.count(),
+            'active_users_today': User.objects.filter(last_login__date=now.date()).count(),
+            'total_events': EventManagement.objects.count(),
+            'active_events': EventManagement.objects.filter(status='published').count(),
+            'total_chat_sessions': ChatSession.objects.count(),
+            'active_sessions': ChatSession.objects.filter(is_active=True).count(),
+            'recent_registrations': User.objects.filter(date_joined__gte=now - timedelta(days=7)).count(),
+        }
+        computed = metrics.compute_dashboard_metrics()
+
+        self.assertEqual(computed['metrics'], expected)
+        self.assertEqual(computed['recent_logs'], list(SystemLogs.objects.all()[:10]))
+        self.assertEqual([event.title for event in computed['top_events']], ['Event 2', 'Event 1', 'Event 0'])
+
+    def test_dashboard_shows_the_maintenance_banner(self):
+        client = Client()
+        client.force_login(self.admin_user)
+        self.assertNotContains(client.get(reverse('admin_panel:dashboard')), 'Maintenance Mode Active')
+
+        now = timezone.now()
+        MaintenanceMode.objects.create(is_active=True, message='Back at noon', start_time=now,
+                                       end_time=now + timedelta(hours=1), created_by=self.admin_user)
+        response = client.get(reverse('admin_panel:dashboard'))
+        self.assertContains(response, 'Back at noon')
+        self.assertContains(response, 'log 11')
+
+
+class UserCounterTests(TestCase):
+    """Counter increments are written by the timer thread, and nothing else writes the counters back"""
+
+    def setUp(self):
+        patcher = mock.patch.object(counters, '_schedule_flush')
+        self.schedule = patcher.start()
+        self.addCleanup(patcher.stop)
+        counters._pending.clear()
+        counters._pending_count = 0
+        self.user = User.objects.create_user('counted', 'counted@example.com', 'secret')
+
+    def test_a_full_buffer_flushes_on_the_timer_not_inline(self):
+        for _ in range(counters.FLUSH_THRESHOLD):
+            counters.increment(self.user.id, 'total_chat_messages')
+        self.assertFalse(UserManagement.objects.filter(user=self.user, total_chat_messages__gt=0).exists())
+        self.schedule.assert_called_with(0)
+
+        counters.flush()
+        self.assertEqual(UserManagement.objects.get(user=self.user).total_chat_messages, counters.FLUSH_THRESHOLD)
+
+    def test_suspending_keeps_counts_flushed_meanwhile(self):
+        admin_user = User.objects.create_superuser('counter_admin', 'counter_admin@example.com', 'secret')
+        client = Client()
+        client.force_login(admin_user)
+        stale = UserManagement.objects.create(user=self.user)
+        # A flush lands between the view's read and its save
+        UserManagement.objects.filter(user=self.user).update(total_chat_messages=5)
+
+        with mock.patch.object(UserManagement.objects, 'get_or_create', return_value=(stale, False)):
+            response = client.post(reverse('admin_panel:suspend_user', args=[self.user.id]), {'reason': 'spam'})
+        self.assertEqual(response.json()['action'], 'suspended')
+
+        management = UserManagement.objects.get(user=self.user)
+        self.assertTrue(management.is_suspended)
+        self.assertEqual(management.total_chat_messages, 5)
+
+
+def log_record(message, *args, level=logging.WARNING, line=10):
+    return logging.LogRecord('chat.admission', level, __file__, line, message, args, None)
+
+
+class SystemLogsHandlerTests(TestCase):
+    """Records are written in batches, repeats collapse, and failed writes are retried then spilled"""
+
+    def setUp(self):
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.spill_file = Path(directory.name) / 'spill.log'
+
+    def handler(self, **options):
+        handler = SystemLogsHandler(**{'batch_size': 3, 'retry_delay': 0, **options})
+        self.addCleanup(handler.close)
+        return handler
+
+    def test_writes_full_batches(self):
+        handler = self.handler()
+        handler.handle(log_record('first', line=1))
+        handler.handle(log_record('second', line=2))
+        self.assertFalse(SystemLogs.objects.exists())
+
+        handler.handle(log_record('third', line=3))
+        self.assertEqual(sorted(SystemLogs.objects.values_list('message', flat=True)), ['first', 'second', 'third'])
+
+    def test_repeats_are_written_once(self):
+        handler = self.handler(batch_size=100)
+        for user_id in range(5):
+            handler.handle(log_record('Connection ceiling reached (%s), rejecting user %s', 2, user_id))
+        handler.handle(log_record('Cache unavailable', line=20))
+        handler.flush()
+
+        ceiling = SystemLogs.objects.get(message__startswith='Connection ceiling')
+        self.assertEqual(ceiling.message, 'Connection ceiling reached (2), rejecting user 0')
+        self.assertEqual(ceiling.metadata['repeats'], 5)
+        self.assertNotIn('repeats', SystemLogs.objects.get(message='Cache unavailable').metadata)
+
+    def test_retries_before_giving_up(self):
+        handler = self.handler(retries=2)
+        with mock.patch.object(SystemLogs.objects, 'bulk_create',
+                               side_effect=[OperationalError('database table is locked'), []]) as bulk_create:
+            handler.handle(log_record('locked once'))
+            handler.flush()
+        self.assertEqual(bulk_create.call_count, 2)
+        self.assertEqual(handler.dropped, 0)
+
+    def test_failed_writes_spill_to_the_file(self):
+        handler = self.handler(retries=2, spill_file=self.spill_file)
+        with mock.patch.object(SystemLogs.objects, 'bulk_create',
+                               side_effect=OperationalError('database table is locked')) as bulk_create:
+            handler.handle(log_record('kept in the spill file'))
+            handler.flush()
+        self.assertEqual(bulk_create.call_count, 3)
+        self.assertEqual(handler.dropped, 0)
+        self.assertIn('kept in the spill file', self.spill_file.read_text())
+
+    def test_failed_writes_are_dropped_without_a_spill_file(self):
+        handler = self.handler(retries=0)
+        with mock.patch.object(SystemLogs.objects, 'bulk_create', side_effect=OperationalError('locked')):
+            handler.handle(log_record('lost'))
+            handler.flush()
+        self.assertEqual(handler.dropped, 1)
+
+
+class SystemLogsQueueHandlerTests(TransactionTestCase):
+    """The background writer flushes whatever is still queued on shutdown"""
+
+    databases = {'default', 'read'}
+
+    def test_close_flushes_the_queue(self):
+        handler = SystemLogsQueueHandler(batch_size=100, flush_interval=60)
+        for line in range(3):
+            handler.handle(log_record(f'queued {line}', line=line))
+        handler.close()
+        self.assertEqual(SystemLogs.objects.count(), 3)
+
+
+class SystemLogsPaginationTests(TestCase):
+    """Cursors walk every log exactly once in both directions, ties included"""
+
+    def setUp(self):
+        moment = timezone.now().replace(microsecond=123456)
+        self.logs = [
+            SystemLogs.objects.create(level='INFO', message=f'entry {number}', module='tests')
+            for number in range(7)
+        ]
+        # Three rows share a timestamp; their ids break the tie
+        for offset, log in enumerate(self.logs):
+            log.timestamp = moment - timedelta(seconds=min(offset, 4))
+            SystemLogs.objects.filter(id=log.id).update(timestamp=log.timestamp)
+        self.newest_first = sorted(self.logs, key=lambda log: (log.timestamp, log.id), reverse=True)
+
+    def ids(self, page):
+        return [log.id for log in page['object_list']]
+
+    def test_cursor_round_trips(self):
+        log = self.logs[0]
+        self.assertEqual(decode_cursor(encode_cursor(log)), (log.timestamp, log.id))
+        self.assertIsNone(decode_cursor('not-a-cursor'))
+
+    def test_pages_forward_and_back_through_ties(self):
+        expected = [log.id for log in self.newest_first]
+        pages = [keyset_page(SystemLogs.objects.all(), per_page=3)]
+        while pages[-1]['next_cursor']:
+            pages.append(keyset_page(SystemLogs.objects.all(), after=pages[-1]['next_cursor'], per_page=3))
+
+        self.assertEqual([log_id for page in pages for log_id in self.ids(page)], expected)
+        self.assertIsNone(pages[0]['previous_cursor'])
+
+        back = keyset_page(SystemLogs.objects.all(), before=pages[2]['previous_cursor'], per_page=3)
+        self.assertEqual(self.ids(back), self.ids(pages[1]))
+        back = keyset_page(SystemLogs.objects.all(), before=back['previous_cursor'], per_page=3)
+        self.assertEqual(self.ids(back), self.ids(pages[0]))
+        self.assertIsNone(back['previous_cursor'])
+
+    def test_view_renders_the_page(self):
+        admin_user = User.objects.create_superuser('logs_admin', 'logs_admin@example.com', 'secret')
+        client = Client()
+        client.force_login(admin_user)
+        response = client.get(reverse('admin_panel:system_logs'))
+        self.assertTemplateUsed(response, 'admin_panel/system_logs.html')
+        self.assertContains(response, 'entry 0')
+        self.assertNotContains(response, '?before=')
+
+
+class SystemLogsSearchTests(TestCase):
+    """Free-text search matches whole terms and a typed prefix, with or without FTS5"""
+
+    def setUp(self):
+        SystemLogs.objects.create(level='INFO', message='Feed reloaded by staff', module='ai_engine.feed')
+        SystemLogs.objects.create(level='ERROR', message='Database table is locked', module='admin_panel')
+        SystemLogs.objects.create(level='INFO', message='User suspended', module='admin_panel')
+
+    def messages(self, query):
+        return sorted(search_logs(SystemLogs.objects.all(), query).values_list('message', flat=True))
+
+    def test_full_text_search(self):
+        if not log_search._has_sqlite_fts('default'):
+            self.skipTest('SQLite built without FTS5')
+        self.assertEqual(self.messages('feed reload'), ['Feed reloaded by staff'])
+        self.assertEqual(self.messages('admin_panel'), ['Database table is locked', 'User suspended'])
+        self.assertEqual(self.messages('locked database'), ['Database table is locked'])
+        self.assertEqual(self.messages('!!'), sorted(SystemLogs.objects.values_list('message', flat=True)))
+
+    def test_fallback_search(self):
+        with mock.patch.object(log_search, '_has_sqlite_fts', return_value=False):
+            self.assertEqual(self.messages('reloaded'), ['Feed reloaded by staff'])
+            self.assertEqual(self.messages('admin_panel'), ['Database table is locked', 'User suspended'])
+            self.assertEqual(self.messages('nothing'), [])
+
+
+class FullTextMigrationTests(TestCase):
+    """Only a missing FTS5 module is tolerated when the search table is created"""
+
+    migration = import_module('admin_panel.migrations.0004_systemlogs_fulltext')
+
+    def schema_editor(self, error):
+        editor = mock.Mock()
+        editor.connection.vendor = 'sqlite'
+        editor.execute.side_effect = error
+        return editor
+
+    def test_missing_fts5_is_logged(self):
+        editor = self.schema_editor(OperationalError('no such module: fts5'))
+        with self.assertLogs(self.migration.__name__, level='WARNING'):
+            self.migration.create_search_index(None, editor)
+
+    def test_other_errors_are_raised(self):
+        editor = self.schema_editor(OperationalError('database is locked'))
+        with self.assertRaises(OperationalError):
+            self.migration.create_search_index(None, editor)
+
+
+class SettingsRegistryTests(TestCase):
+    """Typed reads parse once per snapshot, and saved settings reach every worker through the version"""
+
+    def setUp(self):
+        cache.clear()
+        self.registry = settings_registry.SettingsRegistry()
+        for key, value in {
+            'max_connections': '250', 'ratio': '0.75', 'enabled': 'Yes', 'disabled': 'off',
+            'until': '2026-01-02T03:04:05', 'options': '{"tones": ["warm", "brief"]}', 'broken': 'many',
+        }.items():
+            SystemSettings.objects.create(key=key, value=value)
+
+    def test_typed_getters(self):
+        self.assertEqual(self.registry.get_int('max_connections'), 250)
+        self.assertEqual(self.registry.get_float('ratio'), 0.75)
+        self.assertIs(self.registry.get_bool('enabled'), True)
+        self.assertIs(self.registry.get_bool('disabled', True), False)
+        until = self.registry.get_datetime('until')
+        self.assertTrue(timezone.is_aware(until))
+        self.assertEqual((until.year, until.hour), (2026, 3))
+        self.assertEqual(self.registry.get_json('options'), {'tones': ['warm', 'brief']})
+        self.assertEqual(self.registry.get('missing', 'fallback'), 'fallback')
+        self.assertEqual(self.registry.get_int('missing', 7), 7)
+
+    def test_invalid_values_fall_back_to_the_default(self):
+        with self.assertLogs(settings_registry.__name__, level='WARNING') as logs:
+            self.assertEqual(self.registry.get_int('broken', 3), 3)
+            self.assertIsNone(self.registry.get_bool('broken'))
+            self.assertEqual(self.registry.get_int('broken', 4), 4)
+        # Each cast of a bad value is reported once per snapshot
+        self.assertEqual(len(logs.output), 2)
+
+    def test_reads_are_served_from_the_snapshot(self):
+        self.registry.get_int('max_connections')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.registry.get_int('max_connections'), 250)
+            self.assertTrue(self.registry.get_bool('enabled'))
+
+    def test_picks_up_other_workers_changes_on_the_next_version_check(self):
+        subscriber = mock.Mock()
+        self.registry.subscribe(subscriber)
+        self.assertEqual(self.registry.get_int('max_connections'), 250)
+        subscriber.reset_mock()
+
+        # Saved through the ORM, which bumps the shared version
+        SystemSettings.objects.filter(key='max_connections').update(value='300')
+        SystemSettings.objects.get(key='ratio').save()
+        self.assertEqual(self.registry.get_int('max_connections'), 250)
+
+        self.registry._checked_at -= settings_registry.VERSION_CHECK_INTERVAL
+        self.assertEqual(self.registry.get_int('max_connections'), 300)
+        subscriber.assert_called_once()
+        self.assertEqual(subscriber.call_args.args[0], {'max_connections'})
+
+    def test_signals_invalidate_the_local_registry(self):
+        registry = settings_registry.registry
+        # The rolled-back rows must not outlive this test in the shared registry
+        self.addCleanup(registry.invalidate)
+        setting = SystemSettings.objects.get(key='max_connections')
+        setting.value = '500'
+        setting.save()
+        self.assertEqual(registry.get_int('max_connections'), 500)
+
+        setting.delete()
+        self.assertIsNone(registry.get_int('max_connections'))
+
+        SystemSettings.objects.filter(key='ratio').update(is_active=False)
+        SystemSettings.objects.get(key='enabled').save()
+        self.assertIsNone(registry.get('ratio'))
+
+
+class MaintenanceModeTests(TestCase):
+    """An active window turns pages and WebSockets away, except for allowed users and exempt paths"""
+
+    def setUp(self):
+        cache.clear()
+        reset_maintenance(self)
+        self.staff = User.objects.create_user('on_call', 'on_call@example.com', 'secret', is_staff=True)
+        self.attendee = User.objects.create_user('visitor', 'visitor@example.com', 'secret')
+        now = timezone.now()
+        self.window = MaintenanceMode.objects.create(
+            is_active=True, message='Upgrading the database', start_time=now - timedelta(minutes=1),
+            end_time=now + timedelta(minutes=30), created_by=self.staff,
+        )
+
+    def client_for(self, user=None):
+        client = Client()
+        if user is not None:
+            client.force_login(user)
+        return client
+
+    def test_pages_answer_503_with_the_maintenance_page(self):
+        response = self.client_for(self.attendee).get(reverse('chat:home'))
+        self.assertEqual(response.status_code, 503)
+        self.assertTemplateUsed(response, 'maintenance.html')
+        self.assertContains(response, 'Upgrading the database', status_code=503)
+        self.assertTrue(0 < int(response['Retry-After']) <= 30 * 60)
+
+        response = self.client_for().get(reverse('chat:home'), HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['error'], 'maintenance')
+
+    def test_exempt_paths_stay_reachable(self):
+        self.assertEqual(self.client_for().get(reverse('chat:health_live')).status_code, 200)
+        response = self.client_for(self.staff).get(reverse('admin_panel:dashboard'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_allowed_users_bypass_the_window(self):
+        self.window.allowed_users.add(self.staff)
+        self.assertNotEqual(self.client_for(self.staff).get(reverse('chat:home')).status_code, 503)
+        self.assertEqual(self.client_for(self.attendee).get(reverse('chat:home')).status_code, 503)
+        self.assertEqual(self.client_for().get(reverse('chat:home')).status_code, 503)
+
+    def test_nothing_is_blocked_outside_the_window(self):
+        self.window.start_time = timezone.now() + timedelta(hours=1)
+        self.window.end_time = self.window.start_time + timedelta(hours=1)
+        self.window.save()
+        self.assertNotEqual(self.client_for(self.attendee).get(reverse('chat:home')).status_code, 503)
+
+    def test_websockets_are_closed_with_1013(self):
+        async def connect(user):
+            communicator = WebsocketCommunicator(ChatConsumer.as_asgi(), '/ws/chat/')
+            communicator.scope['user'] = user
+            connected, _ = await communicator.connect()
+            message = await communicator.receive_json_from(timeout=5)
+            closed = await communicator.receive_output(timeout=5)
+            return connected, message, closed
+
+        connected, message, closed = async_to_sync(connect)(self.attendee)
+        self.assertTrue(connected)
+        self.assertEqual(message['type'], 'maintenance')
+        self.assertEqual(message['message'], 'Upgrading the database')
+        self.assertEqual(closed, {'type': 'websocket.close', 'code': 1013})
@@ -17,9 +17,11 @@ urlpatterns = [
     
     # Event management
     path('events/', views.event_management, name='event_management'),
+    path('feed/reload/', views.reload_feed, name='reload_feed'),
     
     # System settings
     path('settings/', views.system_settings, name='system_settings'),
+    path('profiler/', views.toggle_profiler, name='toggle_profiler'),
     
     # Analytics
     path('analytics/', views.analytics_dashboard, name='analytics'),
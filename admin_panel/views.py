@@ -7,6 +7,7 @@ from django.contrib import messages
 from django.http import JsonResponse, HttpResponse
 from django.core.paginator import Paginator
 from django.db.models import Q, Count, Sum
+from django.db.models.functions import TruncDate
 from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
@@ -14,19 +15,26 @@ import json
 from datetime import datetime, timedelta
 import csv
 
+from .log_search import keyset_page, search_logs
+from .maintenance import get_snapshot as get_maintenance_snapshot
+from .metrics import get_dashboard_metrics
 from .models import (
     AdminProfile, SystemSettings, EventManagement, UserManagement,
     SystemLogs, Analytics, NotificationTemplate, MaintenanceMode
 )
 from attendees.models import AttendeeProfile, EventInteraction
-from chat.models import ChatSession, ChatMessage
+from chat import profiling
+from chat.analytics import top_active_users
+from chat.models import ChatMessage
 from events.models import Session
+from ai_engine import feed
+from aura_project.db.routers import use_replica
 
 def is_admin_user(user):
     """Check if user has admin privileges"""
     try:
-        admin_profile = AdminProfile.objects.get(user=user)
-        return admin_profile.is_active_admin
+        # The reverse accessor caches the profile (or its absence) on the user
+        return user.adminprofile.is_active_admin
     except AdminProfile.DoesNotExist:
         return user.is_staff or user.is_superuser
 
@@ -68,47 +76,19 @@ def admin_logout(request):
 def admin_dashboard(request):
     """Main admin dashboard with key metrics"""
     
-    # Get current admin profile
-    try:
-        admin_profile = AdminProfile.objects.get(user=request.user)
-        admin_profile.update_last_login()
-    except AdminProfile.DoesNotExist:
-        admin_profile = None
-    
-    # Calculate key metrics
-    total_users = User.objects.count()
-    active_users_today = User.objects.filter(last_login__date=timezone.now().date()).count()
-    total_events = EventManagement.objects.count()
-    active_events = EventManagement.objects.filter(status='published').count()
-    total_chat_sessions = ChatSession.objects.count()
-    active_sessions = ChatSession.objects.filter(is_active=True).count()
-    
-    # Recent activities
-    recent_logs = SystemLogs.objects.all()[:10]
-    recent_registrations = User.objects.filter(date_joined__gte=timezone.now() - timedelta(days=7)).count()
-    
-    # System health
-    maintenance_mode = MaintenanceMode.objects.filter(is_active=True).first()
+    # Current admin profile, already loaded by is_admin_user (last login is recorded by admin_login)
+    admin_profile = getattr(request.user, 'adminprofile', None)
     
-    # User engagement metrics
-    top_events = EventManagement.objects.annotate(
-        interaction_count=Count('id')
-    ).order_by('-interaction_count')[:5]
+    # Key metrics and recent activities, cached and refreshed in the background
+    dashboard_metrics = get_dashboard_metrics()
     
     context = {
         'admin_profile': admin_profile,
-        'metrics': {
-            'total_users': total_users,
-            'active_users_today': active_users_today,
-            'total_events': total_events,
-            'active_events': active_events,
-            'total_chat_sessions': total_chat_sessions,
-            'active_sessions': active_sessions,
-            'recent_registrations': recent_registrations,
-        },
-        'recent_logs': recent_logs,
-        'maintenance_mode': maintenance_mode,
-        'top_events': top_events,
+        'metrics': dashboard_metrics['metrics'],
+        'recent_logs': dashboard_metrics['recent_logs'],
+        # System health, from the shared maintenance snapshot
+        'maintenance_mode': get_maintenance_snapshot(),
+        'top_events': dashboard_metrics['top_events'],
     }
     
     return render(request, 'admin_panel/dashboard.html', context)
@@ -227,6 +207,7 @@ def system_settings(request):
 
 @login_required
 @user_passes_test(is_admin_user)
+@use_replica()
 def analytics_dashboard(request):
     """Analytics and reporting dashboard"""
     
@@ -234,37 +215,36 @@ def analytics_dashboard(request):
     days = int(request.GET.get('days', 30))
     start_date = timezone.now().date() - timedelta(days=days)
     
-    # User analytics
-    daily_registrations = []
-    daily_logins = []
+    # User analytics: one grouped query per series instead of two per day
+    period_start = timezone.make_aware(datetime.combine(start_date, datetime.min.time()))
+    period_end = period_start + timedelta(days=days)
+    
+    def daily_counts(field):
+        counts = dict(
+            User.objects.filter(**{f'{field}__gte': period_start, f'{field}__lt': period_end})
+            .annotate(day=TruncDate(field))
+            .values('day')
+            .annotate(count=Count('id'))
+            .values_list('day', 'count')
+        )
+        return [
+            {'date': date.strftime('%Y-%m-%d'), 'count': counts.get(date, 0)}
+            for date in (start_date + timedelta(days=i) for i in range(days))
+        ]
     
-    for i in range(days):
-        date = start_date + timedelta(days=i)
-        registrations = User.objects.filter(date_joined__date=date).count()
-        logins = User.objects.filter(last_login__date=date).count()
-        
-        daily_registrations.append({
-            'date': date.strftime('%Y-%m-%d'),
-            'count': registrations
-        })
-        daily_logins.append({
-            'date': date.strftime('%Y-%m-%d'),
-            'count': logins
-        })
+    daily_registrations = daily_counts('date_joined')
+    daily_logins = daily_counts('last_login')
     
     # Event analytics
     event_stats = EventManagement.objects.values('status').annotate(count=Count('id'))
     
     # Chat analytics
     chat_stats = ChatMessage.objects.filter(
-        timestamp__date__gte=start_date
+        timestamp__gte=period_start
     ).values('message_type').annotate(count=Count('id'))
     
     # Top users by activity
-    active_users = User.objects.annotate(
-        message_count=Count('chatsession__messages'),
-        session_count=Count('chatsession')
-    ).order_by('-message_count')[:10]
+    active_users = top_active_users(limit=10)
     
     context = {
         'daily_registrations': daily_registrations,
@@ -285,23 +265,26 @@ def system_logs(request):
     level_filter = request.GET.get('level', 'all')
     search_query = request.GET.get('search', '')
     
-    logs = SystemLogs.objects.all()
+    logs = SystemLogs.objects.select_related('user')
     
     if level_filter != 'all':
         logs = logs.filter(level=level_filter)
     
     if search_query:
-        logs = logs.filter(
-            Q(message__icontains=search_query) |
-            Q(module__icontains=search_query)
-        )
-    
-    paginator = Paginator(logs, 50)
-    page_number = request.GET.get('page')
-    logs_page = paginator.get_page(page_number)
+        logs = search_logs(logs, search_query)
+    
+    # Keyset pagination: no COUNT(*) and no OFFSET scans on deep pages
+    page = keyset_page(
+        logs,
+        after=request.GET.get('after'),
+        before=request.GET.get('before'),
+        per_page=50
+    )
     
     context = {
-        'logs': logs_page,
+        'logs': page['object_list'],
+        'next_cursor': page['next_cursor'],
+        'previous_cursor': page['previous_cursor'],
         'level_filter': level_filter,
         'search_query': search_query,
         'log_levels': SystemLogs.LOG_LEVELS,
@@ -333,8 +316,9 @@ def suspend_user(request, user_id):
         user.is_active = False
         action = 'suspended'
     
-    user_mgmt.save()
-    user.save()
+    # Leave the counters to their F() updates; writing them back could undo a flush
+    user_mgmt.save(update_fields=['is_suspended', 'suspension_date', 'suspension_reason', 'updated_at'])
+    user.save(update_fields=['is_active'])
     
     # Log the action
     SystemLogs.objects.create(
@@ -404,6 +388,50 @@ def maintenance_mode(request):
 
 @login_required
 @user_passes_test(is_admin_user)
+@require_http_methods(["POST"])
+def reload_feed(request):
+    """Hot-reload the curated live feed items on every worker"""
+    
+    item_count = feed.registry.reload()
+    
+    # Log the action
+    SystemLogs.objects.create(
+        level='INFO',
+        message=f"Live feed reloaded by {request.user.username} ({item_count} items)",
+        module='admin_panel',
+        user=request.user,
+        metadata={'item_count': item_count}
+    )
+    
+    return JsonResponse({'success': True, 'item_count': item_count})
+
+@login_required
+@user_passes_test(is_admin_user)
+@require_http_methods(["POST"])
+def toggle_profiler(request):
+    """Run the sampling profiler on every worker for a number of seconds (0 stops it)"""
+    
+    try:
+        duration = int(request.POST.get('duration', 60))
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'duration must be a number of seconds'}, status=400)
+    
+    until = profiling.enable(duration, user=request.user)
+    
+    # Log the action
+    SystemLogs.objects.create(
+        level='INFO',
+        message=f"Sampling profiler {'enabled until ' + until.isoformat() if duration > 0 else 'disabled'} by {request.user.username}",
+        module='admin_panel',
+        user=request.user,
+        metadata={'duration': duration, 'enabled_until': until.isoformat()}
+    )
+    
+    return JsonResponse({'success': True, 'enabled_until': until.isoformat()})
+
+@login_required
+@user_passes_test(is_admin_user)
+@use_replica()
 def export_data(request):
     """Export system data as CSV"""
     
@@ -433,7 +461,7 @@ def export_data(request):
         writer = csv.writer(response)
         writer.writerow(['Title', 'Status', 'Start Date', 'End Date', 'Attendees', 'Max Attendees', 'Created By'])
         
-        events = EventManagement.objects.all()
+        events = EventManagement.objects.select_related('created_by')
         for event in events:
             writer.writerow([
                 event.title,
@@ -450,7 +478,7 @@ def export_data(request):
         writer = csv.writer(response)
         writer.writerow(['Level', 'Message', 'Module', 'User', 'Timestamp'])
         
-        logs = SystemLogs.objects.all()[:1000]  # Limit to recent 1000 logs
+        logs = SystemLogs.objects.select_related('user')[:1000]  # Limit to recent 1000 logs
         for log in logs:
             writer.writerow([
                 log.level,
@@ -1,3 +1,8 @@
 from django.contrib import admin
+from .models import Topic
 
-# Register your models here.
+
+@admin.register(Topic)
+class TopicAdmin(admin.ModelAdmin):
+    list_display = ['name', 'key']
+    search_fields = ['name', 'key']
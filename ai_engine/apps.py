@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AiEngineConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'ai_engine'
+
+    def ready(self):
+        from ai_engine import signals  # noqa: F401
@@ -3,29 +3,58 @@ import re
 from datetime import datetime, timedelta
 from django.utils import timezone
 from django.contrib.auth.models import User
-from django.db.models import Q, Count, Avg
+from django.db.models import Count, Avg
 from attendees.models import AttendeeProfile, EventInteraction
 from events.models import Session, Speaker
 from chat.models import ChatSession, ChatMessage, UserActivity
+from ai_engine import feed, response_cache, topics
+from ai_engine.context import ChatContext, load_context, save_context
 import random
 import logging
-from typing import Dict, List, Optional
-from dataclasses import dataclass
+from typing import Dict, Optional
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-@dataclass
-class ChatContext:
-    """Context for maintaining conversation state"""
-    user_intent: str = ""
-    last_topic: str = ""
-    conversation_depth: int = 0
-    session_history: List[str] = None
-    
-    def __post_init__(self):
-        if self.session_history is None:
-            self.session_history = []
+# Ordinal words used to refer back to items of the previous answer
+ORDINALS = {
+    'first': 1, '1st': 1, 'second': 2, '2nd': 2, 'third': 3, '3rd': 3,
+    'fourth': 4, '4th': 4, 'fifth': 5, '5th': 5, 'last': -1,
+}
+# A follow-up cue directly followed by a reference to one item: "more about
+# the second one", "explain #2". An ordinal word only counts on its own or
+# before "one", so "tell me about the last session" stays a normal question.
+FOLLOW_UP_PATTERN = re.compile(
+    r'\b(?:more|about|details?|explain)\b(?:\s+(?:about|on|of|me|the))*\s+'
+    r'(?:(' + '|'.join(ORDINALS) + r')(?=\s+one\b|\s*[?.!,]|\s*$)|(?:#|number |no\. ?)(\d)\b)'
+)
+
+# Static answers, built once at import time
+LOCATION_RESPONSE = """🗺️ **Venue Information:**
+
+**Main Auditorium** - Keynotes and main sessions
+**Conference Room A** - Technical workshops  
+**Conference Room B** - Panel discussions
+**Networking Lounge** - Coffee breaks and networking
+**Exhibition Hall** - Sponsor booths and demos
+
+Need directions to a specific room? Just ask! 🧭"""
+
+HELP_RESPONSE = """🆘 **I'm here to help!** Here's what I can do:
+
+✅ **Recommend sessions** based on your interests
+✅ **Show schedules** and timing information  
+✅ **Find speakers** and their sessions
+✅ **Provide venue** directions and maps
+✅ **Suggest networking** opportunities
+✅ **Send alerts** for sessions you're interested in
+
+Just ask me anything in natural language! For example:
+• "What sessions should I attend?"
+• "When is the next keynote?"
+• "Who's speaking about AI?"
+
+What would you like to know? 😊"""
 
 class AuraConcierge:
     def __init__(self):
@@ -69,8 +98,13 @@ class AuraConcierge:
             return response
         
         # Process the message and generate response
-        response = self._process_message(message, profile, session)
-        self._log_message(session, 'bot', response)
+        context = load_context(session)
+        loaded_state = context.to_state()
+        response = self._process_message(message, profile, session, context)
+        state = save_context(session, context, loaded_state)
+        
+        # Persist the context lazily alongside the bot message, only when it changed
+        self._log_message(session, 'bot', response, metadata={'context': state} if state else None)
         
         return response
     
@@ -108,41 +142,125 @@ class AuraConcierge:
         
         return greeting + "\n\n" + "\n".join(context_parts)
     
-    def _process_message(self, message, profile, session):
+    def _process_message(self, message, profile, session, context=None):
         """Process user message and generate appropriate response"""
         message_lower = message.lower()
+        context = context if context is not None else ChatContext()
+        
+        # Follow-ups refer to items of the previous answer ("the second one")
+        follow_up = self._handle_follow_up(message_lower, context)
+        if follow_up:
+            return follow_up
+        
+        intent = self._detect_intent(message_lower)
+        
+        if intent == 'recommendation':
+            reply = self._handle_recommendation_request(message, profile)
+        elif intent == 'schedule':
+            reply = self._handle_schedule_request(message, profile)
+        elif intent == 'speaker':
+            reply = self._handle_speaker_request(message, profile)
+        elif intent == 'location':
+            reply = self._handle_location_request(message, profile)
+        elif intent == 'networking':
+            reply = self._handle_networking_request(message, profile)
+        elif intent == 'help':
+            reply = self._handle_help_request()
+        elif intent == 'appreciation':
+            reply = self._handle_appreciation()
+        else:
+            reply = self._handle_general_query(message, profile)
         
-        # Intent detection
+        # List answers also return references to the items they mention
+        response, items = reply if isinstance(reply, tuple) else (reply, ())
+        context.record_turn(intent, message, items)
+        return response
+    
+    def _detect_intent(self, message_lower):
+        """Classify a message into one of the concierge intents"""
         if any(word in message_lower for word in ['recommend', 'suggest', 'session', 'talk', 'what should']):
-            return self._handle_recommendation_request(message, profile)
-        
+            return 'recommendation'
         elif any(word in message_lower for word in ['schedule', 'agenda', 'timeline', 'when', 'time']):
-            return self._handle_schedule_request(message, profile)
-        
+            return 'schedule'
         elif any(word in message_lower for word in ['speaker', 'who', 'presenter']):
-            return self._handle_speaker_request(message, profile)
-        
+            return 'speaker'
         elif any(word in message_lower for word in ['location', 'where', 'room', 'venue']):
-            return self._handle_location_request(message, profile)
-        
+            return 'location'
         elif any(word in message_lower for word in ['network', 'connect', 'meet', 'people']):
-            return self._handle_networking_request(message, profile)
-        
+            return 'networking'
         elif any(word in message_lower for word in ['help', 'assistance', 'support']):
-            return self._handle_help_request()
-        
+            return 'help'
         elif any(word in message_lower for word in ['thank', 'thanks', 'great', 'awesome']):
-            return self._handle_appreciation()
-        
+            return 'appreciation'
+        return 'general'
+    
+    def _handle_follow_up(self, message_lower, context):
+        """Resolve references like "tell me more about the second one" from context"""
+        if not context.last_items:
+            return None
+        
+        match = FOLLOW_UP_PATTERN.search(message_lower)
+        if not match:
+            return None
+        position = ORDINALS[match.group(1)] if match.group(1) else int(match.group(2))
+        
+        item = context.get_item(position)
+        if item is None:
+            return f"I only mentioned {len(context.last_items)} items last time - which one did you mean? 🤔"
+        
+        kind, item_id = item
+        if kind == 'session':
+            response, title = self._describe_session(item_id)
         else:
-            return self._handle_general_query(message, profile)
+            response, title = self._describe_speaker(item_id)
+        
+        context.record_turn('follow_up', message_lower, topic=title)
+        return response
+    
+    def _describe_session(self, session_id):
+        session = Session.objects.select_related('speaker').filter(id=session_id).first()
+        if session is None:
+            return "That session doesn't seem to be available anymore. 🤔", ""
+        
+        response_parts = [f"📍 **{session.title}**"]
+        response_parts.append(f"⏰ {session.start_time.strftime('%H:%M')} - {session.end_time.strftime('%H:%M')}")
+        if session.speaker:
+            response_parts.append(f"👤 {session.speaker.name} ({session.speaker.company})")
+        response_parts.append("")
+        response_parts.append(session.description)
+        return "\n".join(response_parts), session.title
+    
+    def _describe_speaker(self, speaker_id):
+        speaker = Speaker.objects.filter(id=speaker_id).first()
+        if speaker is None:
+            return "I couldn't find that speaker anymore. 🤔", ""
+        
+        response_parts = [f"👤 **{speaker.name}**", f"🏢 {speaker.company}", "", speaker.bio]
+        sessions = list(Session.objects.filter(speaker=speaker).order_by('start_time')[:3])
+        if sessions:
+            response_parts.append("")
+            response_parts.append("Presenting:")
+            for session in sessions:
+                response_parts.append(f"📅 {session.title} - {session.start_time.strftime('%H:%M')}")
+        return "\n".join(response_parts), speaker.name
     
     def _handle_recommendation_request(self, message, profile):
         """Handle session recommendation requests"""
+        # Scoring also depends on the attendee's interactions
+        fingerprint = response_cache.profile_fingerprint(
+            profile.id, profile.interests, response_cache.profile_version(profile.id)
+        )
+        return response_cache.get_or_build(
+            'recommendations',
+            lambda: self._build_recommendation_response(profile),
+            fingerprint=fingerprint
+        )
+    
+    def _build_recommendation_response(self, profile):
         recommendations = self._get_personalized_recommendations(profile)
         
         if not recommendations:
-            return "I don't see any upcoming sessions right now, but let me know what topics interest you and I'll keep an eye out! 👀"
+            return "I don't see any upcoming sessions right now, but let me know what topics interest you and I'll keep an eye out! 👀", ()
         
         response_parts = ["Here are my top recommendations for you: ✨\n"]
         
@@ -157,17 +275,20 @@ class AuraConcierge:
         
         response_parts.append("Would you like more details about any of these sessions? 🤔")
         
-        return "\n".join(response_parts)
+        return "\n".join(response_parts), [('session', session.id) for session in recommendations]
     
     def _handle_schedule_request(self, message, profile):
         """Handle schedule and timing requests"""
+        return response_cache.get_or_build('schedule', self._build_schedule_response)
+    
+    def _build_schedule_response(self):
         now = timezone.now()
-        today_sessions = Session.objects.filter(
+        today_sessions = list(Session.objects.filter(
             start_time__date=now.date()
-        ).order_by('start_time')
+        ).order_by('start_time'))
         
-        if not today_sessions.exists():
-            return "No sessions scheduled for today. Check back tomorrow! 📅"
+        if not today_sessions:
+            return "No sessions scheduled for today. Check back tomorrow! 📅", ()
         
         response_parts = ["Here's today's schedule: 📋\n"]
         
@@ -180,14 +301,17 @@ class AuraConcierge:
         
         response_parts.append("\nWant me to add any of these to your personal schedule? 📌")
         
-        return "\n".join(response_parts)
+        return "\n".join(response_parts), [('session', session.id) for session in today_sessions]
     
     def _handle_speaker_request(self, message, profile):
         """Handle speaker information requests"""
-        speakers = Speaker.objects.all()[:5]  # Limit to prevent overwhelming
+        return response_cache.get_or_build('speakers', self._build_speaker_response, bucket_seconds=300)
+    
+    def _build_speaker_response(self):
+        speakers = list(Speaker.objects.all()[:5])  # Limit to prevent overwhelming
         
-        if not speakers.exists():
-            return "Speaker information will be available soon! 🎤"
+        if not speakers:
+            return "Speaker information will be available soon! 🎤", ()
         
         response_parts = ["Here are some featured speakers: 🌟\n"]
         
@@ -199,20 +323,12 @@ class AuraConcierge:
         
         response_parts.append("Want to know which sessions they're presenting? Just ask! 💬")
         
-        return "\n".join(response_parts)
+        return "\n".join(response_parts), [('speaker', speaker.id) for speaker in speakers]
     
     def _handle_location_request(self, message, profile):
         """Handle location and venue requests"""
         # This is a placeholder - you can integrate with actual venue data
-        return """🗺️ **Venue Information:**
-
-**Main Auditorium** - Keynotes and main sessions
-**Conference Room A** - Technical workshops  
-**Conference Room B** - Panel discussions
-**Networking Lounge** - Coffee breaks and networking
-**Exhibition Hall** - Sponsor booths and demos
-
-Need directions to a specific room? Just ask! 🧭"""
+        return LOCATION_RESPONSE
     
     def _handle_networking_request(self, message, profile):
         """Handle networking requests"""
@@ -231,23 +347,7 @@ Need directions to a specific room? Just ask! 🧭"""
     
     def _handle_help_request(self):
         """Handle help requests"""
-        help_text = """🆘 **I'm here to help!** Here's what I can do:
-
-✅ **Recommend sessions** based on your interests
-✅ **Show schedules** and timing information  
-✅ **Find speakers** and their sessions
-✅ **Provide venue** directions and maps
-✅ **Suggest networking** opportunities
-✅ **Send alerts** for sessions you're interested in
-
-Just ask me anything in natural language! For example:
-• "What sessions should I attend?"
-• "When is the next keynote?"
-• "Who's speaking about AI?"
-
-What would you like to know? 😊"""
-        
-        return help_text
+        return HELP_RESPONSE
     
     def _handle_appreciation(self):
         """Handle thank you messages"""
@@ -261,17 +361,16 @@ What would you like to know? 😊"""
     def _handle_general_query(self, message, profile):
         """Handle general queries"""
         # Try to extract key topics from the message
-        if any(topic in message.lower() for topic in ['ai', 'artificial intelligence', 'machine learning', 'ml']):
-            ai_sessions = Session.objects.filter(
-                Q(title__icontains='AI') | Q(title__icontains='artificial intelligence') | 
-                Q(description__icontains='AI') | Q(description__icontains='machine learning')
-            )[:3]
+        mentioned = topics.index.match_text(message)
+        session_ids = topics.index.members('sessions', mentioned)
+        if session_ids:
+            topic_sessions = list(Session.objects.filter(id__in=session_ids).order_by('start_time')[:3])
             
-            if ai_sessions.exists():
-                response_parts = ["I found some AI-related sessions for you: 🤖\n"]
-                for session in ai_sessions:
+            if topic_sessions:
+                response_parts = [f"I found some sessions on {', '.join(topics.index.names(mentioned))} for you: 🔎\n"]
+                for session in topic_sessions:
                     response_parts.append(f"• {session.title} - {session.start_time.strftime('%H:%M')}")
-                return "\n".join(response_parts)
+                return "\n".join(response_parts), [('session', session.id) for session in topic_sessions]
         
         # Default response with helpful suggestions
         return """I'm not sure I understand that exactly, but I'm here to help! 🤔
@@ -292,17 +391,20 @@ What would you like to know about the event? 💬"""
         base_recommendations = get_session_recommendations(profile.id)
         
         # Filter based on user interactions and interests
-        user_interests = profile.interests.lower().split(',') if profile.interests else []
+        user_topics = topics.index.topics_of('attendees', profile.id)
+        
+        # Sessions the user already interacted with, in one query
+        interacted_ids = set(EventInteraction.objects.filter(
+            attendee=profile,
+            event_id__in=[session.id for session in base_recommendations]
+        ).values_list('event_id', flat=True))
         
         scored_sessions = []
         for session in base_recommendations:
             score = 0
             
             # Score based on interests
-            for interest in user_interests:
-                interest = interest.strip()
-                if interest in session.title.lower() or interest in session.description.lower():
-                    score += 10
+            score += 10 * len(user_topics & topics.index.topics_of('sessions', session.id))
             
             # Boost upcoming sessions
             now = timezone.now()
@@ -310,12 +412,7 @@ What would you like to know about the event? 💬"""
                 score += 5
             
             # Check if user has already interacted
-            has_interaction = EventInteraction.objects.filter(
-                attendee=profile,
-                event_id=session.id
-            ).exists()
-            
-            if not has_interaction:
+            if session.id not in interacted_ids:
                 score += 3
             
             scored_sessions.append((session, score))
@@ -364,24 +461,16 @@ What would you like to know about the event? 💬"""
         feed_items = []
         now = timezone.now()
         
-        # Add real-world event examples
+        # Add published events shared by every attendee
         sample_events = self._get_sample_events()
         feed_items.extend(sample_events)
         
-        # Upcoming sessions (if any exist in database)
-        try:
-            upcoming = self._get_upcoming_sessions(profile)
-            for session in upcoming:
-                feed_items.append({
-                    'type': 'upcoming_session',
-                    'title': f"📅 Starting soon: {session.title}",
-                    'content': f"Starts at {session.start_time.strftime('%H:%M')}",
-                    'action': "View Details",
-                    'url': f"https://example.com/session/{session.id}",
-                    'priority': 'high' if session.start_time <= now + timedelta(minutes=30) else 'medium'
-                })
-        except:
-            pass
+        # Upcoming sessions, from the materialised feed snapshot
+        for starts_at, item in feed.registry.upcoming_sessions():
+            feed_items.append({
+                **item,
+                'priority': 'high' if starts_at <= now + timedelta(minutes=30) else 'medium'
+            })
         
         # Personalized recommendations
         try:
@@ -418,87 +507,8 @@ What would you like to know about the event? 💬"""
         return sorted(feed_items, key=lambda x: {'high': 3, 'medium': 2, 'low': 1}[x['priority']], reverse=True)
     
     def _get_sample_events(self):
-        """Get sample events with real-world information and external links"""
-        sample_events = [
-            {
-                'type': 'tech_conference',
-                'title': '🚀 AI & Machine Learning Summit 2025',
-                'content': 'Join industry leaders discussing the future of AI, ML applications, and emerging technologies. Keynote by leading tech innovators.',
-                'action': 'Register Now',
-                'url': 'https://www.ai-ml-summit.com',
-                'priority': 'high',
-                'time': '10:00 AM - 6:00 PM',
-                'date': 'October 15, 2025'
-            },
-            {
-                'type': 'startup_pitch',
-                'title': '💡 Startup Pitch Competition',
-                'content': 'Watch innovative startups present their groundbreaking ideas to top VCs and angel investors. Network with entrepreneurs.',
-                'action': 'View Startups',
-                'url': 'https://www.startuppitch2025.com',
-                'priority': 'high',
-                'time': '2:00 PM - 5:00 PM',
-                'date': 'Today'
-            },
-            {
-                'type': 'developer_workshop',
-                'title': '⚡ Full-Stack Development Workshop',
-                'content': 'Hands-on workshop covering React, Node.js, and modern development practices. Build a complete web application.',
-                'action': 'Join Workshop',
-                'url': 'https://www.devworkshop.io',
-                'priority': 'medium',
-                'time': '9:00 AM - 12:00 PM',
-                'date': 'Tomorrow'
-            },
-            {
-                'type': 'networking_event',
-                'title': '🤝 Tech Networking Mixer',
-                'content': 'Connect with fellow developers, designers, and tech enthusiasts. Casual networking over coffee and snacks.',
-                'action': 'RSVP Here',
-                'url': 'https://www.technetworking.events',
-                'priority': 'medium',
-                'time': '6:00 PM - 9:00 PM',
-                'date': 'October 20, 2025'
-            },
-            {
-                'type': 'innovation_showcase',
-                'title': '🌟 Innovation & Design Showcase',
-                'content': 'Discover cutting-edge design trends, UX innovations, and creative technology solutions from top design agencies.',
-                'action': 'Explore Showcase',
-                'url': 'https://www.innovationshowcase.design',
-                'priority': 'medium',
-                'time': '11:00 AM - 4:00 PM',
-                'date': 'October 25, 2025'
-            },
-            {
-                'type': 'career_fair',
-                'title': '💼 Tech Career Fair 2025',
-                'content': 'Meet recruiters from top tech companies including Google, Microsoft, Apple, and emerging startups. Bring your resume!',
-                'action': 'Find Jobs',
-                'url': 'https://www.techcareers2025.com',
-                'priority': 'high',
-                'time': '10:00 AM - 6:00 PM',
-                'date': 'November 1, 2025'
-            }
-        ]
-        
-        # Randomize and return 3-4 events
-        import random
-        selected_events = random.sample(sample_events, min(4, len(sample_events)))
-        
-        # Format for the frontend
-        formatted_events = []
-        for event in selected_events:
-            formatted_events.append({
-                'type': event['type'],
-                'title': event['title'],
-                'content': f"{event['content']}\n\n📅 {event['date']} | ⏰ {event['time']}",
-                'action': event['action'],
-                'url': event['url'],
-                'priority': event['priority']
-            })
-        
-        return formatted_events
+        """Get curated sample events with real-world information and external links"""
+        return feed.registry.sample()
 
 # Global instance
 concierge = AuraConcierge()
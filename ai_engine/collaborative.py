@@ -0,0 +1,263 @@
+"""
+Implicit-feedback collaborative filtering over EventInteraction.
+
+Every interaction adds a confidence weight to a sparse attendee x session
+matrix X, log-scaled per cell. A truncated SVD of X gives orthonormal
+session factors V; an attendee's factors are their row projected onto
+them, x_u V, so their scores for every session are V (x_u V). The
+train_recommender command fits both factor matrices and saves them as
+float32 in one .npz file, which every worker serves from memory.
+
+Workers only recommend sessions that still exist and haven't ended. They
+look up the end time of every modelled session when the factors load, and
+again whenever a session changes anywhere (SESSIONS_VERSION_KEY).
+
+numpy and scipy are optional. Without them, or before the first training
+run, ``model.recommend`` returns nothing and recommendations fall back to
+topic matching alone.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, FloatField, Value, When
+from pathlib import Path
+from types import SimpleNamespace
+from aura_project.caching import bump_version
+import logging
+import os
+import tempfile
+import threading
+import time
+
+try:
+    import numpy as np
+    from scipy import sparse
+    from scipy.sparse.linalg import svds
+except ImportError:
+    np = sparse = svds = None
+
+logger = logging.getLogger(__name__)
+
+# Where train_recommender writes the factors and workers read them
+MODEL_PATH = Path(settings.AURA_SETTINGS.get('RECOMMENDER_MODEL_PATH') or Path(settings.DATA_DIR) / 'recommender.npz')
+
+# Bumped whenever a session is saved or deleted
+SESSIONS_VERSION_KEY = 'aura:recommender:sessions'
+
+# How often (seconds) a worker checks whether the model file was replaced
+RELOAD_CHECK_INTERVAL = 30
+
+DEFAULT_FACTORS = 64
+
+# Confidence added by each kind of interaction
+INTERACTION_WEIGHTS = {
+    'viewed': 1.0,
+    'bookmarked': 2.0,
+    'registered': 3.0,
+    'attended': 4.0,
+}
+
+# Ratings also count against a session when they are poor
+RATING_WEIGHTS = {1: -2.0, 2: -1.0, 3: 1.0, 4: 2.0, 5: 3.0}
+
+
+def available():
+    return np is not None
+
+
+def load_interactions():
+    """(attendee ids, session ids, weights) arrays for every EventInteraction"""
+    from attendees.models import EventInteraction
+
+    weight = Case(
+        *[When(interaction_type=kind, then=Value(value)) for kind, value in INTERACTION_WEIGHTS.items()],
+        *[When(interaction_type='rated', rating=rating, then=Value(value)) for rating, value in RATING_WEIGHTS.items()],
+        default=Value(1.0),
+        output_field=FloatField(),
+    )
+    rows = EventInteraction.objects.annotate(weight=weight).values_list('attendee_id', 'event_id', 'weight')
+    data = np.array(list(rows.iterator(chunk_size=10000)), dtype=np.float64).reshape(-1, 3)
+    return data[:, 0].astype(np.int64), data[:, 1].astype(np.int64), data[:, 2]
+
+
+def fit(attendee_ids, session_ids, weights, factors=DEFAULT_FACTORS, seed=0):
+    """
+    Factorise interactions given as three parallel arrays. Returns the
+    arrays save() writes, with ids sorted so rows can be found by bisection.
+    """
+    attendees, rows = np.unique(attendee_ids, return_inverse=True)
+    sessions, columns = np.unique(session_ids, return_inverse=True)
+    # Duplicates are summed when the matrix is built
+    matrix = sparse.csr_matrix(
+        (np.asarray(weights, dtype=np.float32), (rows, columns)), shape=(len(attendees), len(sessions))
+    )
+    matrix.data = np.sign(matrix.data) * np.log1p(np.abs(matrix.data))
+
+    rank = min(factors, min(matrix.shape) - 1)
+    if rank < 1:
+        raise ValueError("Need interactions from at least two attendees with two sessions")
+    _, _, vt = svds(matrix, k=rank, v0=np.random.default_rng(seed).random(min(matrix.shape)))
+    item_factors = np.ascontiguousarray(vt.T, dtype=np.float32)
+    return {
+        'attendee_ids': attendees,
+        'session_ids': sessions,
+        'user_factors': np.asarray(matrix @ item_factors, dtype=np.float32),
+        'item_factors': item_factors,
+        # Sessions each attendee already interacted with, as CSR rows
+        'seen_indptr': matrix.indptr,
+        'seen_indices': matrix.indices,
+    }
+
+
+def save(arrays, path=None):
+    """Write the factors next to ``path`` and swap them in atomically"""
+    path = Path(path or model.path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.npz')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, trained_at=np.float64(time.time()), **arrays)
+        # mkstemp creates the file private to this user
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return path
+
+
+class CollaborativeModel:
+    """
+    Trained factors, loaded lazily and reloaded when the file is replaced.
+    Scoring an attendee is one (sessions x factors) matrix-vector product.
+    """
+
+    def __init__(self, path=MODEL_PATH):
+        self.path = Path(path)
+        self._state = None
+        self._mtime = None
+        self._sessions_version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _ensure_fresh(self):
+        now = time.monotonic()
+        if np is None or now - self._checked_at < RELOAD_CHECK_INTERVAL:
+            return
+        self._checked_at = now
+
+        try:
+            mtime = self.path.stat().st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime != self._mtime:
+            with self._lock:
+                if mtime != self._mtime:
+                    self._state = self._load() if mtime else None
+                    self._mtime = mtime
+                    self._sessions_version = None
+
+        sessions_version = cache.get(SESSIONS_VERSION_KEY, 0)
+        if self._state is not None and sessions_version != self._sessions_version:
+            with self._lock:
+                if self._state is not None and sessions_version != self._sessions_version:
+                    try:
+                        self._state.session_ends = self._session_ends(self._state.session_ids)
+                    except Exception as e:
+                        # Better to recommend an ended session than nothing
+                        logger.error(f"Could not look up the recommender's session end times: {e}")
+                        self._state.session_ends = np.full(len(self._state.session_ids), np.inf)
+                    self._sessions_version = sessions_version
+
+    def _session_ends(self, session_ids):
+        """End time (epoch seconds) of each modelled session; 0 for deleted ones"""
+        from events.models import Session
+
+        ends = np.zeros(len(session_ids))
+        rows = np.array(
+            [(session_id, end_time.timestamp())
+             for session_id, end_time in Session.objects.values_list('id', 'end_time').iterator(chunk_size=10000)],
+            dtype=np.float64,
+        ).reshape(-1, 2)
+        columns = np.searchsorted(session_ids, rows[:, 0]).clip(max=len(session_ids) - 1)
+        known = session_ids[columns] == rows[:, 0]
+        ends[columns[known]] = rows[known, 1]
+        return ends
+
+    def sessions_changed(self):
+        """Look the session end times up again, here and in every other worker"""
+        bump_version(SESSIONS_VERSION_KEY)
+        self._checked_at = 0.0
+
+    def _load(self):
+        try:
+            with np.load(self.path) as data:
+                state = SimpleNamespace(**{name: data[name] for name in data.files})
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"Could not load recommender factors from {self.path}: {e}")
+            return None
+        logger.info(
+            f"Loaded recommender factors for {len(state.attendee_ids)} attendees "
+            f"and {len(state.session_ids)} sessions"
+        )
+        return state
+
+    @property
+    def version(self):
+        """When the served factors were trained, in whole seconds; 0 without a model"""
+        self._ensure_fresh()
+        return int(self._state.trained_at) if self._state is not None else 0
+
+    def score_matrix(self, profile_ids, session_ids):
+        """
+        Scores of ``session_ids`` (columns) for ``profile_ids`` (rows), with
+        sessions already interacted with at -inf. Rows and columns the model
+        doesn't know are 0. None without a model.
+        """
+        self._ensure_fresh()
+        state = self._state
+        if state is None:
+            return None
+        profile_ids, session_ids = np.asarray(profile_ids), np.asarray(session_ids)
+        rows = np.searchsorted(state.attendee_ids, profile_ids).clip(max=len(state.attendee_ids) - 1)
+        known_rows = state.attendee_ids[rows] == profile_ids
+        columns = np.searchsorted(state.session_ids, session_ids).clip(max=len(state.session_ids) - 1)
+        known_columns = state.session_ids[columns] == session_ids
+
+        scores = np.zeros((len(profile_ids), len(session_ids)), dtype=np.float32)
+        block = state.user_factors[rows[known_rows]] @ state.item_factors[columns[known_columns]].T
+        scores[np.ix_(known_rows, known_columns)] = block
+
+        # Model column -> position in session_ids, for masking what each attendee has seen
+        position = np.full(len(state.session_ids), -1)
+        position[columns[known_columns]] = np.flatnonzero(known_columns)
+        for i in np.flatnonzero(known_rows):
+            seen = position[state.seen_indices[state.seen_indptr[rows[i]]:state.seen_indptr[rows[i] + 1]]]
+            scores[i, seen[seen >= 0]] = -np.inf
+        return scores
+
+    def recommend(self, profile_id, limit):
+        """
+        Up to ``limit`` (session id, score) pairs the attendee hasn't
+        interacted with, best first, among sessions that haven't ended
+        """
+        self._ensure_fresh()
+        state = self._state
+        if state is None or limit <= 0:
+            return []
+        row = np.searchsorted(state.attendee_ids, profile_id)
+        if row == len(state.attendee_ids) or state.attendee_ids[row] != profile_id:
+            return []
+
+        scores = state.item_factors @ state.user_factors[row]
+        seen = state.seen_indices[state.seen_indptr[row]:state.seen_indptr[row + 1]]
+        scores[seen] = -np.inf
+        scores[state.session_ends <= time.time()] = -np.inf
+        limit = min(limit, int(np.isfinite(scores).sum()))
+        if limit <= 0:
+            return []
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top])]
+        return [(int(state.session_ids[i]), float(scores[i])) for i in top]
+
+
+model = CollaborativeModel()
@@ -0,0 +1,122 @@
+from collections import deque
+from dataclasses import dataclass, field
+from django.conf import settings
+from django.core.cache import cache
+from typing import Deque, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Number of recent turns kept per conversation
+MAX_RECENT_TURNS = 6
+
+# Longest message excerpt stored per turn
+TURN_EXCERPT_LENGTH = 80
+
+
+@dataclass(slots=True)
+class ChatContext:
+    """Context for maintaining conversation state"""
+    user_intent: str = ""
+    last_topic: str = ""
+    conversation_depth: int = 0
+    session_history: Deque[Tuple[str, str]] = field(
+        default_factory=lambda: deque(maxlen=MAX_RECENT_TURNS)
+    )
+    # (kind, id) references for the items listed in the last answer, in order
+    last_items: Tuple[Tuple[str, int], ...] = ()
+
+    def record_turn(self, intent, message, items=None, topic=None):
+        """Remember a handled message and what the answer referred to"""
+        if intent == self.user_intent or intent == 'follow_up':
+            self.conversation_depth += 1
+        else:
+            self.conversation_depth = 1
+        if intent != 'follow_up':
+            self.user_intent = intent
+        self.last_topic = topic or intent
+        self.session_history.append((intent, message[:TURN_EXCERPT_LENGTH]))
+        if items:
+            self.last_items = tuple(items)
+
+    def get_item(self, position):
+        """Item reference at a 1-based position of the last answer (-1 for the last one)"""
+        if not self.last_items:
+            return None
+        index = position - 1 if position > 0 else position
+        try:
+            return self.last_items[index]
+        except IndexError:
+            return None
+
+    def to_state(self):
+        """Compact JSON-serialisable form used for caching and persistence"""
+        return [
+            self.user_intent,
+            self.last_topic,
+            self.conversation_depth,
+            [list(turn) for turn in self.session_history],
+            [list(item) for item in self.last_items],
+        ]
+
+    @classmethod
+    def from_state(cls, state):
+        intent, topic, depth, history, items = state
+        return cls(
+            user_intent=intent,
+            last_topic=topic,
+            conversation_depth=depth,
+            session_history=deque((tuple(turn) for turn in history), maxlen=MAX_RECENT_TURNS),
+            last_items=tuple((kind, item_id) for kind, item_id in items),
+        )
+
+
+def _cache_key(chat_session):
+    return f"aura:context:{chat_session.session_id}"
+
+
+def _context_ttl():
+    return settings.AURA_SETTINGS.get('SESSION_TIMEOUT', 3600)
+
+
+def load_context(chat_session) -> ChatContext:
+    """
+    Load the conversation context for a chat session.
+    Served from the cache; on a miss it is restored from the state persisted
+    with the most recent bot message rather than by replaying history.
+    """
+    state = cache.get(_cache_key(chat_session))
+    if state is None:
+        state = _load_persisted_state(chat_session)
+        if state is not None:
+            cache.set(_cache_key(chat_session), state, _context_ttl())
+
+    if state is not None:
+        try:
+            return ChatContext.from_state(state)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Discarding malformed chat context for {chat_session.session_id}: {e}")
+    return ChatContext()
+
+
+def save_context(chat_session, context: ChatContext, loaded_state=None) -> Optional[list]:
+    """
+    Store the context in the cache if it differs from ``loaded_state``.
+    Returns the new state, to be persisted with the next bot message, or
+    None when nothing changed.
+    """
+    state = context.to_state()
+    if state == loaded_state:
+        return None
+    cache.set(_cache_key(chat_session), state, _context_ttl())
+    return state
+
+
+def _load_persisted_state(chat_session) -> Optional[list]:
+    # Only bot messages written after a change carry the context
+    metadata = chat_session.messages.filter(
+        message_type='bot', metadata__has_key='context'
+    ).order_by('-id').values_list('metadata', flat=True).first()
+    if metadata:
+        return metadata.get('context')
+    return None
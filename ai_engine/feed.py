@@ -0,0 +1,272 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+from datetime import timedelta
+from pathlib import Path
+from admin_panel import settings_registry
+from aura_project.caching import bump_version
+import json
+import logging
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Curated feed items, used while no published events have been materialised
+SAMPLE_FEED_PATH = Path(__file__).resolve().parent / 'data' / 'sample_feed.json'
+
+# Bumped by reload() and by feed materialisation so every worker reloads
+VERSION_KEY = 'aura:feed:version'
+
+# How often (seconds) a worker checks whether the feed was reloaded elsewhere
+VERSION_CHECK_INTERVAL = 5
+
+# Number of shared items shown per feed
+SAMPLE_SIZE = 4
+
+# Sessions starting within this window are kept in the in-memory snapshot
+SESSION_WINDOW = timedelta(hours=3)
+
+# Upper bound on the number of rows loaded into a snapshot
+SNAPSHOT_LIMIT = 200
+
+
+class StaticFeedRegistry:
+    """
+    In-memory snapshot of the shared live feed.
+    Loaded with one indexed query over FeedItem, pre-rendered for the frontend
+    and refreshed every FEED_UPDATE_INTERVAL seconds or when another worker
+    reloads it. Items are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, path=SAMPLE_FEED_PATH):
+        self.path = path
+        self._events = ()
+        self._sessions = ()
+        self._version = None
+        self._loaded_at = 0.0
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _ensure_fresh(self):
+        now = time.monotonic()
+        if now - self._checked_at < VERSION_CHECK_INTERVAL:
+            return
+        self._checked_at = now
+
+        version = cache.get(VERSION_KEY, 0)
+        max_age = settings_registry.registry.get_int(
+            'feed_update_interval', settings.AURA_SETTINGS.get('FEED_UPDATE_INTERVAL', 30)
+        )
+        if version != self._version or now - self._loaded_at >= max_age:
+            with self._lock:
+                if version != self._version or now - self._loaded_at >= max_age:
+                    self._events, self._sessions = self._load()
+                    self._version = version
+                    self._loaded_at = now
+
+    def get_items(self):
+        """All shared (non-session) items, highest priority first"""
+        self._ensure_fresh()
+        return self._events
+
+    def sample(self, size=SAMPLE_SIZE):
+        """Random selection of shared items"""
+        items = self.get_items()
+        return random.sample(items, min(size, len(items)))
+
+    def upcoming_sessions(self, window=timedelta(hours=2), limit=3):
+        """Sessions starting within the window, soonest first"""
+        self._ensure_fresh()
+        now = timezone.now()
+        upcoming = [
+            (starts_at, item) for starts_at, item in self._sessions
+            if now < starts_at <= now + window
+        ]
+        return upcoming[:limit]
+
+    def reload(self):
+        """Reload the feed here and signal the other workers to do the same"""
+        version = bump_version(VERSION_KEY)
+        with self._lock:
+            self._events, self._sessions = self._load()
+            self._version = version
+            self._loaded_at = self._checked_at = time.monotonic()
+        return len(self._events)
+
+    def _load(self):
+        from ai_engine.models import FeedItem
+
+        now = timezone.now()
+        try:
+            rows = list(FeedItem.objects.filter(ends_at__gte=now).filter(
+                Q(source='event') | Q(starts_at__lte=now + SESSION_WINDOW)
+            ).order_by('-priority_rank', 'starts_at')[:SNAPSHOT_LIMIT])
+        except Exception as e:
+            logger.error(f"Could not load materialised feed items: {e}")
+            rows = []
+
+        events = tuple(row.to_feed_dict() for row in rows if row.source == 'event')
+        sessions = tuple(
+            sorted(((row.starts_at, row.to_feed_dict()) for row in rows if row.source == 'session'),
+                   key=lambda entry: entry[0])
+        )
+        return events or self._load_curated(), sessions
+
+    def _load_curated(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                raw_items = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not load feed items from {self.path}: {e}")
+            return ()
+
+        return tuple(self._render(item) for item in raw_items)
+
+    @staticmethod
+    def _render(item):
+        """Format a curated item for the frontend"""
+        return {
+            'type': item['type'],
+            'title': item['title'],
+            'content': f"{item['content']}\n\n📅 {item['date']} | ⏰ {item['time']}",
+            'action': item['action'],
+            'url': item['url'],
+            'priority': item['priority']
+        }
+
+
+registry = StaticFeedRegistry(settings.AURA_SETTINGS.get('SAMPLE_FEED_PATH', SAMPLE_FEED_PATH))
+
+
+# Columns rewritten when a materialised row already exists
+UPSERT_FIELDS = [
+    'item_type', 'title', 'content', 'action', 'url', 'priority',
+    'priority_rank', 'tags', 'starts_at', 'ends_at', 'updated_at',
+]
+
+# Rows written per INSERT ... ON CONFLICT statement by rebuild_feed_items
+REBUILD_BATCH_SIZE = 500
+
+
+def _event_item(event):
+    """Unsaved FeedItem for a published EventManagement row"""
+    from ai_engine.models import FeedItem
+
+    start = timezone.localtime(event.start_datetime)
+    end = timezone.localtime(event.end_datetime)
+    content = f"{event.description}\n\n📅 {start.strftime('%B %d, %Y')} | ⏰ {start.strftime('%I:%M %p')} - {end.strftime('%I:%M %p')}"
+    if event.location:
+        content += f" | 📍 {event.location}"
+
+    return FeedItem(
+        source='event',
+        source_id=event.id,
+        item_type='event',
+        title=f"🌟 {event.title}",
+        content=content,
+        action='Learn More',
+        url=event.external_url or event.virtual_link,
+        # The frontend only styles high/medium/low; critical still ranks first
+        priority='high' if event.priority == 'critical' else event.priority,
+        priority_rank=FeedItem.PRIORITY_RANKS.get(event.priority, 2),
+        tags=event.tags,
+        starts_at=event.start_datetime,
+        ends_at=event.end_datetime,
+    )
+
+
+def _session_item(session):
+    """Unsaved FeedItem for an upcoming Session row"""
+    from ai_engine.models import FeedItem
+
+    return FeedItem(
+        source='session',
+        source_id=session.id,
+        item_type='upcoming_session',
+        title=f"📅 Starting soon: {session.title}",
+        content=f"Starts at {timezone.localtime(session.start_time).strftime('%H:%M')}",
+        action='View Details',
+        url=f"https://example.com/session/{session.id}",
+        priority='medium',
+        priority_rank=FeedItem.PRIORITY_RANKS['medium'],
+        starts_at=session.start_time,
+        ends_at=session.end_time,
+    )
+
+
+def _upsert(items):
+    """Insert or overwrite FeedItems by (source, source_id) in one statement"""
+    from ai_engine.models import FeedItem
+
+    return FeedItem.objects.bulk_create(
+        items,
+        update_conflicts=True,
+        unique_fields=['source', 'source_id'],
+        update_fields=UPSERT_FIELDS,
+    )
+
+
+def materialise_event(event):
+    """Create, update or remove the feed item for an EventManagement row"""
+    if event.status != 'published' or event.end_datetime < timezone.now():
+        remove_feed_item('event', event.id)
+        return None
+    return _upsert([_event_item(event)])[0]
+
+
+def materialise_session(session):
+    """Create, update or remove the feed item for a Session row"""
+    if session.end_time < timezone.now():
+        remove_feed_item('session', session.id)
+        return None
+    return _upsert([_session_item(session)])[0]
+
+
+def remove_feed_item(source, source_id):
+    from ai_engine.models import FeedItem
+
+    FeedItem.objects.filter(source=source, source_id=source_id).delete()
+
+
+def _upsert_all(rows, build):
+    """Upsert one FeedItem per row in batches of REBUILD_BATCH_SIZE"""
+    count = 0
+    batch = []
+    for row in rows.iterator(chunk_size=REBUILD_BATCH_SIZE):
+        batch.append(build(row))
+        if len(batch) == REBUILD_BATCH_SIZE:
+            _upsert(batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        _upsert(batch)
+        count += len(batch)
+    return count
+
+
+def rebuild_feed_items():
+    """Recompute the whole FeedItem table from published events and upcoming sessions"""
+    from admin_panel.models import EventManagement
+    from ai_engine.models import FeedItem
+    from events.models import Session
+
+    started = now = timezone.now()
+
+    event_count = _upsert_all(
+        EventManagement.objects.filter(status='published', end_datetime__gte=now), _event_item
+    )
+    session_count = _upsert_all(Session.objects.filter(end_time__gte=now), _session_item)
+
+    # Every surviving row was touched above; anything older is stale
+    FeedItem.objects.filter(updated_at__lt=started).delete()
+
+    notify_feed_changed()
+    return event_count, session_count
+
+
+def notify_feed_changed():
+    """Tell every worker to reload its feed snapshot"""
+    bump_version(VERSION_KEY)
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+from ai_engine import collaborative, snapshots
+import time
+
+class Command(BaseCommand):
+    help = 'Precompute and store session recommendations for every attendee'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--missing', action='store_true',
+            help='Only attendees whose snapshot is missing, stale or from another recommender model; '
+                 'run it every few minutes to keep snapshots current'
+        )
+        parser.add_argument(
+            '--size', type=int, default=snapshots.SNAPSHOT_SIZE,
+            help=f'Sessions stored per attendee (default: {snapshots.SNAPSHOT_SIZE})'
+        )
+
+    def handle(self, *args, **options):
+        if not collaborative.available():
+            raise CommandError('Batch recommendations need numpy and scipy; pip install numpy scipy')
+
+        self.stdout.write('🔄 Precomputing recommendations...')
+
+        started = time.monotonic()
+        count = snapshots.precompute(only_missing=options['missing'], size=options['size'])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'✅ Stored recommendations for {count} attendees in {time.monotonic() - started:.1f}s '
+                f'(model version {collaborative.model.version})'
+            )
+        )
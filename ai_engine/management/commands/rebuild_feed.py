@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from ai_engine.feed import rebuild_feed_items
+
+class Command(BaseCommand):
+    help = 'Recompute the materialised live feed from published events and upcoming sessions'
+
+    def handle(self, *args, **options):
+        self.stdout.write('🔄 Rebuilding live feed items...')
+        
+        event_count, session_count = rebuild_feed_items()
+        
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'✅ Materialised {event_count} published events and {session_count} upcoming sessions'
+            )
+        )
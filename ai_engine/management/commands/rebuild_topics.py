@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from ai_engine.topics import index, rebuild_topic_links
+
+class Command(BaseCommand):
+    help = 'Re-derive the topic links from interests, tags and preferred topics, and reload the topic index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk insert (default: 5000)')
+
+    def handle(self, *args, **options):
+        self.stdout.write('🔄 Rebuilding topic links...')
+
+        counts = rebuild_topic_links(batch_size=options['batch_size'])
+        topic_count = index.reload()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ {topic_count} topics linked to {counts['sessions']} session, {counts['attendees']} attendee, "
+                f"{counts['events']} event and {counts['preferences']} preference entries"
+            )
+        )
@@ -0,0 +1,46 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from ai_engine import collaborative
+import time
+
+class Command(BaseCommand):
+    help = 'Train the collaborative-filtering recommender from event interactions'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--factors', type=int, default=collaborative.DEFAULT_FACTORS,
+            help=f'Latent factors per attendee and session (default: {collaborative.DEFAULT_FACTORS})'
+        )
+        parser.add_argument('--output', help='Where to write the factors (default: the served model file)')
+        parser.add_argument(
+            '--skip-precompute', action='store_true',
+            help="Don't refresh the stored recommendations from the new model"
+        )
+
+    def handle(self, *args, **options):
+        if not collaborative.available():
+            raise CommandError('The recommender needs numpy and scipy; pip install numpy scipy')
+
+        self.stdout.write('🔄 Training recommender from event interactions...')
+
+        started = time.monotonic()
+        attendee_ids, session_ids, weights = collaborative.load_interactions()
+        loaded = time.monotonic()
+        try:
+            arrays = collaborative.fit(attendee_ids, session_ids, weights, factors=options['factors'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        trained = time.monotonic()
+        path = collaborative.save(arrays, options['output'])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ {len(weights)} interactions, {len(arrays['attendee_ids'])} attendees x "
+                f"{len(arrays['session_ids'])} sessions, {arrays['item_factors'].shape[1]} factors "
+                f"(loaded in {loaded - started:.1f}s, trained in {trained - loaded:.1f}s) -> {path}"
+            )
+        )
+
+        # Snapshots from the previous model are no longer served
+        if not options['output'] and not options['skip_precompute']:
+            call_command('precompute_recommendations', missing=True, stdout=self.stdout)
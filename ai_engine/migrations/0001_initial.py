@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('event', 'Published Event'), ('session', 'Session')], max_length=20)),
+                ('source_id', models.PositiveBigIntegerField()),
+                ('item_type', models.CharField(max_length=50)),
+                ('title', models.CharField(max_length=300)),
+                ('content', models.TextField()),
+                ('action', models.CharField(max_length=100)),
+                ('url', models.URLField(blank=True)),
+                ('priority', models.CharField(default='medium', max_length=20)),
+                ('priority_rank', models.PositiveSmallIntegerField(default=2)),
+                ('tags', models.TextField(blank=True)),
+                ('starts_at', models.DateTimeField()),
+                ('ends_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-priority_rank', 'starts_at'],
+                'indexes': [models.Index(fields=['-priority_rank', 'starts_at'], name='feeditem_priority_time_idx'), models.Index(fields=['ends_at'], name='feeditem_ends_at_idx')],
+                'unique_together': {('source', 'source_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_engine', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Topic',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(help_text='Case-folded lookup key, see ai_engine.topics', max_length=100, unique=True)),
+                ('name', models.CharField(max_length=100)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+    ]
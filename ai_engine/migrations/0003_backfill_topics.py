@@ -0,0 +1,115 @@
+import re
+
+from django.db import migrations
+
+# The topic normalisation of ai_engine.topics when topics were introduced,
+# frozen here so later changes to the app don't change this migration
+
+ALIASES = {
+    'artificial intelligence': 'ai',
+    'ml': 'machine learning',
+    'user experience': 'ux',
+    'js': 'javascript',
+}
+
+SEPARATORS = re.compile(r'[,;|\n]+')
+
+KEY_MAX_LENGTH = 100
+
+# Model with a topics field -> free-text field its topics come from
+TEXT_FIELDS = {
+    ('attendees', 'AttendeeProfile'): 'interests',
+    ('admin_panel', 'EventManagement'): 'tags',
+    ('chat', 'UserPreferences'): 'preferred_topics',
+}
+
+BATCH_SIZE = 5000
+
+
+def _clean(label):
+    return ' '.join(label.split()).strip(' .:/-\'"').lstrip('+#').strip()
+
+
+def _normalise(label):
+    key = _clean(label).casefold()
+    return ALIASES.get(key, key)
+
+
+def _split_topics(text):
+    topics = {}
+    for label in SEPARATORS.split(text or ''):
+        name = _clean(label)
+        key = _normalise(name)
+        if key and len(key) <= KEY_MAX_LENGTH:
+            topics.setdefault(key, name)
+    return topics
+
+
+def _vocabulary_pattern(keys):
+    phrases = set(keys) | {alias for alias, key in ALIASES.items() if key in keys}
+    if not phrases:
+        return None
+    alternatives = '|'.join(re.escape(phrase) for phrase in sorted(phrases, key=len, reverse=True))
+    return re.compile(rf'(?<!\w)(?:{alternatives})(?!\w)', re.IGNORECASE)
+
+
+def _find_topics(pattern, text):
+    if pattern is None or not text:
+        return set()
+    return {_normalise(match.group(0)) for match in pattern.finditer(text)}
+
+
+def _link_table(model):
+    field = model._meta.get_field('topics')
+    return (field.remote_field.through,
+            f'{field.m2m_field_name()}_id', f'{field.m2m_reverse_field_name()}_id')
+
+
+def backfill_topics(apps, schema_editor):
+    """Split the existing free-text fields into topics and link sessions that mention them"""
+    Topic = apps.get_model('ai_engine', 'Topic')
+
+    links, names = {}, {}
+    for (app_label, model_name), field in TEXT_FIELDS.items():
+        model = apps.get_model(app_label, model_name)
+        rows = model.objects.values_list('id', field).iterator(chunk_size=BATCH_SIZE)
+        links[model] = {object_id: _split_topics(text) for object_id, text in rows}
+        for topics in links[model].values():
+            for key, name in topics.items():
+                names.setdefault(key, name)
+
+    Topic.objects.bulk_create(
+        [Topic(key=key, name=name) for key, name in names.items()],
+        batch_size=BATCH_SIZE, ignore_conflicts=True,
+    )
+    ids = dict(Topic.objects.values_list('key', 'id'))
+
+    Session = apps.get_model('events', 'Session')
+    pattern = _vocabulary_pattern(ids)
+    rows = Session.objects.values_list('id', 'title', 'description').iterator(chunk_size=BATCH_SIZE)
+    links[Session] = {
+        session_id: _find_topics(pattern, f'{title}\n{description}') for session_id, title, description in rows
+    }
+
+    for model, topics_by_object in links.items():
+        through, source, target = _link_table(model)
+        through.objects.bulk_create(
+            (through(**{source: object_id, target: ids[key]})
+             for object_id, keys in topics_by_object.items() for key in keys),
+            batch_size=BATCH_SIZE, ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_engine', '0002_topic'),
+        ('admin_panel', '0005_eventmanagement_topics'),
+        ('attendees', '0003_attendeeprofile_topics'),
+        ('chat', '0003_userpreferences_topics'),
+        ('events', '0002_session_topics'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_topics, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_engine', '0003_backfill_topics'),
+        ('attendees', '0003_attendeeprofile_topics'),
+        ('events', '0002_session_topics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecommendationSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('score', models.FloatField()),
+                ('version', models.PositiveBigIntegerField(help_text='Training time of the recommender model used, 0 for none')),
+                ('computed_at', models.DateTimeField(auto_now_add=True)),
+                ('attendee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommendation_snapshots', to='attendees.attendeeprofile')),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommendation_snapshots', to='events.session')),
+            ],
+            options={
+                'ordering': ['attendee', 'rank'],
+                'unique_together': {('attendee', 'rank')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_engine', '0004_recommendationsnapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recommendationsnapshot',
+            name='stale',
+            field=models.BooleanField(default=False, help_text='Still served, recomputed by precompute_recommendations --missing'),
+        ),
+    ]
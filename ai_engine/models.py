@@ -1,3 +1,78 @@
 from django.db import models
 
-# Create your models here.
+class FeedItem(models.Model):
+    """Pre-rendered live feed entry, materialised from published events and sessions"""
+    SOURCE_CHOICES = [
+        ('event', 'Published Event'),
+        ('session', 'Session'),
+    ]
+
+    PRIORITY_RANKS = {'low': 1, 'medium': 2, 'high': 3, 'critical': 4}
+
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    source_id = models.PositiveBigIntegerField()
+    item_type = models.CharField(max_length=50)
+    title = models.CharField(max_length=300)
+    content = models.TextField()
+    action = models.CharField(max_length=100)
+    url = models.URLField(blank=True)
+    priority = models.CharField(max_length=20, default='medium')
+    priority_rank = models.PositiveSmallIntegerField(default=2)
+    tags = models.TextField(blank=True)
+    starts_at = models.DateTimeField()
+    ends_at = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-priority_rank', 'starts_at']
+        unique_together = ['source', 'source_id']
+        indexes = [
+            models.Index(fields=['-priority_rank', 'starts_at'], name='feeditem_priority_time_idx'),
+            models.Index(fields=['ends_at'], name='feeditem_ends_at_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.source} {self.source_id}: {self.title}"
+
+    def to_feed_dict(self):
+        """Format for the frontend"""
+        return {
+            'type': self.item_type,
+            'title': self.title,
+            'content': self.content,
+            'action': self.action,
+            'url': self.url,
+            'priority': self.priority
+        }
+
+
+class Topic(models.Model):
+    """Normalised interest or tag shared by sessions, attendees, events and preferences"""
+    key = models.CharField(max_length=100, unique=True, help_text="Case-folded lookup key, see ai_engine.topics")
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
+class RecommendationSnapshot(models.Model):
+    """One precomputed session recommendation; an attendee's rows are replaced together"""
+    attendee = models.ForeignKey(
+        'attendees.AttendeeProfile', on_delete=models.CASCADE, related_name='recommendation_snapshots'
+    )
+    session = models.ForeignKey('events.Session', on_delete=models.CASCADE, related_name='recommendation_snapshots')
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+    version = models.PositiveBigIntegerField(help_text="Training time of the recommender model used, 0 for none")
+    computed_at = models.DateTimeField(auto_now_add=True)
+    stale = models.BooleanField(default=False, help_text="Still served, recomputed by precompute_recommendations --missing")
+
+    class Meta:
+        ordering = ['attendee', 'rank']
+        unique_together = ['attendee', 'rank']
+
+    def __str__(self):
+        return f"{self.attendee_id} #{self.rank}: session {self.session_id}"
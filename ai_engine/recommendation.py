@@ -1,9 +1,50 @@
+from django.conf import settings
+from django.utils import timezone
 from events.models import Session
+from ai_engine import collaborative, snapshots, topics
 
-def get_session_recommendations(profile_id: int):
+# Candidates taken from each scorer per recommendation slot
+CANDIDATES_PER_SLOT = 10
+
+def blended_scores(profile_id: int, candidates: int):
+    """
+    {session id: score} blending topic overlap with the collaborative model,
+    each scaled to 0..1. Attendees the model doesn't know get topic scores only.
+    """
+    cf_weight = settings.AURA_SETTINGS.get('RECOMMENDER_CF_WEIGHT', 0.5)
+
+    profile_topics = topics.index.topics_of('attendees', profile_id)
+    shared = topics.index.shared('sessions', profile_topics)
+    content = {session_id: count / len(profile_topics) for session_id, count in shared.most_common(candidates)}
+
+    learned = dict(collaborative.model.recommend(profile_id, candidates))
+    top = max(learned.values(), default=0)
+    if top <= 0:
+        return content
+    return {
+        session_id: (1 - cf_weight) * content.get(session_id, 0) + cf_weight * max(learned.get(session_id, 0) / top, 0)
+        for session_id in content.keys() | learned.keys()
+    }
+
+def get_session_recommendations(profile_id: int, limit: int = 3):
     """
-    Dummy function to return the first 3 sessions as recommendations.
-    Replace this with your actual AI/ML model logic later.
+    The attendee's precomputed recommendations from ai_engine.snapshots.
+    Without a usable snapshot, the best blended matches among sessions that
+    haven't ended are computed here, with random upcoming sessions filling
+    the list when fewer match. Nothing is stored; precompute_recommendations
+    fills the snapshot in.
     """
-    # This is a placeholder: it just returns up to 3 random sessions.
-    return Session.objects.all().order_by('?')[:3]
\ No newline at end of file
+    if limit <= snapshots.SNAPSHOT_SIZE:
+        sessions = list(snapshots.read(profile_id)[:limit])
+        if len(sessions) == limit:
+            return sessions
+
+    scores = blended_scores(profile_id, limit * CANDIDATES_PER_SLOT)
+    upcoming = Session.objects.select_related('speaker').filter(end_time__gt=timezone.now())
+
+    # Ended and deleted sessions drop out here, before ranking
+    candidates = upcoming.filter(id__in=list(scores)) if scores else []
+    ranked = sorted(candidates, key=lambda session: (-scores[session.id], session.id))[:limit]
+    if len(ranked) < limit:
+        ranked += upcoming.exclude(id__in=[session.id for session in ranked]).order_by('?')[:limit - len(ranked)]
+    return ranked
@@ -0,0 +1,64 @@
+from django.core.cache import cache
+from django.utils import timezone
+from aura_project.caching import bump_version
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever Session or Speaker rows change, orphaning every cached response
+VERSION_KEY = 'aura:responses:version'
+
+# Bumped when one attendee's interactions change, orphaning their personal responses
+PROFILE_VERSION_KEY = 'aura:responses:profile:{}'
+
+# Default width of the time bucket a cached response stays valid for
+DEFAULT_BUCKET_SECONDS = 60
+
+
+def get_version():
+    """Current response cache generation"""
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, 1, timeout=None)
+        version = cache.get(VERSION_KEY, 1)
+    return version
+
+
+def invalidate():
+    """Invalidate all cached concierge responses"""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 2, timeout=None)
+
+
+def profile_version(profile_id):
+    """Generation of one attendee's personal responses"""
+    return cache.get(PROFILE_VERSION_KEY.format(profile_id), 0)
+
+
+def invalidate_profile(profile_id):
+    """Invalidate the cached responses personalised for one attendee"""
+    bump_version(PROFILE_VERSION_KEY.format(profile_id))
+
+
+def profile_fingerprint(*parts):
+    """Short stable fingerprint for the profile fields a response depends on"""
+    raw = '|'.join(str(part) for part in parts)
+    return hashlib.md5(raw.encode('utf-8')).hexdigest()[:12]
+
+
+def get_or_build(intent, builder, fingerprint=None, bucket_seconds=DEFAULT_BUCKET_SECONDS):
+    """
+    Return the cached response for an intent, building it on a miss.
+    Responses are keyed by intent, time bucket and an optional profile fingerprint.
+    """
+    bucket = int(timezone.now().timestamp()) // bucket_seconds
+    key = f"aura:responses:{get_version()}:{intent}:{bucket}:{fingerprint or '-'}"
+
+    response = cache.get(key)
+    if response is None:
+        response = builder()
+        cache.set(key, response, bucket_seconds)
+    return response
@@ -0,0 +1,132 @@
+from django.db.models.signals import m2m_changed, post_save, post_delete
+from django.dispatch import receiver
+from admin_panel.models import EventManagement
+from attendees.models import AttendeeProfile, EventInteraction
+from chat.models import UserPreferences
+from events.models import Session, Speaker
+from ai_engine import collaborative, feed, response_cache, snapshots, topics
+from ai_engine.models import Topic
+
+
+@receiver([post_save, post_delete], sender=Session)
+@receiver([post_save, post_delete], sender=Speaker)
+def invalidate_cached_responses(sender, **kwargs):
+    """Schedule and speaker answers are stale once sessions or speakers change"""
+    response_cache.invalidate()
+
+
+@receiver([post_save, post_delete], sender=Session)
+def refresh_recommender_sessions(sender, raw=False, **kwargs):
+    """Collaborative recommendations skip sessions that ended or were deleted"""
+    if not raw:
+        collaborative.model.sessions_changed()
+
+
+@receiver(post_save, sender=EventManagement)
+def materialise_event_feed_item(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    feed.materialise_event(instance)
+    feed.notify_feed_changed()
+
+
+@receiver(post_save, sender=Session)
+def materialise_session_feed_item(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    feed.materialise_session(instance)
+    feed.notify_feed_changed()
+
+
+@receiver(post_delete, sender=EventManagement)
+def remove_event_feed_item(sender, instance, **kwargs):
+    feed.remove_feed_item('event', instance.id)
+    feed.notify_feed_changed()
+
+
+@receiver(post_delete, sender=Session)
+def remove_session_feed_item(sender, instance, **kwargs):
+    feed.remove_feed_item('session', instance.id)
+    feed.notify_feed_changed()
+
+
+@receiver(post_save, sender=AttendeeProfile)
+@receiver(post_save, sender=EventManagement)
+@receiver(post_save, sender=UserPreferences)
+def link_listed_topics(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Re-derive the topic links when the free-text field they come from is saved"""
+    _, field = topics.KINDS[topics.kind_of(sender)]
+    if raw or (update_fields is not None and field not in update_fields):
+        return
+    topics.link_text(instance, getattr(instance, field))
+
+
+@receiver(post_save, sender=Session)
+def link_session_topics(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and not {'title', 'description'} & set(update_fields)):
+        return
+    topics.link_session(instance)
+
+
+@receiver(m2m_changed, sender=AttendeeProfile.topics.through)
+@receiver(m2m_changed, sender=EventManagement.topics.through)
+@receiver(m2m_changed, sender=Session.topics.through)
+@receiver(m2m_changed, sender=UserPreferences.topics.through)
+def index_topic_links(sender, instance, action, reverse, model, pk_set, **kwargs):
+    """Keep the topic index in step with the link tables"""
+    if action in ('post_add', 'post_remove'):
+        if reverse:
+            topics.index.link(topics.kind_of(model), pk_set, {instance.pk}, linked=action == 'post_add')
+        else:
+            topics.index.link(topics.kind_of(type(instance)), {instance.pk}, pk_set, linked=action == 'post_add')
+    elif action == 'post_clear':
+        if reverse:
+            topics.index.invalidate()
+        else:
+            topics.index.forget(topics.kind_of(type(instance)), instance.pk)
+
+
+@receiver(post_delete, sender=AttendeeProfile)
+@receiver(post_delete, sender=EventManagement)
+@receiver(post_delete, sender=Session)
+@receiver(post_delete, sender=UserPreferences)
+def unindex_deleted(sender, instance, **kwargs):
+    topics.index.forget(topics.kind_of(sender), instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Topic)
+def reload_topic_index(sender, instance, raw=False, created=False, **kwargs):
+    """New, renamed or deleted topics change the vocabulary itself"""
+    if raw:
+        return
+    if created:
+        topics.link_new_topics({instance.key: instance.pk})
+    topics.index.invalidate()
+
+
+@receiver([post_save, post_delete], sender=EventInteraction)
+def refresh_interaction_recommendations(sender, instance, raw=False, **kwargs):
+    """Precomputed recommendations and cached answers are stale once the attendee's interactions change"""
+    if not raw:
+        snapshots.mark_stale([instance.attendee_id])
+        response_cache.invalidate_profile(instance.attendee_id)
+
+
+@receiver(m2m_changed, sender=AttendeeProfile.topics.through)
+def refresh_interest_recommendations(sender, instance, action, reverse, pk_set, **kwargs):
+    """... or their interests"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    # Clearing a topic's attendees gives no ids; precompute_recommendations catches up
+    profile_ids = pk_set if reverse else [instance.pk]
+    if profile_ids:
+        snapshots.mark_stale(profile_ids)
+
+
+@receiver(post_save, sender=Session)
+def refresh_catalogue_recommendations(sender, instance, created, raw=False, **kwargs):
+    """... and those of attendees interested in a new session, linked to its topics just before"""
+    if created and not raw:
+        session_topics = topics.index.topics_of('sessions', instance.pk)
+        if session_topics:
+            snapshots.mark_stale(topic_ids=session_topics)
@@ -0,0 +1,178 @@
+"""
+Precomputed session recommendations.
+
+precompute() scores every attendee in vectorised chunks, with the blend
+ai_engine.recommendation uses online: topic overlap plus the collaborative
+model. It stores each attendee's top SNAPSHOT_SIZE sessions as
+RecommendationSnapshot rows stamped with the model version, which the
+online paths read with one query.
+
+Reads skip rows from another model version and sessions that have ended.
+A change to an attendee's interests or interactions marks their rows stale,
+and so does a new session for the attendees sharing one of its topics.
+Stale rows are still served until ``precompute(only_missing=True)``
+replaces them; run ``precompute_recommendations --missing`` every few
+minutes (from cron, say), and train_recommender runs it after every
+training. Attendees without a usable snapshot get recommendations computed
+online until then.
+"""
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import router, transaction
+from django.utils import timezone
+from ai_engine import collaborative, topics
+from aura_project.db.bulk import insert_rows
+import logging
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:
+    np = sparse = None
+
+logger = logging.getLogger(__name__)
+
+# Sessions stored per attendee
+SNAPSHOT_SIZE = 10
+
+# Attendee x session cells scored at once, and attendees written per transaction
+CHUNK_CELLS = 4_000_000
+CHUNK_ATTENDEES = 1000
+
+
+def read(profile_id):
+    """The attendee's precomputed sessions that haven't ended, best first; empty when they have none"""
+    from events.models import Session
+
+    return Session.objects.select_related('speaker').filter(
+        recommendation_snapshots__attendee_id=profile_id,
+        recommendation_snapshots__version=collaborative.model.version,
+        end_time__gt=timezone.now(),
+    ).order_by('recommendation_snapshots__rank')
+
+
+def mark_stale(profile_ids=None, topic_ids=None):
+    """
+    Flag the snapshots of ``profile_ids``, or of the attendees linked to
+    any of ``topic_ids``, for the next precompute_recommendations --missing.
+    One UPDATE; nothing is recomputed here.
+    """
+    from ai_engine.models import RecommendationSnapshot
+
+    snapshots = RecommendationSnapshot.objects.filter(stale=False)
+    if profile_ids is not None:
+        snapshots = snapshots.filter(attendee_id__in=profile_ids)
+    if topic_ids is not None:
+        snapshots = snapshots.filter(attendee__topics__in=topic_ids)
+    return snapshots.update(stale=True)
+
+
+def precompute(only_missing=False, size=SNAPSHOT_SIZE, seed=0):
+    """
+    Recompute the snapshot of every attendee, or with ``only_missing`` of
+    those without a current one: missing, stale or from another model.
+    Only sessions that haven't ended are ranked. Returns the number refreshed.
+    """
+    from ai_engine.models import RecommendationSnapshot
+    from attendees.models import AttendeeProfile
+    from events.models import Session
+
+    if np is None:
+        raise ImproperlyConfigured('Batch recommendations need numpy and scipy; pip install numpy scipy')
+
+    version = collaborative.model.version
+    profiles = AttendeeProfile.objects.order_by('id')
+    if only_missing:
+        current = RecommendationSnapshot.objects.filter(version=version, stale=False)
+        profiles = profiles.exclude(id__in=current.values('attendee_id'))
+    profile_ids = np.fromiter(profiles.values_list('id', flat=True), dtype=np.int64)
+    upcoming = Session.objects.filter(end_time__gt=timezone.now()).order_by('id')
+    session_ids = np.fromiter(upcoming.values_list('id', flat=True), dtype=np.int64)
+    if not len(profile_ids) or not len(session_ids):
+        return 0
+
+    scorer = _ChunkScorer(session_ids)
+    rng = np.random.default_rng(seed)
+    chunk = max(1, min(CHUNK_ATTENDEES, CHUNK_CELLS // len(session_ids)))
+    for start in range(0, len(profile_ids), chunk):
+        ids = profile_ids[start:start + chunk]
+        scores = scorer.scores(ids)
+        _write(ids, session_ids, scores, _top(scores, min(size, len(session_ids)), rng), version)
+    return len(profile_ids)
+
+
+class _ChunkScorer:
+    """Blended scores of every session for a chunk of attendees, as one dense array"""
+
+    def __init__(self, session_ids):
+        self.session_ids = session_ids
+        self.cf_weight = settings.AURA_SETTINGS.get('RECOMMENDER_CF_WEIGHT', 0.5)
+        self.attendee_topics = topics.index.links('attendees')
+
+        # Topic x session incidence matrix, over the topics sessions carry
+        session_topics = topics.index.links('sessions')
+        self.topic_columns = {}
+        rows, columns = [], []
+        for column, session_id in enumerate(session_ids.tolist()):
+            for topic_id in session_topics.get(session_id, ()):
+                rows.append(self.topic_columns.setdefault(topic_id, len(self.topic_columns)))
+                columns.append(column)
+        self.by_topic = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, columns)),
+            shape=(len(self.topic_columns), len(session_ids)),
+        )
+
+    def scores(self, profile_ids):
+        # Share of each attendee's topics a session carries
+        rows, columns = [], []
+        topic_counts = np.ones(len(profile_ids), dtype=np.float32)
+        for row, profile_id in enumerate(profile_ids.tolist()):
+            linked = self.attendee_topics.get(profile_id, ())
+            topic_counts[row] = max(len(linked), 1)
+            for topic_id in linked:
+                if topic_id in self.topic_columns:
+                    rows.append(row)
+                    columns.append(self.topic_columns[topic_id])
+        interests = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, columns)),
+            shape=(len(profile_ids), len(self.topic_columns)),
+        )
+        content = (interests @ self.by_topic).toarray() / topic_counts[:, None]
+
+        learned = collaborative.model.score_matrix(profile_ids, self.session_ids)
+        if learned is None:
+            return content
+        # Scaled by each attendee's best unseen session, like blended_scores()
+        seen = np.isinf(learned)
+        learned[seen] = 0
+        best = np.where(seen, -np.inf, learned).max(axis=1)
+        known = best > 0
+        learned = np.clip(learned / np.where(known, best, 1)[:, None], 0, None)
+        return np.where(known[:, None], (1 - self.cf_weight) * content + self.cf_weight * learned, content)
+
+
+def _top(scores, size, rng):
+    """Column indices of each row's ``size`` best scores, best first; ties are broken at random"""
+    noisy = scores + rng.random(scores.shape, dtype=np.float32) * 1e-6
+    top = np.argpartition(-noisy, size - 1, axis=1)[:, :size]
+    order = np.argsort(-np.take_along_axis(noisy, top, axis=1), axis=1)
+    return np.take_along_axis(top, order, axis=1)
+
+
+def _write(profile_ids, session_ids, scores, top, version):
+    """Replace the chunk's snapshots; rows another run wrote meanwhile are overwritten"""
+    from ai_engine.models import RecommendationSnapshot
+
+    alias = router.db_for_write(RecommendationSnapshot)
+    computed_at = timezone.now()
+    rows = (
+        (profile_id, int(session_ids[column]), rank, float(scores[row, column]), version, computed_at, False)
+        for row, profile_id in enumerate(profile_ids.tolist())
+        for rank, column in enumerate(top[row].tolist())
+    )
+    with transaction.atomic(using=alias):
+        RecommendationSnapshot.objects.using(alias).filter(attendee_id__in=profile_ids.tolist()).delete()
+        insert_rows(
+            RecommendationSnapshot, ['attendee', 'session', 'rank', 'score', 'version', 'computed_at', 'stale'], rows,
+            unique_fields=['attendee', 'rank'], using=alias,
+        )
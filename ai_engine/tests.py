@@ -1,3 +1,470 @@
-from django.test import TestCase
+from datetime import timedelta
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from ai_engine import collaborative, feed, response_cache, snapshots, topics
+from ai_engine.chatbot import AuraConcierge
+from ai_engine.context import ChatContext, load_context
+from ai_engine.models import FeedItem, RecommendationSnapshot, Topic
+from ai_engine.recommendation import get_session_recommendations
+from admin_panel.models import EventManagement
+from attendees.models import AttendeeProfile, EventInteraction
+from aura_project.testing import inline_counter_flushes
+from chat.models import ChatMessage, ChatSession
+from events.models import Session, Speaker
+
+
+class FollowUpTests(TestCase):
+    """Follow-ups resolve items of the previous answer, other questions keep their intent"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.enterClassContext(inline_counter_flushes())
+
+    def setUp(self):
+        cache.clear()
+        self.concierge = AuraConcierge()
+        self.user = User.objects.create_user('follow_up', 'follow_up@example.com', 'secret')
+        self.profile = AttendeeProfile.objects.create(user=self.user, job_title='Engineer', interests='AI, Python')
+        self.chat_session = ChatSession.objects.create(user=self.user, session_id='follow-up')
+        start = timezone.now() + timedelta(hours=1)
+        self.sessions = [
+            Session.objects.create(title=f'Talk {i}', description='A talk', start_time=start,
+                                   end_time=start + timedelta(hours=1))
+            for i in range(1, 3)
+        ]
+        self.context = ChatContext(last_items=tuple(('session', s.id) for s in self.sessions))
+
+    def ask(self, message):
+        return self.concierge._process_message(message, self.profile, self.chat_session, self.context)
+
+    def test_ordinal_follow_ups(self):
+        for message, session in [
+            ('Tell me more about the second one', self.sessions[1]),
+            ('tell me about the first', self.sessions[0]),
+            ('More details on the last one?', self.sessions[1]),
+            ('explain #1', self.sessions[0]),
+        ]:
+            with self.subTest(message=message):
+                self.assertIn(session.title, self.ask(message))
+                self.assertEqual(self.context.last_topic, session.title)
+
+    def test_out_of_range_follow_up(self):
+        self.assertIn('only mentioned 2 items', self.ask('more about number 3'))
+
+    def test_ordinal_without_a_reference_is_not_a_follow_up(self):
+        self.ask('tell me about the last session')
+        self.assertEqual(self.context.user_intent, 'recommendation')
+        self.assertEqual(self.context.conversation_depth, 1)
+
+    def test_context_is_persisted_only_when_it_changes(self):
+        Speaker.objects.create(name='Ada', bio='Keynote speaker', company='AURA')
+        self.chat_session.delete()
+        for message in ['Hi', 'Who are the speakers?', 'more about number 9']:
+            self.concierge.get_response(message, self.user)
+        listed, unchanged = ChatMessage.objects.filter(message_type='bot').order_by('id')
+        self.assertIn('context', listed.metadata)
+        self.assertIsNone(unchanged.metadata)
+
+        # A cache miss restores the last persisted context
+        cache.clear()
+        context = load_context(listed.session)
+        self.assertEqual(context.user_intent, 'speaker')
+        self.assertTrue(context.last_items)
+
+
+def reset_recommender(test):
+    """
+    Reload the topic index, which outlives each test's rollback while SQLite
+    reuses the rolled back ids, and serve no trained factors.
+    """
+    cache.clear()
+    topics.index.reload()
+    directory = TemporaryDirectory()
+    test.addCleanup(directory.cleanup)
+    patcher = mock.patch.object(collaborative, 'model',
+                                collaborative.CollaborativeModel(Path(directory.name) / 'recommender.npz'))
+    patcher.start()
+    test.addCleanup(patcher.stop)
+
+
+class RecommendationFallbackTests(TestCase):
+    """Online recommendations only list sessions that haven't ended, and always fill up to the limit"""
+
+    def setUp(self):
+        reset_recommender(self)
+        user = User.objects.create_user('recommended', 'recommended@example.com', 'secret')
+        self.profile = AttendeeProfile.objects.create(user=user, job_title='Engineer', interests='AI')
+        now = timezone.now()
+        self.ended = [
+            Session.objects.create(title=f'AI retrospective {i}', description='Past AI talk',
+                                   start_time=now - timedelta(hours=3), end_time=now - timedelta(hours=2))
+            for i in range(3)
+        ]
+        self.upcoming = [
+            Session.objects.create(title=f'Gardening {i}', description='Plants', start_time=now + timedelta(hours=1),
+                                   end_time=now + timedelta(hours=2))
+            for i in range(3)
+        ]
+
+    def test_ended_matches_are_replaced_by_upcoming_sessions(self):
+        sessions = get_session_recommendations(self.profile.id)
+        self.assertCountEqual(sessions, self.upcoming)
+
+    def test_upcoming_matches_come_first(self):
+        match = Session.objects.create(title='AI tomorrow', description='Future AI talk',
+                                       start_time=timezone.now() + timedelta(days=1),
+                                       end_time=timezone.now() + timedelta(days=1, hours=1))
+        sessions = get_session_recommendations(self.profile.id)
+        self.assertEqual(len(sessions), 3)
+        self.assertEqual(sessions[0], match)
+        self.assertNotIn(self.ended[0], sessions)
+
+
+@skipUnless(collaborative.available(), 'needs numpy and scipy')
+class SnapshotRefreshTests(TestCase):
+    """Changes mark only the affected snapshots stale, and --missing recomputes just those"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.enterClassContext(inline_counter_flushes())
+
+    def setUp(self):
+        reset_recommender(self)
+        now = timezone.now()
+        self.profiles = {
+            interests: AttendeeProfile.objects.create(
+                user=User.objects.create_user(f'snapshot_{i}', f'snapshot_{i}@example.com', 'secret'),
+                job_title='Engineer', interests=interests,
+            )
+            for i, interests in enumerate(['AI', 'Design'])
+        }
+        for i in range(3):
+            Session.objects.create(title=f'Talk {i}', description='Open topic', start_time=now + timedelta(hours=1),
+                                   end_time=now + timedelta(hours=2))
+        self.assertEqual(snapshots.precompute(), 2)
+
+    def stale_profiles(self):
+        return set(RecommendationSnapshot.objects.filter(stale=True).values_list('attendee_id', flat=True))
+
+    def test_new_session_marks_only_interested_attendees(self):
+        Session.objects.create(title='AI in practice', description='Applied AI',
+                               start_time=timezone.now() + timedelta(hours=3),
+                               end_time=timezone.now() + timedelta(hours=4))
+        self.assertEqual(self.stale_profiles(), {self.profiles['AI'].id})
+
+        # Stale snapshots are still served until the job replaces them
+        self.assertEqual(len(snapshots.read(self.profiles['AI'].id)), 3)
+        self.assertEqual(snapshots.precompute(only_missing=True), 1)
+        self.assertEqual(self.stale_profiles(), set())
+        self.assertEqual(len(snapshots.read(self.profiles['AI'].id)), 4)
+
+    def test_interactions_mark_the_attendee(self):
+        EventInteraction.objects.create(attendee=self.profiles['Design'], event_id=1, interaction_type='viewed')
+        self.assertEqual(self.stale_profiles(), {self.profiles['Design'].id})
+
+
+@skipUnless(collaborative.available(), 'needs numpy and scipy')
+class CollaborativeModelTests(TestCase):
+    """Factors trained from interactions recommend unseen sessions that are still on"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.enterClassContext(inline_counter_flushes())
+
+    def setUp(self):
+        cache.clear()
+        now = timezone.now()
+        self.sessions = [
+            Session.objects.create(title=f'Talk {i}', description='A talk', start_time=now + timedelta(hours=1),
+                                   end_time=now + timedelta(hours=2))
+            for i in range(6)
+        ]
+        self.profiles = [
+            AttendeeProfile.objects.create(
+                user=User.objects.create_user(f'cf_{i}', f'cf_{i}@example.com', 'secret'),
+                job_title='Engineer', interests='',
+            )
+            for i in range(6)
+        ]
+        # Two taste groups: the first three attendees like sessions 0-2, the others 3-5
+        for i, profile in enumerate(self.profiles):
+            group = self.sessions[:3] if i < 3 else self.sessions[3:]
+            for session in group:
+                if (i + self.sessions.index(session)) % 3:
+                    EventInteraction.objects.create(attendee=profile, event_id=session.id, interaction_type='attended')
+
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = collaborative.save(
+            collaborative.fit(*collaborative.load_interactions(), factors=2), Path(directory.name) / 'recommender.npz'
+        )
+        self.model = collaborative.CollaborativeModel(self.path)
+        patcher = mock.patch.object(collaborative, 'model', self.model)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def seen(self, profile):
+        return set(EventInteraction.objects.filter(attendee=profile).values_list('event_id', flat=True))
+
+    def test_recommends_unseen_sessions_of_the_same_group(self):
+        profile = self.profiles[0]
+        recommended = self.model.recommend(profile.id, 1)
+        self.assertEqual(len(recommended), 1)
+        session_id, score = recommended[0]
+        self.assertIn(session_id, {session.id for session in self.sessions[:3]} - self.seen(profile))
+        self.assertGreater(score, 0)
+        self.assertGreater(self.model.version, 0)
+
+    def test_cold_start_attendee_gets_nothing(self):
+        self.assertEqual(self.model.recommend(10**9, 5), [])
+
+    def test_ended_and_deleted_sessions_are_skipped(self):
+        profile = self.profiles[0]
+        unseen = {session.id for session in self.sessions} - self.seen(profile)
+        self.assertEqual({session_id for session_id, _ in self.model.recommend(profile.id, 10)}, unseen)
+
+        ended, deleted = [session for session in self.sessions if session.id in unseen][:2]
+        gone = {ended.id, deleted.id}
+        ended.end_time = timezone.now() - timedelta(minutes=1)
+        ended.save()
+        deleted.delete()
+        self.assertEqual({session_id for session_id, _ in self.model.recommend(profile.id, 10)}, unseen - gone)
+
+    def test_score_matrix_for_unknown_rows_and_columns(self):
+        profile = self.profiles[0]
+        new_session = Session.objects.create(title='New talk', description='Not in the factors',
+                                             start_time=timezone.now(), end_time=timezone.now() + timedelta(hours=1))
+        session_ids = [session.id for session in self.sessions] + [new_session.id]
+        scores = self.model.score_matrix([profile.id, 10**9], session_ids)
+        self.assertEqual(scores.shape, (2, len(session_ids)))
+        self.assertTrue((scores[1] == 0).all())
+        self.assertEqual(scores[0, -1], 0)
+        for column, session_id in enumerate(session_ids):
+            self.assertEqual(session_id in self.seen(profile), scores[0, column] == float('-inf'))
+
+    def test_missing_model_file(self):
+        self.path.unlink()
+        model = collaborative.CollaborativeModel(self.path)
+        self.assertEqual(model.recommend(self.profiles[0].id, 5), [])
+        self.assertEqual(model.version, 0)
+        self.assertIsNone(model.score_matrix([self.profiles[0].id], [self.sessions[0].id]))
+
+
+class TopicLinkTests(TestCase):
+    """Topic links follow the free text they come from, and the index follows the links"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.enterClassContext(inline_counter_flushes())
+
+    def setUp(self):
+        reset_recommender(self)
+        now = timezone.now()
+        self.rust = Session.objects.create(title='Intro to Rust', description='Ownership and borrowing',
+                                           start_time=now, end_time=now + timedelta(hours=1))
+        self.trust = Session.objects.create(title='Trust and safety', description='Moderation at scale',
+                                            start_time=now, end_time=now + timedelta(hours=1))
+        self.ai = Session.objects.create(title='Keynote', description='Where artificial intelligence goes next',
+                                         start_time=now, end_time=now + timedelta(hours=1))
+        self.user = User.objects.create_user('topics', 'topics@example.com', 'secret')
+
+    def topic_id(self, key):
+        return Topic.objects.get(key=key).id
+
+    def test_new_interest_links_existing_sessions(self):
+        profile = AttendeeProfile.objects.create(user=self.user, job_title='Engineer', interests='Rust, AI')
+        rust, ai = self.topic_id('rust'), self.topic_id('ai')
+
+        self.assertEqual(set(self.rust.topics.values_list('id', flat=True)), {rust})
+        self.assertFalse(self.trust.topics.exists())
+        self.assertEqual(set(self.ai.topics.values_list('id', flat=True)), {ai})
+
+        self.assertEqual(topics.index.topics_of('attendees', profile.id), {rust, ai})
+        self.assertEqual(topics.index.members('sessions', {rust, ai}), {self.rust.id, self.ai.id})
+        self.assertEqual(topics.index.shared('attendees', {rust}), {profile.id: 1})
+
+    def test_topic_created_directly_links_sessions(self):
+        topic = Topic.objects.create(key='moderation', name='Moderation')
+        self.assertEqual(list(topic.sessions.all()), [self.trust])
+        self.assertEqual(topics.index.members('sessions', {topic.id}), {self.trust.id})
+
+    def test_edits_and_deletes_unlink(self):
+        profile = AttendeeProfile.objects.create(user=self.user, job_title='Engineer', interests='Rust')
+        rust = self.topic_id('rust')
+
+        self.rust.title = 'Intro to Go'
+        self.rust.save()
+        self.assertFalse(self.rust.topics.exists())
+        self.assertEqual(topics.index.members('sessions', {rust}), set())
+
+        profile.interests = 'Go'
+        profile.save()
+        self.assertEqual(topics.index.topics_of('attendees', profile.id), {self.topic_id('go')})
+        self.assertEqual(topics.index.members('attendees', {rust}), set())
+
+        profile_id = profile.id
+        profile.delete()
+        self.assertEqual(topics.index.topics_of('attendees', profile_id), frozenset())
+
+
+class ResponseCacheTests(TestCase):
+    """Cached answers are keyed by intent, time bucket and fingerprint, and dropped when their inputs change"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.enterClassContext(inline_counter_flushes())
+
+    def setUp(self):
+        cache.clear()
+        self.now = timezone.now().replace(second=0, microsecond=0)
+        patcher = mock.patch.object(response_cache.timezone, 'now', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.builds = 0
+
+    def build(self):
+        self.builds += 1
+        return f'answer {self.builds}'
+
+    def get(self, intent='schedule', **options):
+        return response_cache.get_or_build(intent, self.build, **options)
+
+    def test_keyed_by_intent_and_fingerprint(self):
+        self.assertEqual(self.get(), 'answer 1')
+        self.assertEqual(self.get(), 'answer 1')
+        self.assertEqual(self.get('speakers'), 'answer 2')
+        self.assertEqual(self.get(fingerprint='a'), 'answer 3')
+        self.assertEqual(self.get(fingerprint='b'), 'answer 4')
+        self.assertEqual(self.get(fingerprint='a'), 'answer 3')
+
+    def test_time_buckets(self):
+        self.assertEqual(self.get(bucket_seconds=60), 'answer 1')
+        self.now += timedelta(seconds=59)
+        self.assertEqual(self.get(bucket_seconds=60), 'answer 1')
+        self.now += timedelta(seconds=1)
+        self.assertEqual(self.get(bucket_seconds=60), 'answer 2')
+
+    def test_catalogue_changes_invalidate_everything(self):
+        self.assertEqual(self.get(), 'answer 1')
+        Speaker.objects.create(name='Grace', bio='Compilers', company='AURA')
+        self.assertEqual(self.get(), 'answer 2')
+
+    def test_interactions_invalidate_the_attendee_only(self):
+        profiles = [
+            AttendeeProfile.objects.create(
+                user=User.objects.create_user(f'cached_{i}', f'cached_{i}@example.com', 'secret'),
+                job_title='Engineer', interests='AI',
+            )
+            for i in range(2)
+        ]
+
+        concierge = AuraConcierge()
+
+        def recommendations(profile):
+            with mock.patch.object(concierge, '_build_recommendation_response', lambda profile: self.build()):
+                return concierge._handle_recommendation_request('Recommend something', profile)
+
+        self.assertEqual([recommendations(profile) for profile in profiles], ['answer 1', 'answer 2'])
+        EventInteraction.objects.create(attendee=profiles[0], event_id=1, interaction_type='attended')
+        self.assertEqual([recommendations(profile) for profile in profiles], ['answer 3', 'answer 2'])
+
+
+class FeedTests(TestCase):
+    """Feed items are upserted in bulk, and every worker's snapshot follows the shared version"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.enterClassContext(inline_counter_flushes())
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_superuser('feed_admin', 'feed_admin@example.com', 'secret')
+        self.registry = feed.StaticFeedRegistry()
+
+    def create_event(self, title='Launch party', **fields):
+        start = timezone.now() + timedelta(hours=1)
+        return EventManagement.objects.create(
+            title=title, description='Drinks on the roof', start_datetime=start,
+            end_datetime=start + timedelta(hours=2), status='published', created_by=self.admin, **fields
+        )
+
+    def titles(self):
+        return [item['title'] for item in self.registry.get_items()]
+
+    def test_materialising_updates_the_existing_row(self):
+        event = self.create_event(priority='critical')
+        item = FeedItem.objects.get(source='event', source_id=event.id)
+        self.assertEqual((item.priority, item.priority_rank), ('high', 4))
+
+        event.title = 'Launch party moved'
+        event.save()
+        item = FeedItem.objects.get(source='event', source_id=event.id)
+        self.assertEqual(item.title, '🌟 Launch party moved')
+
+        event.status = 'cancelled'
+        event.save()
+        self.assertFalse(FeedItem.objects.filter(source='event').exists())
+
+    def test_rebuild_upserts_in_batches_and_drops_stale_rows(self):
+        events = [self.create_event(f'Event {number}') for number in range(3)]
+        start = timezone.now() + timedelta(hours=1)
+        Session.objects.create(title='Keynote', description='Opening', start_time=start,
+                               end_time=start + timedelta(hours=1))
+        FeedItem.objects.filter(source_id=events[0].id).update(title='stale copy')
+        EventManagement.objects.filter(id=events[1].id).update(status='draft')
+
+        with mock.patch.object(feed, 'REBUILD_BATCH_SIZE', 2), \
+                mock.patch.object(feed, '_upsert', wraps=feed._upsert) as upsert:
+            self.assertEqual(feed.rebuild_feed_items(), (2, 1))
+        self.assertEqual([len(call.args[0]) for call in upsert.call_args_list], [2, 1])
+
+        self.assertEqual(
+            sorted(FeedItem.objects.values_list('title', flat=True)),
+            ['🌟 Event 0', '🌟 Event 2', '📅 Starting soon: Keynote'],
+        )
+
+    def test_falls_back_to_the_curated_feed(self):
+        curated = self.titles()
+        self.assertTrue(curated)
+        self.assertNotIn('🌟 Launch party', curated)
+
+        missing = feed.StaticFeedRegistry(Path('/nonexistent/feed.json'))
+        self.assertEqual(missing.get_items(), ())
+
+    def test_reloads_when_another_worker_bumps_the_version(self):
+        curated = self.titles()
+        # Another worker materialises an event without touching this snapshot
+        with mock.patch.object(feed, 'notify_feed_changed'):
+            self.create_event()
+        self.assertEqual(self.titles(), curated)
+
+        feed.notify_feed_changed()
+        self.assertEqual(self.titles(), curated)
+        self.registry._checked_at -= feed.VERSION_CHECK_INTERVAL
+        self.assertEqual(self.titles(), ['🌟 Launch party'])
+
+    def test_reload_view(self):
+        self.create_event()
+        client = Client()
+        client.force_login(self.admin)
+        with mock.patch.object(feed, 'registry', self.registry):
+            response = client.post(reverse('admin_panel:reload_feed'))
+        self.assertEqual(response.json(), {'success': True, 'item_count': 1})
+        self.assertEqual(self.titles(), ['🌟 Launch party'])
+        self.assertEqual(cache.get(feed.VERSION_KEY), self.registry._version)
+
+        self.assertEqual(Client().post(reverse('admin_panel:reload_feed')).status_code, 302)
@@ -0,0 +1,364 @@
+"""
+Normalised topic vocabulary and an in-memory inverted index over it.
+
+Attendee interests, event tags and preferred topics stay free text for
+editing. Saving one splits the text into Topic rows linked through the
+model's ``topics`` field; a saved session is linked to the known topics its
+title or description mentions, and a new topic to the existing sessions
+mentioning it, with one query per topic. ``index`` maps every topic to
+the sessions, attendees, events and preferences carrying it, so "sessions
+for my interests" or "attendees sharing a topic" are set operations in
+memory instead of LIKE scans.
+"""
+from collections import Counter
+from django.apps import apps as global_apps
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from aura_project.caching import bump_version
+import logging
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Bumped on every change to the topic links so other workers catch up
+VERSION_KEY = 'aura:topics:version'
+
+# How often (seconds) a worker checks whether the links changed elsewhere
+VERSION_CHECK_INTERVAL = 5
+
+# Index name -> (model, free-text field its topics are derived from).
+# Sessions have no such field and are matched against the vocabulary.
+KINDS = {
+    'sessions': ('events.Session', None),
+    'attendees': ('attendees.AttendeeProfile', 'interests'),
+    'events': ('admin_panel.EventManagement', 'tags'),
+    'preferences': ('chat.UserPreferences', 'preferred_topics'),
+}
+
+# Spellings folded into one key
+ALIASES = {
+    'artificial intelligence': 'ai',
+    'ml': 'machine learning',
+    'user experience': 'ux',
+    'js': 'javascript',
+}
+
+SEPARATORS = re.compile(r'[,;|\n]+')
+
+# Topic.key max_length
+KEY_MAX_LENGTH = 100
+
+
+def _clean(label):
+    return ' '.join(label.split()).strip(' .:/-\'"').lstrip('+#').strip()
+
+
+def normalise(label):
+    """Lookup key of a free-text topic: whitespace collapsed, case-folded, aliases resolved"""
+    key = _clean(label).casefold()
+    return ALIASES.get(key, key)
+
+
+def split_topics(text):
+    """{key: display name} for every topic in a comma-separated string"""
+    topics = {}
+    for label in SEPARATORS.split(text or ''):
+        name = _clean(label)
+        key = normalise(name)
+        if key and len(key) <= KEY_MAX_LENGTH:
+            topics.setdefault(key, name)
+    return topics
+
+
+def vocabulary_pattern(keys):
+    """Regex finding ``keys``, or an alias of one, as whole words; None for no keys"""
+    phrases = set(keys) | {alias for alias, key in ALIASES.items() if key in keys}
+    if not phrases:
+        return None
+    alternatives = '|'.join(re.escape(phrase) for phrase in sorted(phrases, key=len, reverse=True))
+    return re.compile(rf'(?<!\w)(?:{alternatives})(?!\w)', re.IGNORECASE)
+
+
+def find_topics(pattern, text):
+    """Keys of the topics ``pattern`` finds in ``text``"""
+    if pattern is None or not text:
+        return set()
+    return {normalise(match.group(0)) for match in pattern.finditer(text)}
+
+
+def kind_of(model):
+    """Index name of a model with a ``topics`` field"""
+    for kind, (label, _) in KINDS.items():
+        if model._meta.label == label:
+            return kind
+    raise LookupError(f"{model._meta.label} has no topic links")
+
+
+def _through(model):
+    """The link table of ``model.topics`` and its two id columns"""
+    field = model._meta.get_field('topics')
+    return (field.remote_field.through,
+            f'{field.m2m_field_name()}_id', f'{field.m2m_reverse_field_name()}_id')
+
+
+class TopicIndex:
+    """
+    In-memory inverted index over the topic links, in both directions.
+    Loaded with one query per link table and kept current by the signals in
+    ai_engine.signals. Links changed by another worker are picked up within
+    VERSION_CHECK_INTERVAL seconds. Returned sets are shared; don't mutate them.
+    """
+
+    def __init__(self):
+        self._keys = {}
+        self._names = {}
+        self._pattern = None
+        self._postings = {kind: {} for kind in KINDS}
+        self._topics = {kind: {} for kind in KINDS}
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _ensure_fresh(self):
+        now = time.monotonic()
+        if now - self._checked_at < VERSION_CHECK_INTERVAL:
+            return
+        self._checked_at = now
+
+        version = cache.get(VERSION_KEY, 0)
+        if version != self._version:
+            with self._lock:
+                if version != self._version:
+                    self._load()
+                    self._version = version
+
+    def reload(self):
+        """Reload the index here and signal the other workers to do the same"""
+        version = bump_version(VERSION_KEY)
+        with self._lock:
+            self._load()
+            self._version = version
+            self._checked_at = time.monotonic()
+        return len(self._keys)
+
+    def _load(self):
+        Topic = global_apps.get_model('ai_engine', 'Topic')
+        try:
+            vocabulary = list(Topic.objects.values_list('id', 'key', 'name'))
+            links = {}
+            for kind, (label, _) in KINDS.items():
+                through, source, target = _through(global_apps.get_model(label))
+                postings, topics = {}, {}
+                for object_id, topic_id in through.objects.values_list(source, target).iterator(chunk_size=5000):
+                    postings.setdefault(topic_id, set()).add(object_id)
+                    topics.setdefault(object_id, set()).add(topic_id)
+                links[kind] = (
+                    {topic_id: frozenset(ids) for topic_id, ids in postings.items()},
+                    {object_id: frozenset(ids) for object_id, ids in topics.items()},
+                )
+        except Exception as e:
+            logger.error(f"Could not load the topic index: {e}")
+            return
+
+        self._keys = {key: topic_id for topic_id, key, _ in vocabulary}
+        self._names = {topic_id: name for topic_id, _, name in vocabulary}
+        self._pattern = vocabulary_pattern(self._keys)
+        self._postings = {kind: postings for kind, (postings, _) in links.items()}
+        self._topics = {kind: topics for kind, (_, topics) in links.items()}
+
+    def lookup(self, labels):
+        """Ids of the known topics among free-text ``labels``"""
+        self._ensure_fresh()
+        keys = {normalise(label) for label in labels}
+        return {self._keys[key] for key in keys if key in self._keys}
+
+    def match_text(self, text):
+        """Ids of the known topics mentioned in ``text``"""
+        self._ensure_fresh()
+        return {self._keys[key] for key in find_topics(self._pattern, text) if key in self._keys}
+
+    def pattern(self):
+        """Regex matching the current vocabulary, for find_topics()"""
+        self._ensure_fresh()
+        return self._pattern
+
+    def names(self, topic_ids):
+        self._ensure_fresh()
+        return sorted(self._names[topic_id] for topic_id in topic_ids if topic_id in self._names)
+
+    def topics_of(self, kind, object_id):
+        """Topic ids linked to one session, attendee, event or preference set"""
+        self._ensure_fresh()
+        return self._topics[kind].get(object_id, frozenset())
+
+    def links(self, kind):
+        """{row id: topic ids} for every linked row of ``kind``, as a copy"""
+        self._ensure_fresh()
+        with self._lock:
+            return dict(self._topics[kind])
+
+    def members(self, kind, topic_ids):
+        """Ids of the ``kind`` rows linked to any of ``topic_ids``"""
+        self._ensure_fresh()
+        postings = self._postings[kind]
+        return set().union(*(postings.get(topic_id, ()) for topic_id in topic_ids))
+
+    def shared(self, kind, topic_ids):
+        """Counter of the ``kind`` rows linked to ``topic_ids``, by how many of them they carry"""
+        self._ensure_fresh()
+        postings = self._postings[kind]
+        counts = Counter()
+        for topic_id in topic_ids:
+            counts.update(postings.get(topic_id, ()))
+        return counts
+
+    # Updates, called by the signal handlers after the links changed
+
+    def link(self, kind, object_ids, topic_ids, linked=True):
+        """Record links added (or removed) between ``object_ids`` and ``topic_ids``"""
+        def change():
+            if linked and not all(topic_id in self._names for topic_id in topic_ids):
+                return False
+            for object_id in object_ids:
+                current = self._topics[kind].get(object_id, frozenset())
+                self._set(kind, object_id, current | topic_ids if linked else current - topic_ids)
+            return True
+
+        self._publish(change)
+
+    def forget(self, kind, object_id):
+        """Drop every link of a deleted or cleared row"""
+        def change():
+            self._set(kind, object_id, frozenset())
+            return True
+
+        self._publish(change)
+
+    def invalidate(self):
+        """Reload everywhere, after the vocabulary itself changed"""
+        bump_version(VERSION_KEY)
+        self._checked_at = 0.0
+
+    def _set(self, kind, object_id, topic_ids):
+        topics, postings = self._topics[kind], self._postings[kind]
+        previous = topics.get(object_id, frozenset())
+        for topic_id in previous - topic_ids:
+            postings[topic_id] = postings.get(topic_id, frozenset()) - {object_id}
+        for topic_id in topic_ids - previous:
+            postings[topic_id] = postings.get(topic_id, frozenset()) | {object_id}
+        if topic_ids:
+            topics[object_id] = frozenset(topic_ids)
+        else:
+            topics.pop(object_id, None)
+
+    def _publish(self, change):
+        """Apply ``change`` here if no other worker changed the links since our last load"""
+        version = bump_version(VERSION_KEY)
+        with self._lock:
+            if self._version is not None and version == self._version + 1 and change():
+                self._version = version
+            else:
+                # Reload on the next read instead
+                self._checked_at = 0.0
+
+
+index = TopicIndex()
+
+
+def ensure_topics(names):
+    """{key: id} for ``names`` ({key: display name}), creating the missing topics"""
+    Topic = global_apps.get_model('ai_engine', 'Topic')
+    if not names:
+        return {}
+    ids = dict(Topic.objects.filter(key__in=names).values_list('key', 'id'))
+    missing = [Topic(key=key, name=name) for key, name in names.items() if key not in ids]
+    if missing:
+        Topic.objects.bulk_create(missing, ignore_conflicts=True)
+        created = dict(Topic.objects.filter(key__in=[topic.key for topic in missing]).values_list('key', 'id'))
+        ids.update(created)
+        # bulk_create sends no post_save; the vocabulary changed all the same
+        link_new_topics(created)
+        index.invalidate()
+    return ids
+
+
+def link_new_topics(ids):
+    """
+    Link new topics ({key: id}) to the existing sessions mentioning them,
+    with one query per topic. Returns the number of links added.
+    """
+    Session = global_apps.get_model('events', 'Session')
+    through, source, target = _through(Session)
+    links = []
+    for key, topic_id in ids.items():
+        pattern = vocabulary_pattern({key})
+        phrases = {key} | {alias for alias, aliased in ALIASES.items() if aliased == key}
+        mentions = Q()
+        for phrase in phrases:
+            mentions |= Q(title__icontains=phrase) | Q(description__icontains=phrase)
+        # LIKE narrows the candidates, the pattern keeps whole-word mentions only
+        for session_id, title, description in Session.objects.filter(mentions).values_list(
+                'id', 'title', 'description').iterator(chunk_size=5000):
+            if key in find_topics(pattern, f'{title}\n{description}'):
+                links.append(through(**{source: session_id, target: topic_id}))
+    through.objects.bulk_create(links, ignore_conflicts=True)
+    return len(links)
+
+
+def link_text(instance, text):
+    """Point ``instance.topics`` at the topics listed in ``text``"""
+    instance.topics.set(ensure_topics(split_topics(text)).values())
+
+
+def link_session(session):
+    """Point ``session.topics`` at the known topics its title or description mentions"""
+    Topic = global_apps.get_model('ai_engine', 'Topic')
+    keys = find_topics(index.pattern(), f'{session.title}\n{session.description}')
+    session.topics.set(Topic.objects.filter(key__in=keys).values_list('id', flat=True) if keys else [])
+
+
+def rebuild_topic_links(batch_size=5000):
+    """
+    Re-derive every topic link from the free-text fields, creating the
+    vocabulary as needed. Returns the number of links per index name.
+    """
+    Topic = global_apps.get_model('ai_engine', 'Topic')
+    models = {kind: global_apps.get_model(label) for kind, (label, _) in KINDS.items()}
+
+    links, names = {}, {}
+    for kind, (_, field) in KINDS.items():
+        if field:
+            rows = models[kind].objects.values_list('id', field).iterator(chunk_size=batch_size)
+            links[kind] = {object_id: split_topics(text) for object_id, text in rows}
+            for topics in links[kind].values():
+                for key, name in topics.items():
+                    names.setdefault(key, name)
+
+    ids = dict(Topic.objects.values_list('key', 'id'))
+    Topic.objects.bulk_create(
+        [Topic(key=key, name=name) for key, name in names.items() if key not in ids],
+        batch_size=batch_size, ignore_conflicts=True,
+    )
+    ids = dict(Topic.objects.values_list('key', 'id'))
+
+    pattern = vocabulary_pattern(ids)
+    rows = models['sessions'].objects.values_list('id', 'title', 'description').iterator(chunk_size=batch_size)
+    links['sessions'] = {
+        session_id: find_topics(pattern, f'{title}\n{description}') for session_id, title, description in rows
+    }
+
+    counts = {}
+    with transaction.atomic():
+        for kind, topics_by_object in links.items():
+            through, source, target = _through(models[kind])
+            through.objects.all().delete()
+            created = through.objects.bulk_create(
+                (through(**{source: object_id, target: ids[key]})
+                 for object_id, keys in topics_by_object.items() for key in keys),
+                batch_size=batch_size,
+            )
+            counts[kind] = len(created)
+    return counts
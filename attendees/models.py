@@ -6,6 +6,8 @@ class AttendeeProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     job_title = models.CharField(max_length=200)
     interests = models.TextField(help_text="Comma-separated interests")
+    # Derived from interests by ai_engine.topics
+    topics = models.ManyToManyField('ai_engine.Topic', blank=True, editable=False, related_name='attendees')
     company = models.CharField(max_length=200, blank=True)
     bio = models.TextField(blank=True)
     networking_preferences = models.CharField(
@@ -26,7 +28,7 @@ class AttendeeProfile(models.Model):
     
     def update_last_login(self):
         self.last_login = timezone.now()
-        self.save()
+        self.save(update_fields=['last_login'])
 
 class EventInteraction(models.Model):
     INTERACTION_TYPES = [
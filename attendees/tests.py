@@ -1,3 +1,32 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.test import Client
+from django.urls import reverse
 
-# Create your tests here.
+from attendees.models import AttendeeProfile
+from aura_project.testing import QueryBudgetTestCase
+
+
+class AttendeeQueryBudgetTests(QueryBudgetTestCase):
+    """Attendee pages and APIs stay within QUERY_BUDGETS"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('budget_attendee', 'attendee@example.com', 'secret')
+        self.profile = AttendeeProfile.objects.create(
+            user=self.user, job_title='Engineer', interests='AI, Cloud, Data', company='AURA'
+        )
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def get(self, name, *args, **params):
+        return lambda: self.client.get(reverse(name, args=args), params)
+
+    def test_views_within_budget(self):
+        self.assertWithinQueryBudgets({
+            'home': self.get('home'),
+            'api-timeline': self.get('api-timeline'),
+            'attendeeprofile-list': self.get('attendeeprofile-list'),
+            'attendeeprofile-list[topic]': self.get('attendeeprofile-list', topic='ai'),
+            'attendeeprofile-detail': self.get('attendeeprofile-detail', self.profile.id),
+            'attendeeprofile-recommendations': self.get('attendeeprofile-recommendations', self.profile.id),
+            'attendeeprofile-similar': self.get('attendeeprofile-similar', self.profile.id),
+        })
@@ -8,7 +8,7 @@ from rest_framework.permissions import IsAuthenticated
 from .models import AttendeeProfile
 from .serializers import AttendeeProfileSerializer
 from events.serializers import SessionSerializer
-from ai_engine import recommendation
+from ai_engine import recommendation, topics
 
 
 # View 1: A standalone function to render your HTML page
@@ -22,6 +22,28 @@ class AttendeeProfileViewSet(viewsets.ModelViewSet):
     serializer_class = AttendeeProfileSerializer
     permission_classes = [IsAuthenticated]
 
+    # Profiles returned by the similar action
+    SIMILAR_LIMIT = 10
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # ?topic=AI lists the attendees interested in a topic
+        topic = self.request.query_params.get('topic')
+        if topic:
+            queryset = queryset.filter(id__in=topics.index.members('attendees', topics.index.lookup([topic])))
+        return queryset
+
+    @action(detail=True, methods=['get'])
+    def similar(self, request, pk=None):
+        """Attendees sharing the most interests with this one"""
+        profile = self.get_object()
+        shared = topics.index.shared('attendees', topics.index.topics_of('attendees', profile.id))
+        shared.pop(profile.id, None)
+        ranked = [profile_id for profile_id, _ in shared.most_common(self.SIMILAR_LIMIT)]
+        profiles = AttendeeProfile.objects.in_bulk(ranked)
+        serializer = self.get_serializer([profiles[i] for i in ranked if i in profiles], many=True)
+        return Response(serializer.data)
+
     @action(detail=True, methods=['get'])
     def recommendations(self, request, pk=None):
         profile = self.get_object()
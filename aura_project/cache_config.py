@@ -0,0 +1,63 @@
+"""
+settings.CACHES from the environment.
+
+    AURA_CACHE_URL      redis://host:6379/0, rediss://..., memcached://host:11211
+                        or locmem:// (default)
+    AURA_CACHE_TIMEOUT  default entry lifetime in seconds (default: 300)
+
+Connection admission, the settings registry, the maintenance flag and the
+feed and topic version counters all share state through the cache. LocMem
+keeps that state inside one process, so deployments running more than one
+worker need Redis or Memcached.
+
+Whatever the backend, chat.metrics.InstrumentedCache wraps it to count the
+cache hits and misses of each request.
+"""
+from urllib.parse import urlsplit
+from django.core.exceptions import ImproperlyConfigured
+import os
+
+REDIS_SCHEMES = {'redis', 'rediss', 'unix'}
+
+BACKENDS = {
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'memcached': 'django.core.cache.backends.memcached.PyMemcacheCache',
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+}
+
+
+def _timeout(environ):
+    value = environ.get('AURA_CACHE_TIMEOUT')
+    if value is None or not value.strip():
+        return 300
+    try:
+        return int(value)
+    except ValueError:
+        raise ImproperlyConfigured(f"AURA_CACHE_TIMEOUT must be a whole number, got {value!r}")
+
+
+def _backend(url):
+    parts = urlsplit(url)
+    if parts.scheme in REDIS_SCHEMES:
+        return BACKENDS['redis'], url, {}
+    if parts.scheme == 'memcached':
+        return BACKENDS['memcached'], parts.netloc, {}
+    if parts.scheme == 'locmem':
+        return BACKENDS['locmem'], parts.netloc or 'unique-snowflake', {'MAX_ENTRIES': 1000}
+    raise ImproperlyConfigured(
+        f"Unsupported cache URL scheme {parts.scheme!r}; use redis://, memcached:// or locmem://"
+    )
+
+
+def cache_settings(environ=os.environ):
+    """CACHES with an instrumented 'default' cache"""
+    backend, location, options = _backend(environ.get('AURA_CACHE_URL') or 'locmem://')
+    return {
+        'default': {
+            'BACKEND': 'chat.metrics.InstrumentedCache',
+            'WRAPPED_BACKEND': backend,
+            'LOCATION': location,
+            'TIMEOUT': _timeout(environ),
+            'OPTIONS': options,
+        }
+    }
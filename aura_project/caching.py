@@ -0,0 +1,58 @@
+"""
+Shared caching helpers for AURA.
+"""
+from django.core.cache import cache
+from django.db import connections
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def bump_version(key):
+    """
+    Increment the shared version counter at ``key``, which workers compare to
+    notice changes made elsewhere. Returns the new version.
+    """
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+        return 1
+
+
+def get_or_refresh(key, compute, ttl, stale_ttl):
+    """
+    Stale-while-revalidate cache lookup.
+
+    Values younger than ``ttl`` seconds are returned as-is. Older values are
+    still returned while a single background thread recomputes them, so
+    callers never wait on ``compute`` unless nothing is cached at all.
+    Entries expire entirely after ``stale_ttl`` seconds.
+    """
+    entry = cache.get(key)
+    if entry is None:
+        value = compute()
+        cache.set(key, (time.time(), value), stale_ttl)
+        return value
+
+    computed_at, value = entry
+    if time.time() - computed_at >= ttl and cache.add(f"{key}:refreshing", True, ttl):
+        threading.Thread(
+            target=_refresh,
+            args=(key, compute, stale_ttl),
+            name=f"refresh:{key}",
+            daemon=True,
+        ).start()
+    return value
+
+
+def _refresh(key, compute, stale_ttl):
+    try:
+        cache.set(key, (time.time(), compute()), stale_ttl)
+    except Exception as e:
+        logger.error(f"Background refresh of {key} failed: {e}")
+    finally:
+        cache.delete(f"{key}:refreshing")
+        connections.close_all()
@@ -0,0 +1,3 @@
+"""
+Database backends and routers for AURA.
+"""
@@ -0,0 +1,55 @@
+"""
+Bulk inserts for large row counts.
+
+At hundreds of thousands of rows, compiling a bulk_create statement per
+object costs far more than the insert itself. insert_rows() compiles one
+INSERT and sends value tuples through executemany instead.
+"""
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models.constants import OnConflict
+import itertools
+
+BATCH_SIZE = 10_000
+
+
+def insert_rows(model, field_names, rows, batch_size=BATCH_SIZE, ignore_conflicts=False,
+                unique_fields=None, using=DEFAULT_DB_ALIAS):
+    """
+    Insert an iterable of value tuples, one transaction per batch. Rows that
+    hit a unique constraint are skipped with ``ignore_conflicts``, or update
+    the other columns of the existing row when ``unique_fields`` is given.
+    Returns the number of rows sent.
+    """
+    db = connections[using]
+    ops = db.ops
+    fields = [model._meta.get_field(name) for name in field_names]
+    if unique_fields:
+        on_conflict = OnConflict.UPDATE
+        unique_columns = [model._meta.get_field(name).column for name in unique_fields]
+        update_columns = [field.column for field in fields if field.column not in unique_columns]
+    else:
+        on_conflict = OnConflict.IGNORE if ignore_conflicts else None
+        unique_columns = update_columns = None
+    sql = (
+        f"{ops.insert_statement(on_conflict=on_conflict)} {ops.quote_name(model._meta.db_table)} "
+        f"({', '.join(ops.quote_name(field.column) for field in fields)}) "
+        f"VALUES ({', '.join(['%s'] * len(fields))})"
+    )
+    suffix = ops.on_conflict_suffix_sql(fields, on_conflict, update_columns, unique_columns)
+    if suffix:
+        sql = f"{sql} {suffix}"
+
+    total = 0
+    rows = iter(rows)
+    with db.cursor() as cursor:
+        while True:
+            batch = list(itertools.islice(rows, batch_size))
+            if not batch:
+                return total
+            prepared = [
+                tuple(field.get_db_prep_save(value, db) for field, value in zip(fields, row))
+                for row in batch
+            ]
+            with transaction.atomic(using=db.alias):
+                cursor.executemany(sql, prepared)
+            total += len(batch)
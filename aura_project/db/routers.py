@@ -0,0 +1,92 @@
+"""
+Database routers.
+
+Reads are routed by settings.DATABASE_ROUTING. In order, the first rule
+that applies wins:
+
+1. While the primary connection is inside a transaction, reads stay on it,
+   so code always sees its own uncommitted writes.
+2. Inside ``reading_from(alias)`` / ``use_replica()`` reads go to that alias.
+   Reporting views and commands use this to reach the replica.
+3. ``APP_READ_ALIASES`` maps an app label to the alias serving its reads.
+4. Otherwise reads go to ``READ_ALIAS``.
+
+An alias that isn't configured falls back to READ_ALIAS, then to the
+primary, so the same code runs with one database file or with a replica.
+Writes always go to the primary.
+"""
+from contextlib import ContextDecorator
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_read_alias = ContextVar('aura_read_alias', default=None)
+
+
+def _routing():
+    return getattr(settings, 'DATABASE_ROUTING', {})
+
+
+def _configured(alias):
+    """``alias`` if it is in DATABASES, else the nearest configured fallback"""
+    for candidate in (alias, _routing().get('READ_ALIAS')):
+        if candidate and candidate in connections.settings:
+            return candidate
+    return DEFAULT_DB_ALIAS
+
+
+class reading_from(ContextDecorator):
+    """Send reads made in this block or decorated function to ``alias``"""
+
+    def __init__(self, alias):
+        self.alias = alias
+        self._token = None
+
+    def _recreate_cm(self):
+        # Concurrent calls of a decorated function each get their own token
+        return type(self)(self.alias)
+
+    def __enter__(self):
+        self._token = _read_alias.set(self.alias)
+        return self
+
+    def __exit__(self, *exc):
+        _read_alias.reset(self._token)
+        return False
+
+
+def use_replica():
+    """
+    Send reads in this block or decorated function to the reporting
+    replica. Use it for heavy read-only work that tolerates replication lag.
+    """
+    return reading_from(_routing().get('REPLICA_ALIAS', 'replica'))
+
+
+class ReadConnectionRouter:
+    """
+    Spreads reads over the read-only aliases as described in the module
+    docstring; the schema and every write belong to the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        routing = _routing()
+        alias = (
+            _read_alias.get()
+            or routing.get('APP_READ_ALIASES', {}).get(model._meta.app_label)
+            or routing.get('READ_ALIAS')
+        )
+        return _configured(alias) if alias else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # Objects loaded through a read alias are saved on the primary
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Every alias holds the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,36 @@
+"""
+SQLite backend that tunes every new connection with PRAGMAs.
+
+Set ``OPTIONS['pragmas']`` to a mapping of PRAGMA names to values; they
+are applied in order right after Django's own connection setup:
+
+    'OPTIONS': {
+        'transaction_mode': 'IMMEDIATE',
+        'pragmas': {'journal_mode': 'WAL', 'busy_timeout': 5000},
+    }
+"""
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+import re
+
+# PRAGMA values are interpolated, so only allow plain words and numbers
+VALID_VALUE = re.compile(r'^-?[\w.]+$')
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        pragmas = kwargs.pop('pragmas', {})
+        for name, value in pragmas.items():
+            if not (name.isidentifier() and VALID_VALUE.match(str(value))):
+                raise ImproperlyConfigured(
+                    f"settings.DATABASES[{self.alias!r}]['OPTIONS']['pragmas'] has an invalid entry {name}={value!r}"
+                )
+        self.pragmas = pragmas
+        return kwargs
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
@@ -0,0 +1,85 @@
+"""
+Maximum number of database queries per request, checked by the
+QueryBudgetTestCase suites in each app's tests.py.
+
+HTTP endpoints are keyed by URL name, Django admin changelists by their
+admin URL name and WebSocket traffic by ``ws:<message type>`` (``ws:connect``
+for the handshake). Counts are taken with cold caches, so they include the
+queries that rebuild cached values. Raise a budget only together with the
+change that needs it, and never for work that grows with the data.
+"""
+
+QUERY_BUDGETS = {
+    # chat pages and APIs
+    'chat:home': 0,
+    'chat:dashboard': 9,
+    'chat:login': 0,
+    'chat:register': 0,
+    'chat:create_profile': 5,
+    'chat:log_activity': 6,
+    'chat:get_feed_api': 8,
+    'chat:event_interaction': 9,
+    'chat:about': 0,
+    'chat:features': 0,
+    'chat:test_websocket': 0,
+
+    # Monitoring
+    'chat:health_check': 3,
+    'chat:health_live': 0,
+    'chat:health_ready': 0,
+    'chat:health_deep': 1,
+    'chat:system_metrics': 3,
+
+    # Chat WebSocket
+    'ws:connect': 12,
+    'ws:message': 12,
+    'ws:get_feed': 3,
+    'ws:action': 13,
+    'ws:unknown': 0,
+    'ws:invalid': 0,
+
+    # Attendee and session APIs
+    'home': 5,
+    'api-timeline': 7,
+    'attendeeprofile-list': 7,
+    'attendeeprofile-detail': 6,
+    'attendeeprofile-recommendations': 7,
+    'attendeeprofile-similar': 7,
+    'session-list': 7,
+    'session-detail': 7,
+
+    # Admin panel
+    'admin_panel:login': 0,
+    'admin_panel:dashboard': 11,
+    'admin_panel:user_management': 8,
+    'admin_panel:suspend_user': 11,
+    'admin_panel:event_management': 7,
+    'admin_panel:reload_feed': 8,
+    'admin_panel:system_settings': 6,
+    'admin_panel:toggle_profiler': 11,
+    'admin_panel:analytics': 14,
+    'admin_panel:system_logs': 7,
+    'admin_panel:maintenance_mode': 7,
+    'admin_panel:export_data': 7,
+
+    # Django admin changelists
+    'admin:admin_panel_adminprofile_changelist': 9,
+    'admin:admin_panel_analytics_changelist': 10,
+    'admin:admin_panel_eventmanagement_changelist': 8,
+    'admin:admin_panel_maintenancemode_changelist': 8,
+    'admin:admin_panel_notificationtemplate_changelist': 8,
+    'admin:admin_panel_systemlogs_changelist': 9,
+    'admin:admin_panel_systemsettings_changelist': 9,
+    'admin:admin_panel_usermanagement_changelist': 9,
+    'admin:ai_engine_topic_changelist': 8,
+    'admin:attendees_attendeeprofile_changelist': 8,
+    'admin:attendees_eventinteraction_changelist': 8,
+    'admin:auth_group_changelist': 8,
+    'admin:auth_user_changelist': 9,
+    'admin:chat_chatmessage_changelist': 10,
+    'admin:chat_chatsession_changelist': 10,
+    'admin:chat_useractivity_changelist': 9,
+    'admin:chat_userpreferences_changelist': 9,
+    'admin:events_session_changelist': 8,
+    'admin:events_speaker_changelist': 8,
+}
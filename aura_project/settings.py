@@ -12,6 +12,9 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 import os
 from pathlib import Path
 
+from aura_project.cache_config import cache_settings
+from aura_project.db.config import database_settings
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -50,7 +53,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'chat.middleware.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'admin_panel.middleware.MaintenanceModeMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -89,11 +94,32 @@ CHANNEL_LAYERS = {
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+# Applied to every SQLite connection. WAL lets readers run alongside the
+# writer; busy_timeout makes writers queue for the lock instead of failing
+# with "database is locked".
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',  # durable in WAL mode, fsync only at checkpoints
+    'busy_timeout': 20000,  # milliseconds
+    'cache_size': -65536,  # KiB, i.e. 64 MiB of page cache per connection
+    'mmap_size': 268435456,  # 256 MiB
+    'temp_store': 'MEMORY',
+}
+
+# Built from AURA_DATABASE_URL and friends, see aura_project/db/config.py
+DATABASES = database_settings(BASE_DIR / 'db.sqlite3', SQLITE_PRAGMAS)
+
+DATABASE_ROUTERS = ['aura_project.db.routers.ReadConnectionRouter']
+
+# How ReadConnectionRouter picks a database for reads
+DATABASE_ROUTING = {
+    'READ_ALIAS': 'read',
+    # Used by use_replica() in reporting views and commands
+    'REPLICA_ALIAS': 'replica',
+    # Per-app overrides; chat reads its own writes on the primary
+    'APP_READ_ALIASES': {
+        'chat': 'default',
+    },
 }
 
 
@@ -142,24 +168,21 @@ STATICFILES_DIRS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Files the app generates itself, such as the trained recommender; not served
+DATA_DIR = Path(os.environ.get('AURA_DATA_DIR', BASE_DIR / 'data'))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Caching
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
-        'TIMEOUT': 300,
-        'OPTIONS': {
-            'MAX_ENTRIES': 1000,
-        }
-    }
-}
+# Built from AURA_CACHE_URL, see aura_project/cache_config.py. Use Redis or
+# Memcached whenever more than one worker runs.
+CACHES = cache_settings()
 
 # Session configuration
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
 SESSION_COOKIE_AGE = 86400  # 24 hours
 SESSION_SAVE_EVERY_REQUEST = True
 SESSION_EXPIRE_AT_BROWSER_CLOSE = False
@@ -199,6 +222,16 @@ LOGGING = {
             'class': 'logging.StreamHandler',
             'formatter': 'simple',
         },
+        # Persists to admin_panel.SystemLogs from a background thread
+        'database': {
+            'level': 'WARNING',
+            'class': 'admin_panel.log_handlers.SystemLogsQueueHandler',
+            'queue_size': 10000,
+            'batch_size': 100,
+            'flush_interval': 2.0,
+            # Records the database refused after retrying, instead of dropping them
+            'spill_file': BASE_DIR / 'logs' / 'systemlogs_spill.log',
+        },
     },
     'root': {
         'handlers': ['console', 'file'] if not DEBUG else ['console'],
@@ -211,12 +244,12 @@ LOGGING = {
             'propagate': False,
         },
         'ai_engine': {
-            'handlers': ['console', 'file'] if not DEBUG else ['console'],
+            'handlers': (['console', 'file'] if not DEBUG else ['console']) + ['database'],
             'level': 'DEBUG' if DEBUG else 'INFO',
             'propagate': False,
         },
         'chat': {
-            'handlers': ['console', 'file'] if not DEBUG else ['console'],
+            'handlers': (['console', 'file'] if not DEBUG else ['console']) + ['database'],
             'level': 'DEBUG' if DEBUG else 'INFO',
             'propagate': False,
         },
@@ -253,6 +286,13 @@ AURA_SETTINGS = {
     'SESSION_TIMEOUT': 3600,  # 1 hour
     'MAX_CONCURRENT_CONNECTIONS': 1000,
     'AI_RESPONSE_TIMEOUT': 10,  # seconds
+    'AI_RESPONSE_WORKERS': 4,  # threads answering chat messages; 0 answers on the shared database thread
     'ENABLE_ANALYTICS': True,
     'ENABLE_NOTIFICATIONS': True,
+    'METRICS_GAUGE_INTERVAL': 60,  # seconds between refreshes of scan-based gauges
+    'HEALTH_PROBE_TTL': 5,  # seconds readiness probe results are reused
+    'PROFILER_CHECK_INTERVAL': 10,  # seconds between checks of the profiler switch
+    'PROFILER_SAMPLE_INTERVAL': 0.005,  # seconds between stack samples
+    'RECOMMENDER_CF_WEIGHT': 0.5,  # share of collaborative filtering in blended recommendations
+    'RECOMMENDER_MODEL_PATH': DATA_DIR / 'recommender.npz',  # written by train_recommender
 }
@@ -0,0 +1,224 @@
+"""
+Test helpers shared by the app test suites and the benchmarks.
+"""
+from contextlib import ExitStack, contextmanager
+from io import StringIO
+from types import SimpleNamespace
+from unittest import mock
+import json
+import time
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, reset_queries
+from django.http.response import HttpResponseBase
+from django.template import TemplateDoesNotExist
+from django.template.loader import get_template
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from aura_project.query_budgets import QUERY_BUDGETS
+
+# Modules whose in-process caches refresh on a timer
+THROTTLED_MODULES = (
+    'admin_panel.counters',
+    'admin_panel.maintenance',
+    'admin_panel.settings_registry',
+    'ai_engine.collaborative',
+    'ai_engine.feed',
+    'ai_engine.topics',
+    'aura_project.caching',
+    'chat.monitoring',
+    'chat.profiling',
+)
+
+# Pages whose template is not part of the repository yet. The views build
+# their whole context eagerly, so an empty template still measures their work.
+STUB_TEMPLATES = {
+    'about.html': '',
+    'features.html': '',
+    'admin_panel/analytics.html': '',
+    'admin_panel/event_management.html': '',
+    'admin_panel/maintenance_mode.html': '',
+    'admin_panel/system_settings.html': '',
+}
+
+
+def missing_template_settings(stubs=None):
+    """
+    Settings overrides serving ``stubs`` (name -> source) for the templates
+    that don't exist; empty when all of them do.
+    """
+    missing = {}
+    for name, source in (STUB_TEMPLATES if stubs is None else stubs).items():
+        try:
+            get_template(name)
+        except TemplateDoesNotExist:
+            missing[name] = source
+    if not missing:
+        return {}
+
+    templates = [dict(engine) for engine in settings.TEMPLATES]
+    engine = templates[0]
+    engine['APP_DIRS'] = False
+    engine['OPTIONS'] = {
+        **engine.get('OPTIONS', {}),
+        'loaders': [
+            ('django.template.loaders.locmem.Loader', missing),
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ],
+    }
+    return {'TEMPLATES': templates}
+
+
+def inline_counter_flushes():
+    """
+    Keep UserManagement counter flushes on the test thread. The background
+    flush would write through its own connection, outside the test transaction.
+    """
+    return mock.patch('admin_panel.counters._schedule_flush')
+
+
+@contextmanager
+def frozen_clocks():
+    """
+    Stop the clocks of THROTTLED_MODULES so no periodic refresh fires while
+    a query count is being compared. asyncio keeps the real clock.
+    """
+    frozen = SimpleNamespace(
+        monotonic=lambda now=time.monotonic(): now,
+        time=lambda now=time.time(): now,
+        perf_counter=time.perf_counter,
+        sleep=time.sleep,
+    )
+    with ExitStack() as stack:
+        for module in THROTTLED_MODULES:
+            stack.enter_context(mock.patch(f'{module}.time', frozen))
+        yield
+
+
+class QueryBudgetTestCase(TestCase):
+    """
+    Checks endpoints and WebSocket handlers against QUERY_BUDGETS.
+
+    ``assertWithinQueryBudgets`` runs every case at each size in GROWTH_STEPS,
+    growing the load fixture in between. A case fails when it issues more
+    queries than its budget, or a different number at different sizes.
+    """
+
+    # generate_load_fixture counts added before each measurement round
+    GROWTH_STEPS = [
+        {'users': 4, 'speakers': 2, 'sessions': 6, 'events': 3, 'chat_sessions': 6,
+         'messages': 40, 'activities': 20, 'interactions': 20},
+        {'users': 16, 'speakers': 6, 'sessions': 24, 'events': 9, 'chat_sessions': 40,
+         'messages': 240, 'activities': 120, 'interactions': 120},
+    ]
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.enterClassContext(inline_counter_flushes())
+        overrides = missing_template_settings()
+        if overrides:
+            cls.enterClassContext(override_settings(**overrides))
+
+    def grow(self, step, counts):
+        from ai_engine import collaborative
+
+        call_command('generate_load_fixture', prefix=f'budget{step}', seed=step, stdout=StringIO(), **counts)
+        # Recommendations are served from snapshots the scheduled job keeps filled
+        if collaborative.available():
+            call_command('precompute_recommendations', stdout=StringIO())
+
+    def count_queries(self, case):
+        """
+        The queries issued by ``case()`` with cold caches, after one warm-up call.
+        Responses must not be errors; a case may instead return its own
+        CaptureQueriesContext to count only part of what it does.
+        """
+        from admin_panel import counters
+
+        with frozen_clocks():
+            case()
+            counters.flush()
+            cache.clear()
+            # Requests reset the query log when they start, so start from empty
+            reset_queries()
+            with CaptureQueriesContext(connection) as queries:
+                result = case()
+        if isinstance(result, HttpResponseBase):
+            self.assertLess(result.status_code, 400, f"{case} failed with {result.status_code}")
+        # Cases can capture a narrower window themselves. The log is reset by
+        # the next request, so copy the queries out now.
+        return (result if isinstance(result, CaptureQueriesContext) else queries).captured_queries
+
+    def assertWithinQueryBudgets(self, cases):
+        observed = {name: [] for name in cases}
+        for step, counts in enumerate(self.GROWTH_STEPS):
+            self.grow(step, counts)
+            for name, case in cases.items():
+                observed[name].append(self.count_queries(case))
+
+        for name, runs in observed.items():
+            # Variants of one endpoint, e.g. 'ws:message[help]', share its budget
+            budget_name = name.partition('[')[0]
+            with self.subTest(case=name):
+                self.assertIn(budget_name, QUERY_BUDGETS, f"{budget_name} has no entry in QUERY_BUDGETS")
+                budget = QUERY_BUDGETS[budget_name]
+                counts = [len(queries) for queries in runs]
+                sql = '\n'.join(f"  {query['sql']}" for query in runs[-1])
+                self.assertLessEqual(
+                    max(counts), budget,
+                    f"{name} ran {max(counts)} queries, budget is {budget}:\n{sql}"
+                )
+                self.assertEqual(
+                    len(set(counts)), 1,
+                    f"{name} query count grows with the data: {counts}\n{sql}"
+                )
+
+
+def websocket_case(user, message=None, reply=True):
+    """
+    A count_queries case that connects ``user`` to the chat consumer and,
+    when ``message`` is given, sends it. Only the connect handshake or the
+    message round trip is counted, not the rest of the session. The chatbot
+    answers on the test thread, whose connection sees the test's data.
+    """
+    from channels.testing import WebsocketCommunicator
+    from chat.consumers import ChatConsumer
+
+    async def run():
+        communicator = WebsocketCommunicator(ChatConsumer.as_asgi(), '/ws/chat/')
+        communicator.scope['user'] = user
+        # Handlers reach the database from the test thread, so the capture
+        # has to be opened and closed there too
+        queries = CaptureQueriesContext(connection)
+        if message is not None:
+            await communicator.connect()
+            await communicator.receive_from(timeout=10)
+
+        await sync_to_async(queries.__enter__)()
+        if message is None:
+            await communicator.connect()
+            await communicator.receive_from(timeout=10)
+        else:
+            text = message if isinstance(message, str) else json.dumps(message)
+            await communicator.send_to(text_data=text)
+            if reply:
+                await communicator.receive_from(timeout=10)
+            else:
+                assert await communicator.receive_nothing(timeout=0.2)
+        await sync_to_async(queries.__exit__)(None, None, None)
+
+        await communicator.disconnect()
+        return queries
+
+    def case():
+        inline = {**settings.AURA_SETTINGS, 'AI_RESPONSE_WORKERS': 0}
+        with override_settings(AURA_SETTINGS=inline):
+            return async_to_sync(run)()
+
+    return case
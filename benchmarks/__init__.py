@@ -0,0 +1,12 @@
+"""
+Benchmarks for AURA's hot paths.
+
+Each benchmark runs against a fresh test database filled by the
+generate_load_fixture command and records wall time and query counts:
+
+    python -m benchmarks.run --size small --output results.json
+    python -m benchmarks.compare baseline.json results.json
+
+benchmarks.sqlite_writers separately stresses the SQLite connection
+settings with concurrent chat writers.
+"""
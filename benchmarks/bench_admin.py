@@ -0,0 +1,27 @@
+from django.core.management import call_command
+from django.urls import reverse
+from benchmarks.registry import benchmark
+from chat.analytics import top_active_users
+import io
+
+
+@benchmark('admin_panel.analytics_dashboard', params={'7d': 7, '30d': 30})
+def analytics_dashboard(ctx, days):
+    response = ctx.admin_client.get(reverse('admin_panel:analytics'), {'days': days})
+    assert response.status_code == 200, response.status_code
+
+
+@benchmark('admin_panel.export_data', params={'users': 'users', 'events': 'events', 'logs': 'logs'})
+def export_data(ctx, export_type):
+    response = ctx.admin_client.get(reverse('admin_panel:export_data'), {'type': export_type})
+    assert response.status_code == 200, response.status_code
+
+
+@benchmark('chat.top_active_users', params={'messages': 'messages', 'sessions': 'sessions'})
+def active_users(ctx, order_by):
+    top_active_users(limit=10, order_by=order_by)
+
+
+@benchmark('chat.cleanup_old_data', params={'dry_run': True, 'delete': False}, repeat=3, rollback=True)
+def cleanup_old_data(ctx, dry_run):
+    call_command('cleanup_old_data', days=7, dry_run=dry_run, stdout=io.StringIO())
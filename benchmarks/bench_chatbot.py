@@ -0,0 +1,29 @@
+from ai_engine import chatbot
+from ai_engine.recommendation import get_session_recommendations
+from benchmarks.registry import benchmark
+
+INTENT_MESSAGES = {
+    'recommendation': 'Can you recommend some sessions for me?',
+    'schedule': "What's on the agenda today?",
+    'speaker': 'Who is presenting?',
+    'location': 'Where is the main hall?',
+    'networking': 'I want to network with other people',
+    'help': 'I need some help',
+    'appreciation': 'Thanks, that was great!',
+    'general': 'Tell me about the conference',
+}
+
+
+@benchmark('chatbot.get_response', params=INTENT_MESSAGES)
+def get_response(ctx, message):
+    chatbot.get_response(message, ctx.user)
+
+
+@benchmark('chatbot.get_live_feed')
+def get_live_feed(ctx):
+    chatbot.get_live_feed(ctx.user)
+
+
+@benchmark('recommendation.get_session_recommendations')
+def session_recommendations(ctx):
+    list(get_session_recommendations(ctx.profile.id))
@@ -0,0 +1,21 @@
+from django.urls import reverse
+from benchmarks.registry import benchmark
+
+
+@benchmark('chat.health_check', clear_cache=False)
+def health_check(ctx):
+    ctx.client.get(reverse('chat:health_check'))
+
+
+@benchmark('chat.health_deep')
+def health_deep(ctx):
+    ctx.client.get(reverse('chat:health_deep'))
+
+
+@benchmark('chat.system_metrics', params={'cold': True, 'warm': False}, clear_cache=False)
+def system_metrics(ctx, cold):
+    if cold:
+        from django.core.cache import cache
+        from chat.monitoring import ACTIVITY_GAUGES_KEY
+        cache.delete(ACTIVITY_GAUGES_KEY)
+    ctx.client.get(reverse('chat:system_metrics'))
@@ -0,0 +1,29 @@
+from pathlib import Path
+import tempfile
+
+from ai_engine import collaborative, snapshots
+from benchmarks.registry import benchmark
+
+
+def _served_model(ctx):
+    """A model trained once on the fixture and served from a private file"""
+    if not hasattr(ctx, 'recommender'):
+        path = Path(tempfile.mkdtemp()) / 'recommender.npz'
+        collaborative.save(collaborative.fit(*collaborative.load_interactions()), path)
+        ctx.recommender = collaborative.CollaborativeModel(path)
+    return ctx.recommender
+
+
+@benchmark('collaborative.train', repeat=3)
+def train(ctx):
+    collaborative.fit(*collaborative.load_interactions())
+
+
+@benchmark('collaborative.recommend')
+def recommend(ctx):
+    _served_model(ctx).recommend(ctx.profile.id, 30)
+
+
+@benchmark('snapshots.precompute', repeat=1, rollback=True)
+def precompute(ctx):
+    snapshots.precompute()
@@ -0,0 +1,48 @@
+"""
+Compare two benchmark result files.
+
+    python -m benchmarks.compare baseline.json results.json [--threshold 1.2]
+
+Prints the median time and query count change for every case present in
+both files and exits with status 1 if any case got slower than the threshold
+ratio or runs more queries.
+"""
+import argparse
+import json
+import sys
+
+
+def _load(path):
+    with open(path) as handle:
+        return {
+            (result['name'], result['size']): result
+            for result in json.load(handle)['results']
+            if 'error' not in result
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare two benchmark result files')
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help='Median time ratio counted as a regression (default: 1.2)')
+    args = parser.parse_args(argv)
+
+    baseline, current = _load(args.baseline), _load(args.current)
+    regressions = 0
+    print(f"{'case':<55} {'size':<7} {'before':>10} {'after':>10} {'ratio':>7} {'queries':>15}")
+    for key in sorted(baseline.keys() & current.keys()):
+        before, after = baseline[key], current[key]
+        ratio = after['median_s'] / before['median_s'] if before['median_s'] else float('inf')
+        regressed = ratio > args.threshold or after['queries'] > before['queries']
+        regressions += regressed
+        print(
+            f"{key[0]:<55} {key[1]:<7} {before['median_s'] * 1000:8.2f}ms {after['median_s'] * 1000:8.2f}ms "
+            f"{ratio:6.2f}x {before['queries']:>6} -> {after['queries']:<6}{' !' if regressed else ''}"
+        )
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
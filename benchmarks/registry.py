@@ -0,0 +1,38 @@
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+
+@dataclass
+class Benchmark:
+    name: str
+    func: Callable
+    params: dict = field(default_factory=dict)
+    repeat: Optional[int] = None
+    clear_cache: bool = True
+    rollback: bool = False
+
+    def cases(self):
+        """(case name, callable taking the context) for every parameter"""
+        if not self.params:
+            return [(self.name, self.func)]
+        return [
+            (f"{self.name}[{label}]", lambda ctx, value=value: self.func(ctx, value))
+            for label, value in self.params.items()
+        ]
+
+
+BENCHMARKS = []
+
+
+def benchmark(name, params=None, repeat=None, clear_cache=True, rollback=False):
+    """
+    Register a benchmark. The function receives the run context (and the
+    parameter value when ``params`` is given) and is timed as a whole.
+    ``clear_cache`` empties the cache before every round so each round
+    measures the cold path; ``rollback`` undoes the database writes of each
+    round.
+    """
+    def decorator(func):
+        BENCHMARKS.append(Benchmark(name, func, params or {}, repeat, clear_cache, rollback))
+        return func
+    return decorator
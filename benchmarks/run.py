@@ -0,0 +1,193 @@
+"""
+Run the benchmark suite and write the results as JSON.
+
+    python -m benchmarks.run --size small --size medium --output results.json
+
+Every size gets its own test database, filled once by generate_load_fixture.
+For each benchmark case one untimed round records the query count, then
+``--repeat`` timed rounds are summarised (min, median, mean, max).
+"""
+from contextlib import ExitStack
+from pathlib import Path
+import argparse
+import datetime
+import importlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+BENCH_MODULES = [
+    'benchmarks.bench_chatbot',
+    'benchmarks.bench_admin',
+    'benchmarks.bench_monitoring',
+    'benchmarks.bench_recommender',
+]
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+class Context:
+    """What benchmarks get to work with: a busy attendee and logged-in clients"""
+
+    def __init__(self, size):
+        from django.contrib.auth.models import User
+        from django.db.models import Count
+        from django.test import Client
+        from attendees.models import AttendeeProfile
+
+        self.size = size
+        busiest = (
+            AttendeeProfile.objects.annotate(sessions=Count('user__chatsession'))
+            .order_by('-sessions').select_related('user').first()
+        )
+        self.profile = busiest
+        self.user = busiest.user
+
+        self.admin_user = User.objects.create_superuser('bench_admin', 'bench@example.com', 'bench')
+        self.admin_client = Client()
+        self.admin_client.force_login(self.admin_user)
+        self.client = Client()
+
+
+def _run_round(case, bench, ctx):
+    from django.core.cache import cache
+    from django.db import transaction
+
+    if bench.clear_cache:
+        cache.clear()
+    if bench.rollback:
+        with transaction.atomic():
+            start = time.perf_counter()
+            case(ctx)
+            elapsed = time.perf_counter() - start
+            transaction.set_rollback(True)
+        return elapsed
+    start = time.perf_counter()
+    case(ctx)
+    return time.perf_counter() - start
+
+
+def run_size(size, args, benchmarks):
+    from django.core.management import call_command
+    from django.test import override_settings
+    from django.test.runner import DiscoverRunner
+    from django.test.utils import setup_test_environment, teardown_test_environment
+    from aura_project.testing import missing_template_settings
+
+    setup_test_environment()
+    runner = DiscoverRunner(verbosity=0, interactive=False)
+    old_config = runner.setup_databases()
+    results = []
+    try:
+        print(f"Generating {size} fixture...", file=sys.stderr)
+        started = time.monotonic()
+        call_command('generate_load_fixture', size=size, seed=args.seed, stdout=io.StringIO())
+        print(f"  done in {time.monotonic() - started:.1f}s", file=sys.stderr)
+
+        with override_settings(**missing_template_settings()):
+            ctx = Context(size)
+            for bench in benchmarks:
+                for name, case in bench.cases():
+                    if args.filter and args.filter not in name:
+                        continue
+                    results.append(_run_case(name, case, bench, ctx, size, args))
+    finally:
+        runner.teardown_databases(old_config)
+        teardown_test_environment()
+    return results
+
+
+def _run_case(name, case, bench, ctx, size, args):
+    from django.core.cache import cache
+    from django.db import connections, reset_queries
+    from django.test.utils import CaptureQueriesContext
+
+    if bench.clear_cache:
+        cache.clear()
+    try:
+        # Requests reset the query log when they start, so start from empty
+        reset_queries()
+        # Reads may be routed to another alias; count every connection
+        with ExitStack() as stack:
+            captures = [stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in connections]
+            _run_round(case, bench, ctx)
+        timings = [_run_round(case, bench, ctx) for _ in range(bench.repeat or args.repeat)]
+    except Exception as e:
+        print(f"  {name:<55} FAILED: {e!r}", file=sys.stderr)
+        return {'name': name, 'size': size, 'error': repr(e)}
+
+    result = {
+        'name': name,
+        'size': size,
+        'rounds': len(timings),
+        'queries': sum(len(queries) for queries in captures),
+        'min_s': min(timings),
+        'median_s': statistics.median(timings),
+        'mean_s': statistics.fmean(timings),
+        'max_s': max(timings),
+    }
+    print(
+        f"  {name:<55} {result['median_s'] * 1000:10.2f} ms  {result['queries']:6d} queries",
+        file=sys.stderr
+    )
+    return result
+
+
+def _environment():
+    import django
+    from django.db import connection
+
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'machine': platform.machine(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the AURA benchmark suite')
+    parser.add_argument('--size', action='append', choices=['small', 'medium', 'large'],
+                        help='Fixture size; repeat for several (default: small)')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed rounds per case (default: 5)')
+    parser.add_argument('--filter', help='Only run cases whose name contains this text')
+    parser.add_argument('--seed', type=int, default=42, help='Fixture random seed (default: 42)')
+    parser.add_argument('--output', help='Write JSON results to this file instead of stdout')
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, str(REPO_ROOT))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'aura_project.settings')
+    import django
+    django.setup()
+
+    from benchmarks.registry import BENCHMARKS
+    for module in BENCH_MODULES:
+        importlib.import_module(module)
+
+    results = []
+    for size in args.size or ['small']:
+        results.extend(run_size(size, args, BENCHMARKS))
+
+    report = json.dumps({'environment': _environment(), 'results': results}, indent=2)
+    if args.output:
+        Path(args.output).write_text(report + '\n')
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        print(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,213 @@
+"""
+Concurrent-writer stress test for the SQLite connection settings.
+
+    python -m benchmarks.sqlite_writers --writers 8 --readers 4 --seconds 5
+
+Each configuration gets a fresh database file. Writer threads repeat the
+chat hot path: an activity row, then a transaction that reads the chat
+session, adds a message and touches the session. Reader threads count
+messages meanwhile. Throughput and "database is locked" errors are reported
+for Django's stock SQLite settings and for the tuned ones in settings.py.
+Exits with status 1 if the tuned settings still hit lock errors.
+"""
+from pathlib import Path
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _configurations():
+    from django.conf import settings
+
+    return {
+        'django-default': {
+            'write': {'ENGINE': 'django.db.backends.sqlite3', 'OPTIONS': {}},
+            'read': {'ENGINE': 'django.db.backends.sqlite3', 'OPTIONS': {}},
+        },
+        'tuned': {
+            'write': {'ENGINE': settings.DATABASES['default']['ENGINE'],
+                      'OPTIONS': settings.DATABASES['default'].get('OPTIONS', {})},
+            'read': {'ENGINE': settings.DATABASES['read']['ENGINE'],
+                     'OPTIONS': settings.DATABASES['read'].get('OPTIONS', {})},
+        },
+    }
+
+
+def _register(alias, config, path):
+    from django.conf import settings
+    from django.db import connections
+
+    connections.settings[alias] = connections.configure_settings({
+        **settings.DATABASES, alias: {**config, 'NAME': path},
+    })[alias]
+
+
+def _create_schema(alias):
+    from django.contrib.auth.models import User
+    from django.db import connections
+    from chat.models import ChatMessage, ChatSession, UserActivity
+
+    with connections[alias].schema_editor() as editor:
+        for model in (User, ChatSession, ChatMessage, UserActivity):
+            editor.create_model(model)
+    user = User.objects.using(alias).create(username='stress')
+    return user.id, [
+        ChatSession.objects.using(alias).create(user_id=user.id, session_id=f'stress-{i}').id
+        for i in range(32)
+    ]
+
+
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.writes = 0
+        self.reads = 0
+        self.lock_errors = 0
+        self.other_errors = 0
+        self.write_latencies = []
+
+    def add(self, **counts):
+        with self.lock:
+            for name, value in counts.items():
+                if name == 'write_latencies':
+                    self.write_latencies.extend(value)
+                else:
+                    setattr(self, name, getattr(self, name) + value)
+
+
+def _is_lock_error(error):
+    return 'locked' in str(error) or 'busy' in str(error)
+
+
+def _writer(alias, user_id, session_id, deadline, stats):
+    from django.db import OperationalError, connections, transaction
+    from django.utils import timezone
+    from chat.models import ChatMessage, ChatSession, UserActivity
+
+    writes = lock_errors = other_errors = 0
+    latencies = []
+    n = 0
+    try:
+        while time.monotonic() < deadline:
+            n += 1
+            start = time.perf_counter()
+            try:
+                # bulk_create keeps signal handlers away from the real database
+                UserActivity.objects.using(alias).bulk_create([
+                    UserActivity(user_id=user_id, activity_type='user_message', activity_data={'n': n})
+                ])
+                with transaction.atomic(using=alias):
+                    session = ChatSession.objects.using(alias).get(id=session_id)
+                    ChatMessage.objects.using(alias).bulk_create([
+                        ChatMessage(session=session, message_type='user', content=f'Message {n}')
+                    ])
+                    ChatSession.objects.using(alias).filter(id=session_id).update(last_activity=timezone.now())
+            except OperationalError as e:
+                if _is_lock_error(e):
+                    lock_errors += 1
+                else:
+                    other_errors += 1
+                continue
+            writes += 1
+            latencies.append(time.perf_counter() - start)
+    finally:
+        connections[alias].close()
+    stats.add(writes=writes, lock_errors=lock_errors, other_errors=other_errors, write_latencies=latencies)
+
+
+def _reader(alias, session_ids, deadline, stats):
+    from django.db import OperationalError, connections
+    from chat.models import ChatMessage
+
+    reads = lock_errors = other_errors = 0
+    i = 0
+    try:
+        while time.monotonic() < deadline:
+            i += 1
+            try:
+                ChatMessage.objects.using(alias).filter(session_id=session_ids[i % len(session_ids)]).count()
+            except OperationalError as e:
+                if _is_lock_error(e):
+                    lock_errors += 1
+                else:
+                    other_errors += 1
+                continue
+            reads += 1
+    finally:
+        connections[alias].close()
+    stats.add(reads=reads, lock_errors=lock_errors, other_errors=other_errors)
+
+
+def run_configuration(name, config, args):
+    from django.db import connections
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'stress.sqlite3')
+        write_alias, read_alias = f'stress-{name}', f'stress-{name}-read'
+        _register(write_alias, config['write'], path)
+        _register(read_alias, config['read'], path)
+        user_id, session_ids = _create_schema(write_alias)
+        connections[write_alias].close()
+
+        stats = Stats()
+        deadline = time.monotonic() + args.seconds
+        threads = [
+            threading.Thread(target=_writer, args=(write_alias, user_id, session_ids[i % len(session_ids)], deadline, stats))
+            for i in range(args.writers)
+        ] + [
+            threading.Thread(target=_reader, args=(read_alias, session_ids, deadline, stats))
+            for _ in range(args.readers)
+        ]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+
+    latencies = sorted(stats.write_latencies) or [0.0]
+    return {
+        'name': name,
+        'writes_per_s': stats.writes / elapsed,
+        'reads_per_s': stats.reads / elapsed,
+        'lock_errors': stats.lock_errors,
+        'other_errors': stats.other_errors,
+        'write_p50_ms': statistics.median(latencies) * 1000,
+        'write_p99_ms': latencies[int(len(latencies) * 0.99)] * 1000,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Stress SQLite with concurrent chat writers')
+    parser.add_argument('--writers', type=int, default=8, help='Writer threads (default: 8)')
+    parser.add_argument('--readers', type=int, default=4, help='Reader threads (default: 4)')
+    parser.add_argument('--seconds', type=float, default=5, help='Duration per configuration (default: 5)')
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, str(REPO_ROOT))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'aura_project.settings')
+    import django
+    django.setup()
+
+    results = [run_configuration(name, config, args) for name, config in _configurations().items()]
+
+    print(f"{'configuration':<16} {'writes/s':>10} {'reads/s':>10} {'lock errors':>12} "
+          f"{'other errors':>13} {'write p50':>10} {'write p99':>10}")
+    for r in results:
+        print(f"{r['name']:<16} {r['writes_per_s']:10.1f} {r['reads_per_s']:10.1f} {r['lock_errors']:12d} "
+              f"{r['other_errors']:13d} {r['write_p50_ms']:8.2f}ms {r['write_p99_ms']:8.2f}ms")
+
+    baseline, tuned = results
+    if baseline['writes_per_s']:
+        print(f"\nWrite throughput: {tuned['writes_per_s'] / baseline['writes_per_s']:.1f}x the default settings")
+    return 1 if tuned['lock_errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -14,8 +14,9 @@ class ChatSessionAdmin(admin.ModelAdmin):
     date_hierarchy = 'created_at'
     
     def message_count(self, obj):
-        return obj.messages.count()
+        return obj.msg_count
     message_count.short_description = 'Messages'
+    message_count.admin_order_field = 'msg_count'
     
     def session_duration(self, obj):
         if obj.last_activity and obj.created_at:
@@ -37,6 +38,7 @@ class ChatMessageAdmin(admin.ModelAdmin):
     search_fields = ['content', 'session__user__username', 'session__user__email']
     readonly_fields = ['timestamp', 'message_length']
     date_hierarchy = 'timestamp'
+    list_select_related = ['session__user']
     
     def session_user(self, obj):
         return obj.session.user.username
@@ -0,0 +1,129 @@
+"""
+Global ceiling on concurrent WebSocket connections.
+
+Each worker publishes how many sockets it holds under its own cache key,
+which expires LEASE_SECONDS after the last refresh. A heartbeat thread
+refreshes it while the worker has connections, so the slots of a worker
+that crashed or was redeployed free themselves instead of leaking. The
+global count is the sum over the workers registered in WORKERS_KEY.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from admin_panel import settings_registry
+from uuid import uuid4
+import logging
+import os
+import socket
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Shared across workers whenever the cache backend is (Redis, Memcached)
+WORKERS_KEY = 'aura:ws:workers'
+WORKER_KEY_PREFIX = 'aura:ws:connections:'
+
+# Seconds a worker's count outlives its last heartbeat, and between heartbeats
+LEASE_SECONDS = 60
+HEARTBEAT_SECONDS = 20
+
+# Seconds a rejected client should wait before reconnecting
+RETRY_AFTER_SECONDS = 15
+
+WORKER_ID = f'{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}'
+
+_lock = threading.Lock()
+_count = 0
+_heartbeat = None
+
+
+def get_connection_limit():
+    """Maximum number of concurrent WebSocket connections"""
+    default = settings.AURA_SETTINGS.get('MAX_CONCURRENT_CONNECTIONS', 1000)
+    return settings_registry.registry.get_int('max_concurrent_connections', default)
+
+
+def get_connection_count():
+    """Current number of admitted WebSocket connections, over every live worker"""
+    workers = cache.get(WORKERS_KEY) or {}
+    counts = cache.get_many([WORKER_KEY_PREFIX + worker for worker in workers])
+    return sum(counts.values())
+
+
+def acquire_connection_slot():
+    """
+    Try to reserve a connection slot.
+    Returns True if the connection is admitted, False if the ceiling is hit.
+    """
+    global _count
+    limit = get_connection_limit()
+    if not limit:
+        return True
+
+    with _lock:
+        try:
+            # Other workers may admit at the same moment; the ceiling is soft
+            full = get_connection_count() >= limit
+        except Exception as e:
+            # Never refuse connections because the cache is unavailable
+            logger.error(f"Connection counter unavailable: {e}")
+            full = False
+        if full:
+            logger.warning(f"Connection ceiling reached ({limit}), rejecting new socket")
+            return False
+
+        # Counted whatever the cache does, so release_connection_slot() stays symmetric
+        _count += 1
+        try:
+            _publish()
+        except Exception as e:
+            logger.error(f"Connection counter unavailable: {e}")
+        _start_heartbeat()
+    return True
+
+
+def release_connection_slot():
+    """Release a slot previously reserved with acquire_connection_slot()"""
+    global _count
+    with _lock:
+        _count = max(_count - 1, 0)
+        try:
+            _publish()
+        except Exception as e:
+            logger.error(f"Error releasing connection slot: {e}")
+
+
+def _publish():
+    """Store this worker's count with a fresh lease, registering the worker if needed"""
+    cache.set(WORKER_KEY_PREFIX + WORKER_ID, _count, timeout=LEASE_SECONDS)
+
+    now = time.time()
+    workers = cache.get(WORKERS_KEY) or {}
+    if workers.get(WORKER_ID, 0) - now > LEASE_SECONDS / 2:
+        return
+    # Registrations race between workers; a lost one comes back with the next heartbeat
+    workers = {worker: expires for worker, expires in workers.items() if expires > now}
+    workers[WORKER_ID] = now + 2 * LEASE_SECONDS
+    cache.set(WORKERS_KEY, workers, timeout=None)
+
+
+def _start_heartbeat():
+    global _heartbeat
+    if _heartbeat is None and _count:
+        _heartbeat = threading.Thread(target=_beat, name='aura-ws-heartbeat', daemon=True)
+        _heartbeat.start()
+
+
+def _beat():
+    """Refresh this worker's lease until it holds no connections"""
+    global _heartbeat
+    while True:
+        time.sleep(HEARTBEAT_SECONDS)
+        with _lock:
+            if not _count:
+                _heartbeat = None
+                return
+            try:
+                _publish()
+            except Exception as e:
+                logger.error(f"Connection heartbeat failed: {e}")
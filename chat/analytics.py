@@ -0,0 +1,105 @@
+from collections import Counter
+from django.contrib.auth.models import User
+from django.db.models import Count
+from chat.models import ChatSession, ChatMessage
+
+
+def _session_counts(since=None):
+    sessions = ChatSession.objects.all()
+    if since is not None:
+        sessions = sessions.filter(created_at__gte=since)
+    return sessions.values('user_id').annotate(count=Count('id')).order_by()
+
+
+def _message_counts(since=None):
+    messages = ChatMessage.objects.filter(message_type='user')
+    if since is not None:
+        messages = messages.filter(timestamp__gte=since)
+    return messages.values('session__user_id').annotate(count=Count('id')).order_by()
+
+
+def _counts_for(user_ids, since=None):
+    """
+    {user id: session count} and {user id: messages sent} for a few users.
+    All-time message counts come from the UserManagement counters. Within a
+    window, messages are counted per session through the (session,
+    message_type) index; joining sessions instead lets SQLite scan every
+    user message.
+    """
+    from admin_panel.models import UserManagement
+
+    sessions = list(ChatSession.objects.filter(user_id__in=user_ids).values_list('id', 'user_id', 'created_at'))
+    session_counts = Counter(
+        user_id for _, user_id, created_at in sessions if since is None or created_at >= since
+    )
+    if since is None:
+        return session_counts, dict(
+            UserManagement.objects.filter(user_id__in=user_ids).values_list('user_id', 'total_chat_messages')
+        )
+
+    messages = ChatMessage.objects.filter(
+        message_type='user', session_id__in=ChatSession.objects.filter(user_id__in=user_ids).values('id')
+    )
+    if since is not None:
+        messages = messages.filter(timestamp__gte=since)
+    owners = {session_id: user_id for session_id, user_id, _ in sessions}
+    message_counts = Counter()
+    for session_id, count in messages.values_list('session_id').annotate(count=Count('id')).order_by():
+        message_counts[owners[session_id]] += count
+    return session_counts, message_counts
+
+
+def _ranked_by_counter(limit):
+    """User ids ranked by the UserManagement message counter (indexed)"""
+    from admin_panel.models import UserManagement
+
+    return list(
+        UserManagement.objects.filter(total_chat_messages__gt=0)
+        .order_by('-total_chat_messages')
+        .values_list('user_id', flat=True)[:limit]
+    )
+
+
+def top_active_users(limit=10, since=None, order_by='messages'):
+    """
+    Most active chat users with their session and message counts.
+
+    Sessions and messages are counted in separate grouped queries, so counts
+    are not multiplied by a sessions x messages join. message_count is the
+    number of messages the user sent. Without ``since`` the ranking by messages
+    comes from the UserManagement counter index instead of a table scan.
+
+    Returns a list of dicts with user_id, username, session_count and
+    message_count, ordered by ``order_by`` ('messages' or 'sessions').
+    """
+    if order_by == 'messages':
+        ranked_ids = _ranked_by_counter(limit) if since is None else []
+        if not ranked_ids:
+            ranked_ids = [
+                row['session__user_id']
+                for row in _message_counts(since=since).order_by('-count')[:limit]
+            ]
+    elif order_by == 'sessions':
+        ranked_ids = [
+            row['user_id']
+            for row in _session_counts(since=since).order_by('-count')[:limit]
+        ]
+    else:
+        raise ValueError(f"Unknown ordering: {order_by}")
+
+    session_counts, message_counts = _counts_for(ranked_ids, since)
+    usernames = dict(User.objects.filter(id__in=ranked_ids).values_list('id', 'username'))
+
+    results = [
+        {
+            'user_id': user_id,
+            'username': usernames.get(user_id, ''),
+            'session_count': session_counts.get(user_id, 0),
+            'message_count': message_counts.get(user_id, 0),
+        }
+        for user_id in ranked_ids
+    ]
+    # Counter-based rankings can lag behind by the flush interval
+    sort_key = 'message_count' if order_by == 'messages' else 'session_count'
+    results.sort(key=lambda row: row[sort_key], reverse=True)
+    return results
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class ChatConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'chat'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from chat import metrics, signals  # noqa: F401
+
+        connection_created.connect(metrics.install_query_observer, dispatch_uid='chat.metrics.query_observer')
@@ -1,17 +1,44 @@
 import json
 import asyncio
+import contextvars
+import functools
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
 from django.utils import timezone
 from django.core.cache import cache
 from ai_engine import chatbot
+from admin_panel import maintenance
+from chat import admission, metrics, profiling
 from attendees.models import AttendeeProfile
 from chat.models import UserActivity
 from typing import Dict, Any
 
 logger = logging.getLogger(__name__)
 
+DEGRADED_RESPONSE = (
+    "I'm handling a lot of questions right now, so I couldn't finish that one in time. ⏳ "
+    "Please try again in a moment - in the meantime, the live feed has the latest sessions!"
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _ai_executor(workers):
+    """Threads answering chat messages, apart from the database thread every handler shares"""
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix='aura-ai')
+
+
+def _answer(message, user):
+    close_old_connections()
+    try:
+        return chatbot.get_response(message, user_context=user)
+    finally:
+        close_old_connections()
+
+
 class ChatConsumer(AsyncWebsocketConsumer):
     async def connect(self):
         self.user = self.scope["user"]
@@ -19,6 +46,31 @@ class ChatConsumer(AsyncWebsocketConsumer):
         self.is_typing = False
         self.last_activity = timezone.now()
         self.isConnected = False
+        self.has_slot = False
+        
+        # Turn clients away during a maintenance window
+        snapshot = await database_sync_to_async(maintenance.get_snapshot)()
+        if snapshot.blocks(self.user.id if self.user.is_authenticated else None):
+            await self.accept()
+            await self.send(text_data=json.dumps({
+                'type': 'maintenance',
+                'message': snapshot.message,
+                'retry_after': snapshot.retry_after()
+            }))
+            await self.close(code=1013)  # Try Again Later
+            return
+        
+        # Shed load once the global connection ceiling is reached
+        self.has_slot = await database_sync_to_async(admission.acquire_connection_slot)()
+        if not self.has_slot:
+            await self.accept()
+            await self.send(text_data=json.dumps({
+                'type': 'server_busy',
+                'message': "AURA is very busy right now. Reconnecting shortly...",
+                'retry_after': admission.RETRY_AFTER_SECONDS
+            }))
+            await self.close(code=1013)  # Try Again Later
+            return
         
         try:
             if self.user.is_authenticated:
@@ -87,6 +139,11 @@ class ChatConsumer(AsyncWebsocketConsumer):
 
     async def disconnect(self, close_code):
         self.isConnected = False
+        if not getattr(self, 'has_slot', False):
+            return
+        self.has_slot = False
+        await database_sync_to_async(admission.release_connection_slot)()
+        
         if self.user.is_authenticated:
             # Leave user group
             if self.user_group_name:
@@ -102,22 +159,31 @@ class ChatConsumer(AsyncWebsocketConsumer):
             await self.log_activity("chat_disconnected", {"close_code": close_code})
 
     async def receive(self, text_data):
-        try:
-            text_data_json = json.loads(text_data)
-            message_type = text_data_json.get('type', 'message')
-            
-            if message_type == 'message':
-                await self.handle_chat_message(text_data_json)
-            elif message_type == 'get_feed':
-                await self.handle_feed_request()
-            elif message_type == 'action':
-                await self.handle_action(text_data_json)
-                
-        except json.JSONDecodeError:
-            await self.send(text_data=json.dumps({
-                'type': 'error',
-                'message': 'Invalid message format'
-            }))
+        if profiling.check_due():
+            await database_sync_to_async(profiling.sync_with_settings)()
+
+        message_type = 'invalid'
+        with metrics.track() as stats:
+            try:
+                text_data_json = json.loads(text_data)
+                message_type = text_data_json.get('type', 'message')
+
+                if message_type == 'message':
+                    await self.handle_chat_message(text_data_json)
+                elif message_type == 'get_feed':
+                    await self.handle_feed_request()
+                elif message_type == 'action':
+                    await self.handle_action(text_data_json)
+                else:
+                    # Keep client-supplied types out of metric labels
+                    message_type = 'unknown'
+
+            except json.JSONDecodeError:
+                await self.send(text_data=json.dumps({
+                    'type': 'error',
+                    'message': 'Invalid message format'
+                }))
+        metrics.record('ws', message_type, stats, len(text_data or ''))
 
     async def handle_chat_message(self, data):
         message = data.get('message', '')
@@ -164,9 +230,27 @@ class ChatConsumer(AsyncWebsocketConsumer):
         # Process action as a chat message
         await self.handle_chat_message({'message': action})
 
+    async def get_ai_response(self, message):
+        """Get response from AI chatbot, falling back to a degraded answer on timeout"""
+        timeout = settings.AURA_SETTINGS.get('AI_RESPONSE_TIMEOUT')
+        workers = settings.AURA_SETTINGS.get('AI_RESPONSE_WORKERS', 4)
+        if workers:
+            # A plain executor future: on timeout it is dropped, and cancelled
+            # if still queued, while a running answer only holds its own thread
+            # run_in_executor doesn't copy contextvars; metrics.track() needs them
+            answer = asyncio.get_running_loop().run_in_executor(
+                _ai_executor(workers), contextvars.copy_context().run, _answer, message, self.user
+            )
+        else:
+            answer = self._get_ai_response(message)
+        try:
+            return await asyncio.wait_for(answer, timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"AI response timed out after {timeout}s for user {self.user.username}")
+            return DEGRADED_RESPONSE
+
     @database_sync_to_async
-    def get_ai_response(self, message):
-        """Get response from AI chatbot"""
+    def _get_ai_response(self, message):
         return chatbot.get_response(message, user_context=self.user)
 
     @database_sync_to_async
@@ -1,6 +1,8 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from datetime import timedelta
+from aura_project.db.routers import use_replica
+from chat.analytics import top_active_users
 from chat.models import ChatSession, ChatMessage, UserActivity
 from django.db.models import Count, Avg
 import json
@@ -21,6 +23,7 @@ class Command(BaseCommand):
             help='Output file path for JSON report',
         )
 
+    @use_replica()
     def handle(self, *args, **options):
         days = options['days']
         start_date = timezone.now() - timedelta(days=days)
@@ -66,12 +69,7 @@ class Command(BaseCommand):
         avg_session_duration = (total_duration / session_count / 3600) if session_count > 0 else 0
         
         # Most active users
-        top_users = ChatSession.objects.filter(
-            created_at__gte=start_date
-        ).values('user__username').annotate(
-            session_count=Count('id'),
-            message_count=Count('messages')
-        ).order_by('-session_count')[:10]
+        top_users = top_active_users(limit=10, since=start_date, order_by='sessions')
         
         # Activity patterns
         activity_stats = UserActivity.objects.filter(
@@ -116,7 +114,7 @@ class Command(BaseCommand):
         self.stdout.write(self.style.WARNING('\n--- Top 5 Users ---'))
         for user in report['top_users'][:5]:
             self.stdout.write(
-                f"{user['user__username']}: {user['session_count']} sessions, "
+                f"{user['username']}: {user['session_count']} sessions, "
                 f"{user['message_count']} messages"
             )
         
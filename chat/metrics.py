@@ -0,0 +1,278 @@
+"""
+In-process performance metrics for HTTP views and WebSocket messages.
+
+Each request or message runs inside ``track()``, which collects wall time,
+database queries and cache hits for everything executed in its context
+(including database_sync_to_async threads). The results feed log-linear
+HDR-style histograms. Together with counters incremented by the write paths
+and gauges read at scrape time they are rendered in the Prometheus or
+OpenMetrics text format.
+"""
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.utils.module_loading import import_string
+import functools
+import math
+import threading
+import time
+
+_lock = threading.Lock()
+_current_stats = ContextVar('aura_request_stats', default=None)
+
+
+class Histogram:
+    """
+    Log-linear histogram: every power of two above ``lowest`` is split into
+    ``sub_buckets`` buckets, giving a bounded relative error at any scale.
+    """
+
+    def __init__(self, lowest, octaves=32, sub_buckets=8):
+        self.lowest = lowest
+        self.octaves = octaves
+        self.sub_buckets = sub_buckets
+        self.counts = [0] * (octaves * sub_buckets + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max_index = 0
+
+    def _index(self, value):
+        if value <= self.lowest:
+            return 0
+        index = math.ceil(math.log2(value / self.lowest) * self.sub_buckets)
+        return min(index, len(self.counts) - 1)
+
+    def record(self, value):
+        index = self._index(value)
+        with _lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+            if index > self.max_index:
+                self.max_index = index
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th quantile"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return self.lowest * 2 ** (index / self.sub_buckets)
+        return self.lowest * 2 ** self.octaves
+
+    def cumulative_buckets(self):
+        """(upper bound, cumulative count) at every power of two seen so far"""
+        buckets = []
+        seen = 0
+        last_octave = math.ceil(self.max_index / self.sub_buckets)
+        for octave in range(last_octave + 1):
+            start = (octave - 1) * self.sub_buckets + 1 if octave else 0
+            seen += sum(self.counts[start:octave * self.sub_buckets + 1])
+            buckets.append((self.lowest * 2 ** octave, seen))
+        return buckets
+
+
+# name -> (help text, lowest recordable value)
+HISTOGRAMS = {
+    'aura_http_request_duration_seconds': ('Wall time per HTTP view', 0.00001),
+    'aura_http_db_queries': ('Database queries per HTTP view', 1),
+    'aura_http_db_duration_seconds': ('Database time per HTTP view', 0.00001),
+    'aura_http_response_bytes': ('Response payload size per HTTP view', 64),
+    'aura_ws_message_duration_seconds': ('Wall time per WebSocket message type', 0.00001),
+    'aura_ws_db_queries': ('Database queries per WebSocket message type', 1),
+    'aura_ws_db_duration_seconds': ('Database time per WebSocket message type', 0.00001),
+    'aura_ws_message_bytes': ('Inbound payload size per WebSocket message type', 64),
+}
+
+COUNTERS = {
+    'aura_cache_requests_total': 'Cache lookups by endpoint and result',
+    'aura_chat_sessions_created_total': 'Chat sessions created',
+    'aura_chat_messages_total': 'Chat messages logged by message type',
+    'aura_user_activities_total': 'User activities logged',
+}
+
+_histograms = defaultdict(dict)
+_counters = defaultdict(lambda: defaultdict(int))
+# name -> (help text, callable returning the current value)
+_gauges = {}
+
+
+def observe(name, value, **labels):
+    """Record a value in the histogram ``name`` for a label set"""
+    key = tuple(sorted(labels.items()))
+    series = _histograms[name]
+    histogram = series.get(key)
+    if histogram is None:
+        with _lock:
+            histogram = series.setdefault(key, Histogram(HISTOGRAMS[name][1]))
+    histogram.record(value)
+
+
+def inc(name, amount=1, **labels):
+    """Increment the counter ``name`` for a label set"""
+    key = tuple(sorted(labels.items()))
+    with _lock:
+        _counters[name][key] += amount
+
+
+def register_gauge(name, help_text, read):
+    """Expose the value returned by ``read()`` as a gauge on every scrape"""
+    _gauges[name] = (help_text, read)
+
+
+class RequestStats:
+    __slots__ = ('queries', 'db_time', 'cache_hits', 'cache_misses', 'started')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.started = time.perf_counter()
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+
+@contextmanager
+def track():
+    """Collect stats for everything executed in the current context"""
+    stats = RequestStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def record(kind, name, stats, payload_bytes=None):
+    """Feed the stats of a finished HTTP view ('http') or WebSocket message ('ws')"""
+    if kind == 'http':
+        label = {'view': name}
+        observe('aura_http_request_duration_seconds', stats.elapsed, **label)
+    else:
+        label = {'message_type': name}
+        observe('aura_ws_message_duration_seconds', stats.elapsed, **label)
+    observe(f'aura_{kind}_db_queries', stats.queries, **label)
+    observe(f'aura_{kind}_db_duration_seconds', stats.db_time, **label)
+    if payload_bytes is not None:
+        size_metric = 'aura_http_response_bytes' if kind == 'http' else 'aura_ws_message_bytes'
+        observe(size_metric, payload_bytes, **label)
+    if stats.cache_hits:
+        inc('aura_cache_requests_total', stats.cache_hits, endpoint=name, result='hit')
+    if stats.cache_misses:
+        inc('aura_cache_requests_total', stats.cache_misses, endpoint=name, result='miss')
+
+
+def query_observer(execute, sql, params, many, context):
+    """Database execute wrapper counting queries of the current request"""
+    stats = _current_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.db_time += time.perf_counter() - start
+
+
+def install_query_observer(sender, connection, **kwargs):
+    """connection_created receiver attaching query_observer to every connection"""
+    if query_observer not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_observer)
+
+
+_MISSING = object()
+
+
+class InstrumentedCacheMixin:
+    """Counts cache hits and misses of the current request"""
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version)
+        stats = _current_stats.get()
+        if stats is not None:
+            if value is _MISSING:
+                stats.cache_misses += 1
+            else:
+                stats.cache_hits += 1
+        return default if value is _MISSING else value
+
+
+@functools.lru_cache(maxsize=None)
+def _instrumented(backend):
+    return type(f'Instrumented{backend.__name__}', (InstrumentedCacheMixin, backend), {})
+
+
+class InstrumentedCache:
+    """
+    Cache backend counting hits and misses of the backend named by
+    WRAPPED_BACKEND (LocMem by default), whichever one the environment
+    configures.
+    """
+
+    def __new__(cls, location, params):
+        params = dict(params)
+        backend = import_string(params.pop('WRAPPED_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'))
+        return _instrumented(backend)(location, params)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(key, **extra):
+    labels = list(key) + list(extra.items())
+    if not labels:
+        return ''
+    rendered = ','.join(f'{name}="{_escape(value)}"' for name, value in labels)
+    return '{' + rendered + '}'
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(openmetrics=False):
+    """
+    All metrics in the Prometheus text format, or in the OpenMetrics format
+    when ``openmetrics`` is set (counter families without the _total suffix
+    and a terminating # EOF).
+    """
+    lines = []
+    for name, (help_text, read) in sorted(_gauges.items()):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} gauge')
+        lines.append(f'{name} {_format_value(read())}')
+
+    for name, help_text in COUNTERS.items():
+        series = _counters.get(name)
+        if not series:
+            continue
+        family = name[:-len('_total')] if openmetrics else name
+        lines.append(f'# HELP {family} {help_text}')
+        lines.append(f'# TYPE {family} counter')
+        for key, value in sorted(series.items()):
+            lines.append(f'{name}{_format_labels(key)} {value}')
+
+    for name, (help_text, _lowest) in HISTOGRAMS.items():
+        series = _histograms.get(name)
+        if not series:
+            continue
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} histogram')
+        for key, histogram in sorted(series.items()):
+            for bound, cumulative in histogram.cumulative_buckets():
+                lines.append(f'{name}_bucket{_format_labels(key, le=_format_value(float(bound)))} {cumulative}')
+            lines.append(f'{name}_bucket{_format_labels(key, le="+Inf")} {histogram.count}')
+            lines.append(f'{name}_sum{_format_labels(key)} {_format_value(histogram.sum)}')
+            lines.append(f'{name}_count{_format_labels(key)} {histogram.count}')
+
+    if openmetrics:
+        lines.append('# EOF')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,25 @@
+from chat import metrics, profiling
+
+
+class PerformanceMiddleware:
+    """
+    Records wall time, database queries and time, cache hits and misses and
+    response size for every view into the in-process metrics histograms.
+    Also picks up the sampling profiler switch from the system settings.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if profiling.check_due():
+            profiling.sync_with_settings()
+
+        with metrics.track() as stats:
+            response = self.get_response(request)
+
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else 'unresolved'
+        payload_bytes = None if response.streaming else len(response.content)
+        metrics.record('http', view_name, stats, payload_bytes)
+        return response
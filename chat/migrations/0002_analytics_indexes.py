@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chatmessage',
+            index=models.Index(fields=['message_type', 'timestamp'], name='chatmsg_type_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='chatsession',
+            index=models.Index(fields=['created_at'], name='chatsession_created_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0003_userpreferences_topics'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chatmessage',
+            index=models.Index(fields=['session', 'message_type'], name='chatmsg_session_type_idx'),
+        ),
+    ]
@@ -9,6 +9,11 @@ class ChatSession(models.Model):
     last_activity = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at'], name='chatsession_created_idx'),
+        ]
+    
     def __str__(self):
         return f"Chat session for {self.user.username}"
 
@@ -30,6 +35,11 @@ class ChatMessage(models.Model):
     
     class Meta:
         ordering = ['timestamp']
+        indexes = [
+            models.Index(fields=['message_type', 'timestamp'], name='chatmsg_type_time_idx'),
+            # Counts per session for a handful of users, see chat.analytics
+            models.Index(fields=['session', 'message_type'], name='chatmsg_session_type_idx'),
+        ]
     
     def __str__(self):
         return f"{self.message_type}: {self.content[:50]}..."
@@ -37,6 +47,8 @@ class ChatMessage(models.Model):
 class UserPreferences(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     preferred_topics = models.TextField(help_text="Comma-separated list of preferred topics")
+    # Derived from preferred_topics by ai_engine.topics
+    topics = models.ManyToManyField('ai_engine.Topic', blank=True, editable=False, related_name='preferences')
     notification_frequency = models.CharField(
         max_length=20,
         choices=[
@@ -1,74 +1,164 @@
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.views.decorators.http import require_http_methods
-from django.views.decorators.csrf import csrf_exempt
 from django.utils import timezone
+from django.conf import settings
 from django.db import connection
 from django.core.cache import cache
-from chat.models import ChatSession, UserActivity
 from attendees.models import AttendeeProfile
+from chat.models import ChatSession
+from chat import metrics
+from aura_project.caching import get_or_refresh
+from datetime import timedelta
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+import asyncio
+import threading
 import time
-import json
+import uuid
+
+# Seconds the deep probe waits for a message to come back through the channel layer
+CHANNEL_LAYER_TIMEOUT = 2
+
+def _timed_probe(check):
+    start = time.perf_counter()
+    try:
+        check()
+        status = "ok"
+    except Exception as e:
+        status = f"error: {str(e)}"
+    return {
+        "status": status,
+        "response_time_ms": round((time.perf_counter() - start) * 1000, 2)
+    }
+
+
+def _check_database():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+
+
+def _check_cache():
+    key = f"health_check:{uuid.uuid4().hex}"
+    cache.set(key, 'ok', 10)
+    if cache.get(key) != 'ok':
+        raise RuntimeError("value written to the cache could not be read back")
+    cache.delete(key)
+
+
+def _check_channel_layer():
+    layer = get_channel_layer()
+    if layer is None:
+        raise RuntimeError("no channel layer configured")
+
+    async def roundtrip():
+        channel = await layer.new_channel()
+        await layer.send(channel, {'type': 'health.check'})
+        return await layer.receive(channel)
+
+    async def bounded_roundtrip():
+        # A lost message or a stalled layer must fail the probe, not hang it
+        return await asyncio.wait_for(roundtrip(), timeout=CHANNEL_LAYER_TIMEOUT)
+
+    try:
+        message = async_to_sync(bounded_roundtrip)()
+    except asyncio.TimeoutError:
+        raise RuntimeError(f"channel layer roundtrip timed out after {CHANNEL_LAYER_TIMEOUT}s")
+    if message.get('type') != 'health.check':
+        raise RuntimeError("channel layer roundtrip returned the wrong message")
+
+
+READINESS_PROBES = {
+    'database': _check_database,
+    'cache': _check_cache,
+}
+
+DEEP_PROBES = {
+    **READINESS_PROBES,
+    'channel_layer': _check_channel_layer,
+}
+
+_readiness_lock = threading.Lock()
+_readiness = {'checked_at': None, 'services': None}
+
+
+def _run_probes(probes):
+    return {name: _timed_probe(check) for name, check in probes.items()}
+
+
+def get_readiness():
+    """
+    Readiness probe results, memoised for HEALTH_PROBE_TTL seconds per process.
+    While one request refreshes them, concurrent requests get the previous result.
+    """
+    ttl = settings.AURA_SETTINGS.get('HEALTH_PROBE_TTL', 5)
+    checked_at = _readiness['checked_at']
+    if checked_at is not None and time.monotonic() - checked_at < ttl:
+        return _readiness['services']
+
+    if not _readiness_lock.acquire(blocking=checked_at is None):
+        return _readiness['services']
+    try:
+        checked_at = _readiness['checked_at']
+        if checked_at is None or time.monotonic() - checked_at >= ttl:
+            _readiness['services'] = _run_probes(READINESS_PROBES)
+            _readiness['checked_at'] = time.monotonic()
+        return _readiness['services']
+    finally:
+        _readiness_lock.release()
+
+
+def _health_body(services):
+    healthy = all(service['status'] == 'ok' for service in services.values())
+    return {
+        "status": "healthy" if healthy else "degraded",
+        "timestamp": timezone.now().isoformat(),
+        "services": services,
+    }
+
+
+def _health_response(services):
+    body = _health_body(services)
+    return JsonResponse(body, status=200 if body['status'] == 'healthy' else 503)
+
+
+@require_http_methods(["GET"])
+def health_live(request):
+    """
+    Liveness probe: the process is up and serving requests. Does no I/O.
+    """
+    return JsonResponse({
+        "status": "alive",
+        "timestamp": timezone.now().isoformat(),
+    })
+
+
+@require_http_methods(["GET"])
+def health_ready(request):
+    """
+    Readiness probe: database and cache are reachable.
+    Probe results are memoised briefly so frequent polling stays cheap.
+    """
+    return _health_response(get_readiness())
+
 
 @require_http_methods(["GET"])
 def health_check(request):
     """
-    Health check endpoint for monitoring system status
+    Health check endpoint for monitoring system status.
+    Keeps its original response shape and answers 200 even when degraded;
+    orchestrators should poll health/live/ and health/ready/ instead.
+    Services come from the memoised readiness probes and metrics from the
+    cached activity gauges, so polling it never scans a table.
     """
-    start_time = time.time()
-    
+    start = time.perf_counter()
     try:
-        # Database connectivity test
-        db_status = "ok"
-        db_response_time = None
-        try:
-            db_start = time.time()
-            with connection.cursor() as cursor:
-                cursor.execute("SELECT 1")
-            db_response_time = round((time.time() - db_start) * 1000, 2)
-        except Exception as e:
-            db_status = f"error: {str(e)}"
-        
-        # Cache connectivity test
-        cache_status = "ok"
-        cache_response_time = None
-        try:
-            cache_start = time.time()
-            cache.set('health_check', 'ok', 10)
-            cache.get('health_check')
-            cache_response_time = round((time.time() - cache_start) * 1000, 2)
-        except Exception as e:
-            cache_status = f"error: {str(e)}"
-        
-        # Basic metrics
-        active_sessions = ChatSession.objects.filter(is_active=True).count()
-        total_users = AttendeeProfile.objects.count()
-        
-        # Response time
-        total_response_time = round((time.time() - start_time) * 1000, 2)
-        
-        # Overall status
-        overall_status = "healthy" if db_status == "ok" and cache_status == "ok" else "degraded"
-        
-        return JsonResponse({
-            "status": overall_status,
-            "timestamp": timezone.now().isoformat(),
-            "services": {
-                "database": {
-                    "status": db_status,
-                    "response_time_ms": db_response_time
-                },
-                "cache": {
-                    "status": cache_status,
-                    "response_time_ms": cache_response_time
-                }
-            },
-            "metrics": {
-                "active_sessions": active_sessions,
-                "total_users": total_users,
-                "total_response_time_ms": total_response_time
-            }
-        })
-        
+        body = _health_body(get_readiness())
+        body['metrics'] = {
+            'active_sessions': _activity_gauge('active_sessions'),
+            'total_users': _activity_gauge('total_users'),
+            'total_response_time_ms': round((time.perf_counter() - start) * 1000, 2),
+        }
+        return JsonResponse(body)
     except Exception as e:
         return JsonResponse({
             "status": "error",
@@ -76,52 +166,63 @@ def health_check(request):
             "timestamp": timezone.now().isoformat()
         }, status=500)
 
+
 @require_http_methods(["GET"])
-def system_metrics(request):
+def health_deep(request):
     """
-    Detailed system metrics for monitoring
+    Deep health check: runs every dependency probe now, including a channel
+    layer roundtrip. Probes are constant-time and never scan tables.
     """
-    try:
-        from datetime import timedelta
-        now = timezone.now()
-        last_hour = now - timedelta(hours=1)
-        last_day = now - timedelta(days=1)
-        
-        # Session metrics
-        sessions_last_hour = ChatSession.objects.filter(
-            created_at__gte=last_hour
-        ).count()
-        
-        sessions_last_day = ChatSession.objects.filter(
-            created_at__gte=last_day
-        ).count()
-        
-        # Activity metrics
-        activities_last_hour = UserActivity.objects.filter(
-            timestamp__gte=last_hour
-        ).count()
-        
-        # User metrics
-        active_users_today = ChatSession.objects.filter(
+    return _health_response(_run_probes(DEEP_PROBES))
+
+# Versioned so entries cached before total_users was added are never read
+ACTIVITY_GAUGES_KEY = 'aura:metrics:activity_gauges:v2'
+OPENMETRICS_CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def compute_activity_gauges():
+    """The gauges that need table scans; refreshed in the background"""
+    last_day = timezone.now() - timedelta(days=1)
+    return {
+        'active_users_today': ChatSession.objects.filter(
             last_activity__gte=last_day
-        ).values('user').distinct().count()
-        
-        return JsonResponse({
-            "timestamp": now.isoformat(),
-            "sessions": {
-                "last_hour": sessions_last_hour,
-                "last_24h": sessions_last_day
-            },
-            "activities": {
-                "last_hour": activities_last_hour
-            },
-            "users": {
-                "active_today": active_users_today
-            }
-        })
-        
-    except Exception as e:
-        return JsonResponse({
-            "error": str(e),
-            "timestamp": timezone.now().isoformat()
-        }, status=500)
\ No newline at end of file
+        ).values('user').distinct().count(),
+        'active_sessions': ChatSession.objects.filter(is_active=True).count(),
+        'total_users': AttendeeProfile.objects.count(),
+    }
+
+
+def _activity_gauge(name):
+    interval = settings.AURA_SETTINGS.get('METRICS_GAUGE_INTERVAL', 60)
+    gauges = get_or_refresh(ACTIVITY_GAUGES_KEY, compute_activity_gauges, ttl=interval, stale_ttl=interval * 10)
+    return gauges[name]
+
+
+metrics.register_gauge(
+    'aura_active_users_today',
+    'Distinct users with chat activity in the last 24 hours',
+    lambda: _activity_gauge('active_users_today')
+)
+metrics.register_gauge(
+    'aura_active_chat_sessions',
+    'Chat sessions currently marked active',
+    lambda: _activity_gauge('active_sessions')
+)
+metrics.register_gauge(
+    'aura_attendee_profiles',
+    'Attendee profiles registered',
+    lambda: _activity_gauge('total_users')
+)
+
+
+@require_http_methods(["GET"])
+def system_metrics(request):
+    """
+    Counters, gauges and performance histograms in the OpenMetrics text
+    format, or the Prometheus text format for clients that don't ask for it.
+    Serving a scrape reads only in-process state and the cache.
+    """
+    if 'application/openmetrics-text' in request.headers.get('Accept', ''):
+        return HttpResponse(metrics.render(openmetrics=True), content_type=OPENMETRICS_CONTENT_TYPE)
+    return HttpResponse(metrics.render(), content_type=PROMETHEUS_CONTENT_TYPE)
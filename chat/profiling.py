@@ -0,0 +1,143 @@
+"""
+Built-in sampling profiler.
+
+Admins enable it for a time window (the ``profiler_enabled_until`` system
+setting); every worker notices through the settings registry and starts a
+thread that samples the stacks of all other threads. When the window ends
+the samples are written under logs/ as collapsed stacks, ready for
+flamegraph.pl or speedscope. Nothing runs while the profiler is disabled.
+"""
+from collections import Counter
+from datetime import datetime, timedelta
+from django.conf import settings
+from django.utils import timezone
+import logging
+import os
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+PROFILER_SETTING_KEY = 'profiler_enabled_until'
+PROFILE_DIR = settings.BASE_DIR / 'logs'
+MAX_DURATION = 900  # seconds
+
+
+class SamplingProfiler:
+    """Samples the stacks of every thread at a fixed interval until a deadline"""
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.until = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self):
+        # _run clears _thread under the lock once it has decided to stop sampling
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, until):
+        """Profile until the aware datetime ``until``; extends a running window"""
+        with self._lock:
+            self.until = until
+            if not self.running:
+                self._thread = threading.Thread(target=self._run, name='aura-profiler', daemon=True)
+                self._thread.start()
+                logger.info(f"Sampling profiler started until {until.isoformat()}")
+
+    def stop(self):
+        with self._lock:
+            self.until = timezone.now()
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        stacks = Counter()
+        started = time.time()
+        while True:
+            # Decide to stop under the lock, so a start() that extends the
+            # window either lands before this check or starts a new thread
+            with self._lock:
+                if timezone.now() >= self.until:
+                    self._thread = None
+                    break
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident != own_ident:
+                    stacks[self._collapse(names.get(ident, ident), frame)] += 1
+            time.sleep(self.interval)
+        path = self._write(stacks, started)
+        logger.info(f"Sampling profiler wrote {sum(stacks.values())} samples to {path}")
+
+    @staticmethod
+    def _collapse(thread_name, frame):
+        frames = []
+        while frame is not None:
+            code = frame.f_code
+            frames.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}:{frame.f_lineno}")
+            frame = frame.f_back
+        frames.append(str(thread_name).replace(';', '_'))
+        return ';'.join(reversed(frames))
+
+    @staticmethod
+    def _write(stacks, started):
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        stamp = datetime.fromtimestamp(started).strftime('%Y%m%d-%H%M%S')
+        path = PROFILE_DIR / f"profile-{os.getpid()}-{stamp}.folded"
+        with open(path, 'w') as handle:
+            for stack, count in stacks.most_common():
+                handle.write(f"{stack} {count}\n")
+        return path
+
+
+profiler = SamplingProfiler(settings.AURA_SETTINGS.get('PROFILER_SAMPLE_INTERVAL', 0.005))
+
+_next_check = 0.0
+
+
+def check_due():
+    """True at most once per PROFILER_CHECK_INTERVAL seconds per process"""
+    global _next_check
+    now = time.monotonic()
+    if now < _next_check:
+        return False
+    _next_check = now + settings.AURA_SETTINGS.get('PROFILER_CHECK_INTERVAL', 10)
+    return True
+
+
+def sync_with_settings():
+    """Start, extend or cut short the local profiler to match the system setting"""
+    from admin_panel.settings_registry import registry
+
+    until = registry.get_datetime(PROFILER_SETTING_KEY)
+    if until is None:
+        return
+    if until > timezone.now():
+        if not profiler.running or profiler.until != until:
+            profiler.start(until)
+    elif profiler.running:
+        profiler.stop()
+
+
+def enable(duration, user=None):
+    """Enable profiling on every worker for ``duration`` seconds (0 disables it)"""
+    from admin_panel.models import SystemSettings
+
+    duration = max(0, min(int(duration), MAX_DURATION))
+    until = timezone.now() + timedelta(seconds=duration)
+    SystemSettings.objects.update_or_create(
+        key=PROFILER_SETTING_KEY,
+        defaults={
+            'value': until.isoformat(),
+            'description': 'Sampling profiler runs on every worker until this time',
+            'category': 'diagnostics',
+            'is_active': True,
+            'created_by': user,
+        }
+    )
+    if duration:
+        profiler.start(until)
+    else:
+        profiler.stop()
+    return until
@@ -0,0 +1,22 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from chat import metrics
+from chat.models import ChatSession, ChatMessage, UserActivity
+
+
+@receiver(post_save, sender=ChatSession)
+def count_chat_session(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        metrics.inc('aura_chat_sessions_created_total')
+
+
+@receiver(post_save, sender=ChatMessage)
+def count_chat_message(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        metrics.inc('aura_chat_messages_total', message_type=instance.message_type)
+
+
+@receiver(post_save, sender=UserActivity)
+def count_user_activity(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        metrics.inc('aura_user_activities_total')
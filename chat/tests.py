@@ -1,3 +1,527 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock, skipUnless
+import asyncio
+import json
+import os
+import statistics
+import threading
+import time
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from channels.testing import WebsocketCommunicator
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.cache.backends.dummy import DummyCache
+from django.core.management import call_command
+from django.db.models import Count
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from attendees.models import AttendeeProfile, EventInteraction
+from admin_panel import counters
+from aura_project.cache_config import cache_settings
+from aura_project.testing import QueryBudgetTestCase, inline_counter_flushes, websocket_case
+from chat import admission, analytics, consumers, metrics, monitoring, profiling
+from chat.models import ChatMessage, ChatSession, UserActivity
+from events.models import Session
+
+
+class ChatQueryBudgetTests(QueryBudgetTestCase):
+    """Chat pages, APIs, monitoring endpoints and WebSocket handlers stay within QUERY_BUDGETS"""
+
+    CHAT_MESSAGES = {
+        'recommendation': 'Can you recommend some sessions for me?',
+        'schedule': "What's on the agenda today?",
+        'speaker': 'Who is presenting?',
+        'networking': 'I want to network with other people',
+        'general': 'Tell me about the AI sessions',
+    }
+
+    def setUp(self):
+        self.user = User.objects.create_user('budget_attendee', 'attendee@example.com', 'secret')
+        self.profile = AttendeeProfile.objects.create(
+            user=self.user, job_title='Engineer', interests='AI, Cloud, Data', company='AURA'
+        )
+        self.client = Client()
+        self.client.force_login(self.user)
+        self.anonymous = Client()
+
+    def grow(self, step, counts):
+        super().grow(step, counts)
+        # Grow the attendee's own history along with everyone else's
+        sessions = list(Session.objects.order_by('-id')[:counts['sessions']])
+        EventInteraction.objects.bulk_create(
+            EventInteraction(attendee=self.profile, event_id=session.id, interaction_type='viewed')
+            for session in sessions
+        )
+        chat_session = ChatSession.objects.create(user=self.user, session_id=f'budget-attendee-{step}')
+        ChatMessage.objects.bulk_create(
+            ChatMessage(session=chat_session, content=f'Message {i}') for i in range(counts['messages'] // 4)
+        )
+        UserActivity.objects.bulk_create(
+            UserActivity(user=self.user, activity_type='page_view', activity_data={})
+            for _ in range(counts['activities'] // 4)
+        )
+
+    def get(self, name, client=None, **extra):
+        return lambda: (client or self.client).get(reverse(name), **extra)
+
+    def post_json(self, name, data):
+        return lambda: self.client.post(reverse(name), data, content_type='application/json')
+
+    def test_views_within_budget(self):
+        session_id = Session.objects.values_list('id', flat=True).first() or 1
+        self.assertWithinQueryBudgets({
+            'chat:home': self.get('chat:home', self.anonymous),
+            'chat:dashboard': self.get('chat:dashboard'),
+            'chat:login': self.get('chat:login', self.anonymous),
+            'chat:register': self.get('chat:register', self.anonymous),
+            'chat:create_profile': self.get('chat:create_profile'),
+            'chat:log_activity': self.post_json('chat:log_activity', {
+                'activity_type': 'page_view', 'activity_data': {'page': 'dashboard'}
+            }),
+            'chat:get_feed_api': self.get('chat:get_feed_api'),
+            'chat:event_interaction': self.post_json('chat:event_interaction', {
+                'event_id': session_id, 'interaction_type': 'bookmarked', 'rating': 5
+            }),
+            'chat:about': self.get('chat:about', self.anonymous),
+            'chat:features': self.get('chat:features', self.anonymous),
+            'chat:test_websocket': self.get('chat:test_websocket', self.anonymous),
+            'chat:health_check': self.get('chat:health_check', self.anonymous),
+            'chat:health_live': self.get('chat:health_live', self.anonymous),
+            'chat:health_ready': self.get('chat:health_ready', self.anonymous),
+            'chat:health_deep': self.get('chat:health_deep', self.anonymous),
+            'chat:system_metrics': self.get('chat:system_metrics', self.anonymous),
+        })
+
+    def test_websocket_handlers_within_budget(self):
+        cases = {
+            'ws:connect': websocket_case(self.user),
+            'ws:get_feed': websocket_case(self.user, {'type': 'get_feed'}),
+            'ws:action': websocket_case(self.user, {
+                'type': 'action', 'action': 'Show me recommended sessions', 'item_type': 'recommendation'
+            }),
+            'ws:unknown': websocket_case(self.user, {'type': 'typing'}, reply=False),
+            'ws:invalid': websocket_case(self.user, 'not json'),
+        }
+        for intent, message in self.CHAT_MESSAGES.items():
+            cases[f'ws:message[{intent}]'] = websocket_case(self.user, {'type': 'message', 'message': message})
+        self.assertWithinQueryBudgets(cases)
+
+
+@mock.patch.object(admission, 'get_connection_limit', return_value=2)
+class ConnectionAdmissionTests(TestCase):
+    """The WebSocket ceiling admits, rejects and releases slots, and forgets dead workers"""
+
+    def setUp(self):
+        cache.clear()
+        admission._count = 0
+        self.addCleanup(setattr, admission, '_count', 0)
+
+    def test_admits_up_to_the_limit(self, limit):
+        self.assertTrue(admission.acquire_connection_slot())
+        self.assertTrue(admission.acquire_connection_slot())
+        self.assertFalse(admission.acquire_connection_slot())
+        self.assertEqual(admission.get_connection_count(), 2)
+
+    def test_release_frees_a_slot(self, limit):
+        admission.acquire_connection_slot()
+        admission.acquire_connection_slot()
+        admission.release_connection_slot()
+        self.assertEqual(admission.get_connection_count(), 1)
+        self.assertTrue(admission.acquire_connection_slot())
+
+    def test_counts_other_workers_until_their_lease_expires(self, limit):
+        now = time.time()
+        cache.set(admission.WORKERS_KEY, {'live': now + 60, 'crashed': now + 60})
+        cache.set(admission.WORKER_KEY_PREFIX + 'live', 1)
+        # The crashed worker's count expired with its lease
+        self.assertTrue(admission.acquire_connection_slot())
+        self.assertFalse(admission.acquire_connection_slot())
+
+        cache.delete(admission.WORKER_KEY_PREFIX + 'live')
+        self.assertTrue(admission.acquire_connection_slot())
+
+    def test_admits_and_releases_symmetrically_without_the_cache(self, limit):
+        with mock.patch.object(admission, 'get_connection_count', side_effect=ConnectionError('cache down')):
+            self.assertTrue(admission.acquire_connection_slot())
+        self.assertEqual(admission._count, 1)
+        admission.release_connection_slot()
+        self.assertEqual(admission._count, 0)
+
+
+class InstrumentedCacheTests(TestCase):
+    """The cache configured from the environment keeps counting hits and misses"""
+
+    def test_wraps_the_configured_backend(self):
+        config = cache_settings({'AURA_CACHE_URL': 'redis://cache:6379/1'})['default']
+        self.assertEqual(config['WRAPPED_BACKEND'], 'django.core.cache.backends.redis.RedisCache')
+        self.assertEqual(config['LOCATION'], 'redis://cache:6379/1')
+
+        backend = metrics.InstrumentedCache('', {'WRAPPED_BACKEND': 'django.core.cache.backends.dummy.DummyCache'})
+        self.assertIsInstance(backend, DummyCache)
+        with metrics.track() as stats:
+            self.assertEqual(backend.get('key', 'fallback'), 'fallback')
+        self.assertEqual(stats.cache_misses, 1)
+
+
+class AIResponseTimeoutTests(TestCase):
+    """Answers run on the AI executor inside the message's stats, and give way to the degraded reply on timeout"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('slow_attendee', 'slow@example.com', 'secret')
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def slow_response(self, message, user_context=None):
+        if message:
+            self.release.wait(5)
+        return 'Welcome!'
+
+    def test_degraded_reply_arrives_within_the_timeout(self):
+        async def chat():
+            communicator = WebsocketCommunicator(consumers.ChatConsumer.as_asgi(), '/ws/chat/')
+            communicator.scope['user'] = self.user
+            await communicator.connect()
+            await communicator.receive_from(timeout=10)
+
+            started = time.monotonic()
+            await communicator.send_to(text_data=json.dumps({'type': 'message', 'message': 'Slow question'}))
+            reply = json.loads(await communicator.receive_from(timeout=10))
+            elapsed = time.monotonic() - started
+            await communicator.disconnect()
+            return reply, elapsed
+
+        quick = {**settings.AURA_SETTINGS, 'AI_RESPONSE_TIMEOUT': 0.5, 'AI_RESPONSE_WORKERS': 1}
+        with override_settings(AURA_SETTINGS=quick), \
+                mock.patch.object(consumers.chatbot, 'get_response', self.slow_response):
+            reply, elapsed = async_to_sync(chat)()
+
+        self.assertEqual(reply['message'], consumers.DEGRADED_RESPONSE)
+        self.assertLess(elapsed, 2)
+
+    def test_executor_answers_inside_the_message_stats(self):
+        seen = []
+
+        def response(message, user_context=None):
+            seen.append((message, metrics._current_stats.get(), threading.current_thread().name))
+            return 'Answer'
+
+        async def chat():
+            communicator = WebsocketCommunicator(consumers.ChatConsumer.as_asgi(), '/ws/chat/')
+            communicator.scope['user'] = self.user
+            await communicator.connect()
+            await communicator.receive_from(timeout=10)
+            await communicator.send_to(text_data=json.dumps({'type': 'message', 'message': 'Question'}))
+            reply = json.loads(await communicator.receive_from(timeout=10))
+            await communicator.disconnect()
+            return reply
+
+        workers = {**settings.AURA_SETTINGS, 'AI_RESPONSE_WORKERS': 2}
+        with override_settings(AURA_SETTINGS=workers), \
+                mock.patch.object(consumers.chatbot, 'get_response', response):
+            reply = async_to_sync(chat)()
+
+        self.assertEqual(reply['message'], 'Answer')
+        message, stats, thread = seen[-1]
+        self.assertEqual(message, 'Question')
+        self.assertTrue(thread.startswith('aura-ai'))
+        # The per-message metrics.track() context reached the executor thread
+        self.assertIsNotNone(stats)
+
+
+class TopActiveUsersTests(TestCase):
+    """top_active_users agrees with a plain Count() over the chat tables"""
+
+    FIXTURE = {'users': 60, 'speakers': 2, 'sessions': 4, 'events': 1, 'chat_sessions': 200,
+               'messages': 5000, 'activities': 0, 'interactions': 0}
+
+    @classmethod
+    def setUpTestData(cls):
+        with inline_counter_flushes():
+            call_command('generate_load_fixture', prefix='ranked', seed=7, stdout=StringIO(), **cls.FIXTURE)
+
+    def setUp(self):
+        patcher = inline_counter_flushes()
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def counted(self, since=None):
+        """{user id: (sessions, messages sent)} straight from the chat tables"""
+        sessions = ChatSession.objects.all()
+        messages = ChatMessage.objects.filter(message_type='user')
+        if since is not None:
+            sessions = sessions.filter(created_at__gte=since)
+            messages = messages.filter(timestamp__gte=since)
+        session_counts = dict(sessions.values_list('user_id').annotate(count=Count('id')).order_by())
+        message_counts = dict(messages.values_list('session__user_id').annotate(count=Count('id')).order_by())
+        return {
+            user_id: (session_counts.get(user_id, 0), message_counts.get(user_id, 0))
+            for user_id in session_counts.keys() | message_counts.keys()
+        }
+
+    def assertRanked(self, rows, order_by, since=None, limit=10):
+        expected = self.counted(since)
+        position = 0 if order_by == 'sessions' else 1
+        self.assertEqual(
+            [row[f'{order_by[:-1]}_count'] for row in rows],
+            sorted((counts[position] for counts in expected.values()), reverse=True)[:limit],
+        )
+        for row in rows:
+            self.assertEqual((row['session_count'], row['message_count']), expected[row['user_id']])
+
+    def test_counter_ranking_matches_count(self):
+        self.assertRanked(analytics.top_active_users(order_by='messages'), 'messages')
+
+    def test_session_ranking_matches_count(self):
+        self.assertRanked(analytics.top_active_users(order_by='sessions'), 'sessions')
+
+    def test_windowed_ranking_matches_count(self):
+        since = timezone.now() - timezone.timedelta(days=7)
+        self.assertRanked(analytics.top_active_users(since=since), 'messages', since)
+
+    def test_counters_follow_new_messages(self):
+        # Enough messages through save(), which feeds the counters, to top the ranking
+        quiet = ChatSession.objects.filter(user__usermanagement__total_chat_messages=0).first()
+        busiest = max(messages for _, messages in self.counted().values())
+        for i in range(busiest + 1):
+            ChatMessage.objects.create(session=quiet, content=f'Message {i}')
+        counters.flush()
+        rows = analytics.top_active_users(order_by='messages')
+        self.assertEqual(rows[0]['user_id'], quiet.user_id)
+        self.assertRanked(rows, 'messages')
+
+
+@skipUnless(os.environ.get('AURA_SCALE_TESTS'), 'set AURA_SCALE_TESTS=1 to run the 1M-message check')
+class TopActiveUsersScaleTests(TopActiveUsersTests):
+    """The same checks at 1M messages, plus a latency bound on the dashboard ranking"""
+
+    FIXTURE = {'users': 10_000, 'speakers': 20, 'sessions': 50, 'events': 5, 'chat_sessions': 20_000,
+               'messages': 1_000_000, 'activities': 0, 'interactions': 0}
+
+    # Median seconds per top_active_users call
+    LATENCY_BUDGET = 0.05
+
+    def test_latency(self):
+        for order_by in ('messages', 'sessions'):
+            timings = []
+            for _ in range(5):
+                started = time.perf_counter()
+                analytics.top_active_users(order_by=order_by)
+                timings.append(time.perf_counter() - started)
+            with self.subTest(order_by=order_by):
+                self.assertLess(statistics.median(timings), self.LATENCY_BUDGET)
+
+
+class SamplingProfilerTests(TestCase):
+    """The profiler samples until its window ends, and a window extended while it stops is never lost"""
+
+    def setUp(self):
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        patcher = mock.patch.object(profiling, 'PROFILE_DIR', Path(directory.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.directory = Path(directory.name)
+        self.profiler = profiling.SamplingProfiler(interval=0.001)
+
+    def wait_until_stopped(self, timeout=5):
+        deadline = time.monotonic() + timeout
+        while self.profiler.running and time.monotonic() < deadline:
+            time.sleep(0.005)
+        self.assertFalse(self.profiler.running)
+
+    def test_stop_writes_the_samples(self):
+        self.profiler.start(timezone.now() + timedelta(seconds=60))
+        self.assertTrue(self.profiler.running)
+        time.sleep(0.02)
+        self.profiler.stop()
+        self.wait_until_stopped()
+
+        lines = [line for path in self.directory.glob('*.folded') for line in path.read_text().splitlines()]
+        self.assertTrue(lines)
+        self.assertTrue(all(line.rsplit(' ', 1)[1].isdigit() for line in lines))
+
+    def test_extending_a_running_window_keeps_its_thread(self):
+        self.profiler.start(timezone.now() + timedelta(seconds=60))
+        thread = self.profiler._thread
+        self.profiler.start(timezone.now() + timedelta(seconds=120))
+        self.assertIs(self.profiler._thread, thread)
+        self.profiler.stop()
+        self.wait_until_stopped()
+
+    def test_start_while_the_window_closes_starts_a_new_thread(self):
+        writing, release = threading.Event(), threading.Event()
+        write = profiling.SamplingProfiler._write
+
+        def slow_write(stacks, started):
+            writing.set()
+            release.wait(5)
+            return write(stacks, started)
+
+        with mock.patch.object(profiling.SamplingProfiler, '_write', staticmethod(slow_write)):
+            self.profiler.start(timezone.now())
+            closing = self.profiler._thread
+            self.assertTrue(writing.wait(5))
+            # The first thread has stopped sampling but is still writing its file
+            self.assertFalse(self.profiler.running)
+            self.profiler.start(timezone.now() + timedelta(seconds=60))
+            self.assertTrue(self.profiler.running)
+            release.set()
+            self.profiler.stop()
+            self.wait_until_stopped()
+            closing.join(5)
+
+
+class HealthCheckTests(TestCase):
+    """Probes report each dependency, readiness is memoised and the legacy endpoint keeps its shape"""
+
+    def setUp(self):
+        cache.clear()
+        monitoring._readiness.update(checked_at=None, services=None)
+        self.addCleanup(monitoring._readiness.update, checked_at=None, services=None)
+        self.client = Client()
+
+    def broken_cache(self):
+        raise ConnectionError('cache down')
+
+    def test_ready_reports_failures_as_503(self):
+        response = self.client.get(reverse('chat:health_ready'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.json()['services']), {'database', 'cache'})
+
+        monitoring._readiness.update(checked_at=None)
+        with mock.patch.dict(monitoring.READINESS_PROBES, {'cache': self.broken_cache}):
+            response = self.client.get(reverse('chat:health_ready'))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['services']['cache']['status'], 'error: cache down')
+
+    def test_readiness_is_memoised(self):
+        probe = mock.Mock()
+        with mock.patch.dict(monitoring.READINESS_PROBES, {'cache': probe}):
+            self.client.get(reverse('chat:health_ready'))
+            self.client.get(reverse('chat:health_ready'))
+            self.assertEqual(probe.call_count, 1)
+
+            monitoring._readiness['checked_at'] -= settings.AURA_SETTINGS.get('HEALTH_PROBE_TTL', 5)
+            self.client.get(reverse('chat:health_ready'))
+            self.assertEqual(probe.call_count, 2)
+
+    def test_deep_probe_times_out_a_stalled_channel_layer(self):
+        class StalledLayer:
+            async def new_channel(self):
+                return 'health.stalled'
+
+            async def send(self, channel, message):
+                pass
+
+            async def receive(self, channel):
+                await asyncio.sleep(60)
+
+        response = self.client.get(reverse('chat:health_deep'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['services']['channel_layer']['status'], 'ok')
+
+        with mock.patch.object(monitoring, 'CHANNEL_LAYER_TIMEOUT', 0.05), \
+                mock.patch.object(monitoring, 'get_channel_layer', return_value=StalledLayer()):
+            started = time.monotonic()
+            response = self.client.get(reverse('chat:health_deep'))
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(response.status_code, 503)
+        self.assertIn('timed out', response.json()['services']['channel_layer']['status'])
+
+    def test_legacy_health_check_keeps_its_shape_and_status(self):
+        user = User.objects.create_user('healthy', 'healthy@example.com', 'secret')
+        AttendeeProfile.objects.create(user=user)
+        ChatSession.objects.create(user=user, session_id='health', is_active=True)
+
+        with mock.patch.dict(monitoring.READINESS_PROBES, {'cache': self.broken_cache}):
+            response = self.client.get(reverse('chat:health_check'))
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(set(body), {'status', 'timestamp', 'services', 'metrics'})
+        self.assertEqual(body['status'], 'degraded')
+        self.assertEqual(body['metrics']['active_sessions'], 1)
+        self.assertEqual(body['metrics']['total_users'], 1)
+        self.assertIn('total_response_time_ms', body['metrics'])
+
+
+class MetricsFormatTests(TestCase):
+    """Histogram buckets are inclusive upper bounds and scrapes follow the exposition formats"""
+
+    def setUp(self):
+        for name, fresh in (('_histograms', metrics.defaultdict(dict)),
+                            ('_counters', metrics.defaultdict(lambda: metrics.defaultdict(int))),
+                            ('_gauges', {})):
+            patcher = mock.patch.object(metrics, name, fresh)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_bucket_boundaries(self):
+        histogram = metrics.Histogram(1)
+        self.assertEqual(histogram._index(0.5), 0)
+        self.assertEqual(histogram._index(1), 0)
+        self.assertEqual(histogram._index(2), histogram.sub_buckets)
+        self.assertEqual(histogram._index(2.001), histogram.sub_buckets + 1)
+        self.assertEqual(histogram._index(1e30), len(histogram.counts) - 1)
+
+        for value in (1, 2, 3, 4, 4.5):
+            histogram.record(value)
+        # A value equal to a bound lands in that bucket, as Prometheus' le requires
+        self.assertEqual(histogram.cumulative_buckets(), [(1, 1), (2, 2), (4, 4), (8, 5)])
+        self.assertEqual(histogram.sum, 14.5)
+        self.assertLessEqual(histogram.quantile(0.5), 3 * 2 ** (1 / histogram.sub_buckets))
+        self.assertGreaterEqual(histogram.quantile(0.5), 3)
+        self.assertEqual(metrics.Histogram(1).quantile(0.99), 0.0)
+
+    def populate(self):
+        metrics.register_gauge('aura_test_gauge', 'A gauge', lambda: 2.5)
+        metrics.inc('aura_chat_messages_total', 3, message_type='user')
+        metrics.inc('aura_chat_messages_total', message_type='say "hi"\n')
+        metrics.observe('aura_http_db_queries', 1, view='chat:home')
+        metrics.observe('aura_http_db_queries', 3, view='chat:home')
+
+    def test_prometheus_format(self):
+        self.populate()
+        self.assertEqual(metrics.render().splitlines(), [
+            '# HELP aura_test_gauge A gauge',
+            '# TYPE aura_test_gauge gauge',
+            'aura_test_gauge 2.5',
+            '# HELP aura_chat_messages_total Chat messages logged by message type',
+            '# TYPE aura_chat_messages_total counter',
+            'aura_chat_messages_total{message_type="say \\"hi\\"\\n"} 1',
+            'aura_chat_messages_total{message_type="user"} 3',
+            '# HELP aura_http_db_queries Database queries per HTTP view',
+            '# TYPE aura_http_db_queries histogram',
+            'aura_http_db_queries_bucket{view="chat:home",le="1.0"} 1',
+            'aura_http_db_queries_bucket{view="chat:home",le="2.0"} 1',
+            'aura_http_db_queries_bucket{view="chat:home",le="4.0"} 2',
+            'aura_http_db_queries_bucket{view="chat:home",le="+Inf"} 2',
+            'aura_http_db_queries_sum{view="chat:home"} 4.0',
+            'aura_http_db_queries_count{view="chat:home"} 2',
+        ])
+
+    def test_openmetrics_format(self):
+        self.populate()
+        lines = metrics.render(openmetrics=True).splitlines()
+        # Counter families drop the _total suffix, their samples keep it
+        self.assertIn('# TYPE aura_chat_messages counter', lines)
+        self.assertIn('# HELP aura_chat_messages Chat messages logged by message type', lines)
+        self.assertIn('aura_chat_messages_total{message_type="user"} 3', lines)
+        self.assertEqual(lines[-1], '# EOF')
+        self.assertEqual(lines.count('# EOF'), 1)
+
+    def test_view_negotiates_the_format(self):
+        self.populate()
+        response = Client().get(reverse('chat:system_metrics'))
+        self.assertEqual(response['Content-Type'], monitoring.PROMETHEUS_CONTENT_TYPE)
+        self.assertNotIn(b'# EOF', response.content)
+
+        response = Client().get(reverse('chat:system_metrics'), HTTP_ACCEPT='application/openmetrics-text; version=1.0.0')
+        self.assertEqual(response['Content-Type'], monitoring.OPENMETRICS_CONTENT_TYPE)
+        self.assertTrue(response.content.endswith(b'# EOF\n'))
@@ -18,5 +18,8 @@ urlpatterns = [
     path('test-websocket/', views.test_websocket, name='test_websocket'),
     # Monitoring endpoints
     path('health/', monitoring.health_check, name='health_check'),
+    path('health/live/', monitoring.health_live, name='health_live'),
+    path('health/ready/', monitoring.health_ready, name='health_ready'),
+    path('health/deep/', monitoring.health_deep, name='health_deep'),
     path('metrics/', monitoring.system_metrics, name='system_metrics'),
 ]
\ No newline at end of file
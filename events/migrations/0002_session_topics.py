@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_engine', '0002_topic'),
+        ('events', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='session',
+            name='topics',
+            field=models.ManyToManyField(blank=True, editable=False, related_name='sessions', to='ai_engine.topic'),
+        ),
+    ]
@@ -14,6 +14,8 @@ class Session(models.Model):
     start_time = models.DateTimeField()
     end_time = models.DateTimeField()
     speaker = models.ForeignKey(Speaker, on_delete=models.SET_NULL, null=True, blank=True)
+    # Known topics mentioned in the title or description, see ai_engine.topics
+    topics = models.ManyToManyField('ai_engine.Topic', blank=True, editable=False, related_name='sessions')
 
     def __str__(self):
         return self.title
\ No newline at end of file
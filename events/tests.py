@@ -1,3 +1,34 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
 
-# Create your tests here.
+from ai_engine.models import Topic
+from aura_project.testing import QueryBudgetTestCase
+from events.models import Session
+
+
+class SessionQueryBudgetTests(QueryBudgetTestCase):
+    """The session API stays within QUERY_BUDGETS"""
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(User.objects.create_user('budget_attendee', 'attendee@example.com', 'secret'))
+        Topic.objects.create(key='cloud', name='Cloud')
+
+    def grow(self, step, counts):
+        super().grow(step, counts)
+        # At least one session on the filtered topic at every size
+        now = timezone.now()
+        Session.objects.create(
+            title=f'Cloud keynote {step}', description='Running on the cloud.', start_time=now, end_time=now
+        )
+
+    def test_views_within_budget(self):
+        self.assertWithinQueryBudgets({
+            'session-list': lambda: self.client.get(reverse('session-list')),
+            'session-list[topic]': lambda: self.client.get(reverse('session-list'), {'topic': 'Cloud'}),
+            'session-detail': lambda: self.client.get(
+                reverse('session-detail', args=[Session.objects.values_list('id', flat=True).first()])
+            ),
+        })
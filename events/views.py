@@ -1,7 +1,16 @@
 from rest_framework import viewsets
+from ai_engine import topics
 from .models import Session
 from .serializers import SessionSerializer
 
 class SessionViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = Session.objects.all().order_by('start_time')
-    serializer_class = SessionSerializer
\ No newline at end of file
+    queryset = Session.objects.select_related('speaker').order_by('start_time')
+    serializer_class = SessionSerializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # ?topic=AI lists the sessions on a topic
+        topic = self.request.query_params.get('topic')
+        if topic:
+            queryset = queryset.filter(id__in=topics.index.members('sessions', topics.index.lookup([topic])))
+        return queryset
\ No newline at end of file